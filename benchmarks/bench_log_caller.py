@@ -0,0 +1,82 @@
+""" microbenchmark of the caller attribution of ProcessLogger (per-call cost)
+    - before: caller info resolved by inspect.stack()[1] at every call (previous log_decorator)
+    - after : caller info resolved by logging (stacklevel) only when the record is emitted
+
+    usage: python benchmarks/bench_log_caller.py [--calls 2000] [--depth 30]
+"""
+import argparse
+import inspect
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.constants import *
+os.makedirs(TRAIN_LOG_PATH, exist_ok=True)
+os.makedirs(INFERENCE_LOG_PATH, exist_ok=True)
+from src.logger import MSG_LOG_LEVEL, ProcessLogger, flush_process_logger, get_process_logger
+
+PROC_LOGGER = ProcessLogger(PROJECT_HOME)
+
+def inspect_stack_message(msg):
+    """ previous implementation: caller prefix built by inspect.stack()[1]
+
+    Args:
+        msg     (str): message
+
+    Returns: -
+
+    """
+    caller = inspect.stack()[1]
+    get_process_logger("MSG").log(MSG_LOG_LEVEL, f"{os.path.basename(caller.filename)}({caller.lineno})|{caller.function}() {msg}")
+
+def at_depth(depth, func):
+    """ call {func} at the stack depth of {depth} frames
+
+    Args:
+        depth   (int): number of nested frames
+        func    (function): function to call
+
+    Returns: -
+
+    """
+    if depth == 0:
+        return func()
+    return at_depth(depth - 1, func)
+
+def bench(log_func, calls, depth):
+    """ per-call cost (us) of the log function, including writing the records
+
+    Args:
+        log_func    (function): log function (message)
+        calls       (int): number of calls
+        depth       (int): stack depth of the calls
+
+    Returns:
+        cost    (float): us per call
+
+    """
+    def _run():
+        start = time.perf_counter()
+        for i in range(calls):
+            log_func(f"benchmark message {i}")
+        flush_process_logger()
+        return time.perf_counter() - start
+    return at_depth(depth, _run) / calls * 1e6
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='ProcessLogger caller attribution benchmark')
+    parser.add_argument('--calls', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=30)
+    args = parser.parse_args()
+    ## console output of the records is discarded (file handlers still write process.log)
+    stderr_fd = os.dup(2)
+    with open(os.devnull, 'w') as devnull:
+        os.dup2(devnull.fileno(), 2)
+        try:
+            before = bench(inspect_stack_message, args.calls, args.depth)
+            after = bench(PROC_LOGGER.process_message, args.calls, args.depth)
+        finally:
+            os.dup2(stderr_fd, 2)
+            os.close(stderr_fd)
+    print(f"inspect.stack()[1] : {before:8.1f} us/call")
+    print(f"lazy (stacklevel)  : {after:8.1f} us/call")
@@ -0,0 +1,124 @@
+""" benchmark of loop mode inference requests with and without the warm context (control - warm_context)
+    - cold: a new Pipeline (asset modules imported again) for every request
+    - warm: the boot-on Pipeline is reset and reused (asset classes kept)
+
+    Each mode runs in its own process; the assets (4 local steps importing a helper module) are written to a temp dir.
+    usage: python benchmarks/bench_warm_context.py [--requests 1000] [--mode cold|warm]
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.constants import *
+
+STEPS = ['input', 'preprocess', 'inference', 'output']
+HELPER = "\n".join(f"def helper_{i}(x):\n    return x * {i} + len(str(x))\n" for i in range(150))
+ASSET = '''
+from {name}_helper import *
+class UserAsset:
+    def __init__(self, asset_structure):
+        self.asset_structure = asset_structure
+        self.args = asset_structure.args
+    def run(self):
+        data = dict(self.asset_structure.data)
+        data['{name}'] = helper_3(len(data))
+        return data, self.asset_structure.config
+'''
+
+def make_assets(asset_home):
+    """ write the local assets of the benchmark pipeline
+
+    Args:
+        asset_home  (str): assets path (ends with /)
+
+    Returns: -
+
+    """
+    for step in STEPS:
+        os.makedirs(asset_home + step, exist_ok=True)
+        with open(asset_home + step + f'/asset_{step}.py', 'w') as f:
+            f.write(ASSET.replace('{name}', step))
+        with open(asset_home + step + f'/{step}_helper.py', 'w') as f:
+            f.write(HELPER)
+
+def make_plan(warm_context):
+    """ experimental plan of the benchmark pipeline (inference only, local assets)
+
+    Args:
+        warm_context    (bool): control - warm_context
+
+    Returns:
+        plan    (dict)
+
+    """
+    return {'name': 'bench', 'version': '1.0',
+            'external_path': [{'load_train_data_path': None}, {'load_inference_data_path': None}, {'save_train_artifacts_path': None},
+                              {'save_inference_artifacts_path': None}, {'load_model_path': None}],
+            'external_path_permission': [{'aws_key_profile': None}],
+            'user_parameters': [{'inference_pipeline': [{'step': step, 'args': [{'x': 1}]} for step in STEPS]}],
+            'asset_source': [{'inference_pipeline': [{'step': step, 'source': {'code': 'local', 'branch': '', 'requirements': []}} for step in STEPS]}],
+            'control': [{'get_asset_source': 'once'}, {'backup_artifacts': False}, {'backup_log': False}, {'backup_size': 1000},
+                        {'interface_mode': 'memory'}, {'save_inference_format': 'zip'}, {'check_resource': False}, {'resource_interval': 0.5},
+                        {'profile_steps': []}, {'trace_memory': False}, {'wheelhouse': False}, {'shallow_clone': True},
+                        {'concurrent_pipelines': False}, {'warm_context': warm_context}, {'model_cache_size': MODEL_CACHE_SIZE}]}
+
+def bench(mode, num_requests, asset_home):
+    """ latency of {num_requests} loop mode requests after the boot-on
+
+    Args:
+        mode            (str): cold / warm
+        num_requests    (int): number of requests
+        asset_home      (str): assets path (ends with /)
+
+    Returns:
+        latencies   (list): seconds per request (sorted)
+
+    """
+    import src.install
+    import src.pipeline
+    from src.artifacts import Aritifacts
+    logging.disable(logging.CRITICAL)
+    src.pipeline.ASSET_HOME = src.install.ASSET_HOME = asset_home
+    make_assets(asset_home)
+    plan = make_plan(mode == 'warm')
+    system_envs = {'boot_on': True, 'loop': True, 'artifacts': Aritifacts().set_artifacts(), 'redis_pubsub_instance': None,
+                   'redis_error_table': {}, 'inference_history': {}, 'solution_metadata_version': None, 'alo_version': 'bench',
+                   'start_time': 'bench'}
+    boot_pipeline = src.pipeline.Pipeline(plan, 'inference_pipeline', system_envs)
+    boot_pipeline.setup()
+    boot_pipeline.run()
+    system_envs['boot_on'] = False
+    latencies = []
+    for _ in range(num_requests):
+        start = time.perf_counter()
+        if mode == 'warm':
+            pipeline = boot_pipeline
+            pipeline.reset(plan)
+        else:
+            pipeline = src.pipeline.Pipeline(plan, 'inference_pipeline', system_envs)
+        pipeline.setup()
+        pipeline.run()
+        latencies.append(time.perf_counter() - start)
+        assert pipeline.asset_structure.data == {'input': 1, 'preprocess': 4, 'inference': 7, 'output': 10}, pipeline.asset_structure.data
+    return sorted(latencies)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='warm context benchmark')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--mode', choices=['cold', 'warm'], default=None)
+    args = parser.parse_args()
+    if args.mode is None:
+        ## fresh process per mode (asset modules must not be imported already)
+        for mode in ['cold', 'warm']:
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--requests', str(args.requests), '--mode', mode], check=True)
+    else:
+        with tempfile.TemporaryDirectory() as asset_home:
+            latencies = bench(args.mode, args.requests, asset_home + '/')
+        num = len(latencies)
+        print(f"{args.mode:5s} n={num} total={sum(latencies):.2f}s mean={statistics.mean(latencies) * 1e3:.2f}ms " \
+              f"p50={latencies[num // 2] * 1e3:.2f}ms p99={latencies[int(num * 0.99)] * 1e3:.2f}ms")
@@ -0,0 +1,73 @@
+""" benchmark of experimental_plan.yaml loading (per-load cost)
+    - FullLoader           : previous yaml.load(..., Loader=yaml.FullLoader)
+    - C loader (cold)      : src.yaml._load_yaml with an empty YAML_CACHE
+    - cache hit            : src.yaml._load_yaml of an unchanged file (copy of the cached document)
+
+    The plan is generated from the experimental_plan.yaml format with a large ui_args_detail.
+    usage: python benchmarks/bench_yaml_load.py [--steps 10] [--args 150]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import yaml
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.constants import *
+import src.yaml as alo_yaml
+
+def make_plan(plan_path, num_steps, num_args):
+    """ write an experimental_plan.yaml with {num_steps} x {num_args} ui args per pipeline
+
+    Args:
+        plan_path   (str): output path
+        num_steps   (int): number of steps
+        num_args    (int): number of ui args per step
+
+    Returns: -
+
+    """
+    with open(os.path.join(PROJECT_HOME, 'src/ConfigFormats/experimental_plan_format.yaml')) as f:
+        plan = yaml.safe_load(f)
+    ui_args = [{'step': f'step{s}', 'args': [{'name': f'arg{i}', 'description': 'x' * 60, 'type': 'single_selection', \
+                'default': [f'v{i}'], 'range': [f'v{j}' for j in range(8)]} for i in range(num_args)]} for s in range(num_steps)]
+    plan['ui_args_detail'] = [{'train_pipeline': ui_args}, {'inference_pipeline': ui_args}]
+    with open(plan_path, 'w') as f:
+        yaml.safe_dump(plan, f)
+
+def bench(func, num):
+    """ average cost (ms) of {func}
+
+    Args:
+        func    (function): function to measure
+        num     (int): number of calls
+
+    Returns:
+        cost    (float): ms per call
+
+    """
+    start = time.perf_counter()
+    for _ in range(num):
+        func()
+    return (time.perf_counter() - start) / num * 1000
+
+def full_load(plan_path):
+    with open(plan_path) as f:
+        return yaml.load(f, Loader=yaml.FullLoader)
+
+def cold_load(plan_path):
+    alo_yaml.YAML_CACHE.clear()
+    return alo_yaml._load_yaml(plan_path)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='experimental_plan.yaml loading benchmark')
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--args', type=int, default=150)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plan_path = os.path.join(tmp_dir, 'experimental_plan.yaml')
+        make_plan(plan_path, args.steps, args.args)
+        print(f"plan size          : {os.path.getsize(plan_path) / 1024:8.1f} KB")
+        print(f"FullLoader         : {bench(lambda: full_load(plan_path), 3):8.2f} ms")
+        print(f"{alo_yaml.YamlLoader.__name__} (cold) : {bench(lambda: cold_load(plan_path), 10):8.2f} ms")
+        print(f"cache hit          : {bench(lambda: alo_yaml._load_yaml(plan_path), 20):8.2f} ms")
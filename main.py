@@ -1,3 +1,6 @@
+from src.startup import STARTUP
+## measure import cost of the startup (reported by ALO.__init__)
+STARTUP.import_timer.install()
 from src.utils import set_args
 from src.alo import ALO
 
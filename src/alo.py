@@ -1,26 +1,28 @@
 import json 
+import multiprocessing
 import os
 import random
 import sys
 import shutil
 import subprocess
+import threading
 import traceback
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from git import Repo, GitCommandError
-import pyfiglet
+from multiprocessing.connection import wait as wait_connections
 from time import time 
-import yaml
 from src.artifacts import Aritifacts
 from src.constants import *
 from src.external import ExternalHandler 
 from src.install import Packages
-from src.logger import ProcessLogger  
+from src.logger import ProcessLogger, SHOW_EVENTS, flush_process_logger
+from src.metrics import METRICS, MetricsServer
+from src.mirror import GIT_MIRROR
 from src.pipeline import Pipeline
-from src.redis import RedisList, RedisPubSub
-from src.sagemaker_handler import SagemakerHandler 
-from src.solution_register import SolutionRegister
-from src.utils import print_color, _log_process, _log_show, refresh_log
-from src.yaml import Metadata
+from src.startup import STARTUP
+from src.tracer import TRACER
+from src.utils import print_color, _get_distributions_checksum, _get_error_code, _get_file_checksum, _log_process, _log_show, _read_git_head, refresh_log
+from src.yaml import Metadata, _load_yaml
 
 class ALO:
     ## copyright and license
@@ -48,7 +50,7 @@ class ALO:
     Contributor: Sehyun Song, Wonjun Sung, Woosung Jang
     """
 
-    def __init__(self, config = None, system = None, mode = 'all', loop = False, computing = 'local'):
+    def __init__(self, config = None, system = None, mode = 'all', loop = False, computing = 'local', metrics_port = None, refresh_alolib = False):
         """ Initialize experimental plan (experimental_plan.yaml), operational plan (solution_metadata), 
             types of pipelines (train, inference), and mode of operation (always-on)
 
@@ -58,21 +60,31 @@ class ALO:
             mode        (str): alo pipeline mode (all, train, inference)
             loop        ( - ): infinite loop operation mode if this option exists
             computing   (str): computing resource for pipeline execution (local, sagemaker) 
+            metrics_port(int): port of the metrics endpoint in loop mode (None: disabled)
+            refresh_alolib (bool): re-check alolib git and re-install requirements even if fingerprint unchanged
 
         Returns: -
 
         """
+        ## startup phase timing: time since the start of the process (main.py) is counted as imports (first ALO of the process only)
+        STARTUP.begin()
         self._make_art(" Let's ALO  -  ! !")
         print_color(self.copyright_notice, 'BOLD')
+        STARTUP.lap('art')
         ## logger initialize
         self._init_logger()
         ## necessary classes initialize
         self._init_class()
+        STARTUP.lap('init_class')
         ## setup alolib
-        self._set_alolib()
+        self._set_alolib(refresh_alolib)
+        STARTUP.lap('set_alolib')
         exp_plan_path = config
         self.enable_loop = loop
         self.computing_mode = computing
+        self.metrics_port = metrics_port
+        ## pipeline kept resident across the requests of loop mode (warm_context: True)
+        self.warm_pipeline = None
         pipeline_type = mode
         self.system_envs = {}
         ## init redis 
@@ -80,16 +92,22 @@ class ALO:
         if exp_plan_path == "" or exp_plan_path == None:
             exp_plan_path = DEFAULT_EXP_PLAN
         self._get_alo_version()
+        STARTUP.lap('alo_version')
         ## set_metadata() could be empty or only partial keys exist. Only overwrtie existing keys.
         solution_metadata = self.load_solution_metadata(system)
         ## setup metadata
         self.set_metadata(exp_plan_path, solution_metadata, pipeline_type)
+        STARTUP.lap('set_metadata')
         ## artifacts home initialize 
         self.system_envs['artifacts'] = self.artifact.set_artifacts()
         self.system_envs['train_history'] ={}
         self.system_envs['inference_history'] ={}
+        STARTUP.lap('set_artifacts')
         ## set redis 
         self._set_redis(self.system_envs)
+        STARTUP.lap('set_redis')
+        ## startup report (time-to-first-step)
+        self._report_startup()
 
     def pipeline(self, experimental_plan={}, pipeline_type = 'train_pipeline', train_id=''):
         """ make pipeline instance
@@ -122,6 +140,10 @@ class ALO:
                 self.system_envs['inference_history']['train_id'] = 'none'
         if experimental_plan in [{}, "", None]: 
             experimental_plan = self.exp_plan
+        ## warm context (loop mode): reuse the pipeline built at boot-on, only the per-request state is reset
+        if (self.warm_pipeline is not None) and (self.warm_pipeline.pipeline_type == pipeline_type):
+            self.warm_pipeline.reset(experimental_plan)
+            return self.warm_pipeline
         ## make pipeline instance
         pipeline = Pipeline(experimental_plan, pipeline_type, self.system_envs)
         return pipeline
@@ -135,11 +157,15 @@ class ALO:
         Returns: -
 
         """
+        ## the remote heads of the git assets are fetched anew in each run (shared by the pipelines of the run)
+        GIT_MIRROR.reset()
         ## (loop operation mode) - pipeline fixed as inference_pipeline / boot_on=True at inital
         if self.enable_loop: 
+            ## local metrics endpoint (Prometheus text format) 
+            self._start_metrics_server()
             ## boot-on process
             try:
-                self.proc_logger.process_message(f"experimental plan in boot: {self.exp_plan}")
+                self.proc_logger.process_message("experimental plan in boot: %s", self.exp_plan)
                 ## inference_pipeline only 
                 pipe = self.system_envs['pipeline_list'][0] 
                 # set current pipeline into system envs
@@ -147,6 +173,9 @@ class ALO:
                 _log_process(f"{pipe} in loop")
                 ## execute pipline 
                 pipeline = self._execute_pipeline(pipe) 
+                ## warm context: keep the booted pipeline (imported asset classes) for the requests
+                if self.control['warm_context'] == True:
+                    self.warm_pipeline = pipeline
                 _log_process(f"Finish boot-on", highlight=True)
                 ## cancel boot_on mode after finish booting
                 self.system_envs['boot_on'] = False
@@ -160,11 +189,13 @@ class ALO:
             while True: 
                 try:
                     ## wait redis message from edgeapp (dict)
-                    sol_meta_dict = self._lget_redis_msg("request_inference")['solution_metadata']    
-                    self.proc_logger.process_message(f"solution metadata received in loop: {sol_meta_dict}")
+                    with METRICS.time('alo_queue_wait_seconds'):
+                        request_msg = self._lget_redis_msg("request_inference")
+                    sol_meta_dict = request_msg['solution_metadata']    
+                    self.proc_logger.process_message("solution metadata received in loop: %s", sol_meta_dict)
                     ## overwrite_solution_meta --> self.exp_plan (do not read plan yaml again)
                     self.set_metadata(sol_meta=sol_meta_dict, pipeline_type=pipe.split('_')[0], exp_plan=self.exp_plan)
-                    self.proc_logger.process_message(f"experimental plan in loop: {self.exp_plan}")
+                    self.proc_logger.process_message("experimental plan in loop: %s", self.exp_plan)
                     ## _empty_artifacts() (@ pipeline.py - pipeline_setup()) does not refresh log directory. Refresh log here.
                     refresh_log(pipe) 
                     pipeline = self._execute_pipeline(pipe)
@@ -194,6 +225,9 @@ class ALO:
                     self.sagemaker_runs()  
                 except: 
                     self.error_batch(pipe) 
+            ## (normal batch local mode) - train and inference concurrently if decoupled
+            elif self._is_pipelines_decoupled():
+                self._execute_pipelines_concurrently()
             ## (normal batch local mode)
             else: 
                 try:
@@ -207,35 +241,65 @@ class ALO:
                 except:
                     self.error_batch(pipe) 
     
-    def _execute_pipeline(self, pipe): 
+    def _execute_pipeline(self, pipe, stage_lock=None, setup_barrier=None): 
         """ execute pipeline (setup, load, run, save)
 
         Args:
-            pipe    (str): pipeline type (train_pipeline, inference_pipeline)
+            pipe            (str): pipeline type (train_pipeline, inference_pipeline)
+            stage_lock      (Lock): lock held during setup, load and save, which use the directories shared by the pipelines 
+                                    (assets, package list, temporary paths); run is not locked. None: no lock 
+            setup_barrier   (Barrier): barrier of the pipelines run concurrently, passed after setup and load (even if failed), 
+                                    so that no pipeline runs while another one is still installing packages or assets. None: no barrier
         
         Returns: 
             pipeline    (object) : Pipeline instance
 
         """
+        if stage_lock is None:
+            stage_lock = nullcontext()
         pipeline_start_time = time()
-        pipeline = self.pipeline(pipeline_type=pipe)
+        ## collect SHOW events of this run (summary table)
+        SHOW_EVENTS.begin(pipe)
+        ## nested spans of this run (pipeline > stage > asset step > sub-operation)
+        TRACER.reset()
         is_booting = self.enable_loop and self.system_envs['boot_on'] 
-        ## setup 
-        self._publish_redis_msg("alo_status", "booting" if is_booting else "setup")
-        pipeline.setup()
-        pipeline_setup_time = time()
-        ## load
-        self._publish_redis_msg("alo_status", "booting" if is_booting else "load")
-        pipeline.load()
-        pipeline_load_time = time()
-        ## run
-        self._publish_redis_msg("alo_status", "booting" if is_booting else "run")
-        pipeline.run()
-        pipeline_run_time = time()
-        ## save 
-        self._publish_redis_msg("alo_status", "booting" if is_booting else "save")
-        pipeline.save()
-        pipeline_save_time = time()
+        try:
+            with TRACER.span(pipe, 'pipeline', boot_on=is_booting):
+                try:
+                    with stage_lock:
+                        pipeline = self.pipeline(pipeline_type=pipe)
+                        ## setup 
+                        self._publish_redis_msg("alo_status", "booting" if is_booting else "setup")
+                        with TRACER.span('setup', 'stage'):
+                            pipeline.setup()
+                        pipeline_setup_time = time()
+                        ## load
+                        self._publish_redis_msg("alo_status", "booting" if is_booting else "load")
+                        with TRACER.span('load', 'stage'):
+                            pipeline.load()
+                        pipeline_load_time = time()
+                finally:
+                    ## wait until the setup of the other pipelines is finished (pip install, asset re-clone)
+                    if setup_barrier is not None:
+                        try:
+                            setup_barrier.wait()
+                        except threading.BrokenBarrierError:
+                            ## aborted by the parent process: the other pipeline exited 
+                            pass
+                ## run
+                self._publish_redis_msg("alo_status", "booting" if is_booting else "run")
+                with TRACER.span('run', 'stage'):
+                    pipeline.run()
+                pipeline_run_time = time()
+                ## save 
+                with stage_lock:
+                    self._publish_redis_msg("alo_status", "booting" if is_booting else "save")
+                    with TRACER.span('save', 'stage'):
+                        pipeline.save()
+                    pipeline_save_time = time()
+        finally:
+            ## trace is saved even if the pipeline fails (before error backup)
+            self._save_trace(pipe)
         ## execution time logging
         time_info_list = [f"{pipe} setup time: {round(pipeline_setup_time-pipeline_start_time, 3)}s", \
                     f"{pipe} load time: {round(pipeline_load_time-pipeline_setup_time, 3)}s", \
@@ -244,10 +308,161 @@ class ALO:
                     f"{pipe} total time: {round(pipeline_save_time-pipeline_start_time, 3)}s"]
         for time_info in time_info_list: 
             self.proc_logger.process_message(time_info)
+        ## metrics (boot-on only imports assets; not counted as a request)
+        if not is_booting:
+            stage_time_dict = {'setup': pipeline_setup_time-pipeline_start_time, 'load': pipeline_load_time-pipeline_setup_time, \
+                    'run': pipeline_run_time-pipeline_load_time, 'save': pipeline_save_time-pipeline_run_time, \
+                    'total': pipeline_save_time-pipeline_start_time}
+            for stage, stage_time in stage_time_dict.items():
+                METRICS.observe('alo_stage_duration_seconds', stage_time, pipeline=pipe, stage=stage)
+            METRICS.inc('alo_requests_total', pipeline=pipe, status='success')
         ## show table summary (parsing SHOW keyword in log files)
         _log_show(pipe)
         return pipeline 
     
+    def _is_pipelines_decoupled(self):
+        """ check whether train and inference pipelines can run concurrently (control - concurrent_pipelines: True). 
+            They are decoupled if the inference pipeline loads the external model (load_model_path), 
+            instead of the model of the train pipeline run just before. 
+
+        Args: -
+        
+        Returns: 
+            bool
+
+        """
+        if self.control['concurrent_pipelines'] != True:
+            return False
+        if sorted(self.system_envs['pipeline_list']) != ['inference_pipeline', 'train_pipeline']:
+            return False
+        if self.external_path['load_model_path'] in [None, ""]:
+            self.proc_logger.process_warning("<< concurrent_pipelines >> ignored: inference pipeline uses the model of train pipeline (no << load_model_path >>). Run sequentially.")
+            return False
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.proc_logger.process_warning("<< concurrent_pipelines >> ignored: fork is not supported on this platform. Run sequentially.")
+            return False
+        return True
+
+    def _execute_pipelines_concurrently(self):
+        """ execute train and inference pipelines concurrently, each in a forked worker process 
+            with its own artifacts and log directories ({pipeline}_artifacts). 
+            The inference pipeline loads the external model into {CONCURRENT_TRAIN_ARTIFACTS_PATH}models/, 
+            apart from the train_artifacts written by the train pipeline. 
+            Setup, load and save are serialized by a lock (shared assets, package list and temporary paths), 
+            and run starts only after the setup and load of both pipelines (barrier): run is concurrent with run and save only. 
+
+        Args: -
+        
+        Returns: -
+
+        """
+        context = multiprocessing.get_context('fork')
+        stage_lock = context.Lock()
+        setup_barrier = context.Barrier(len(self.system_envs['pipeline_list']))
+        start_time = time()
+        ## receiving connection - (pipeline type, worker process)
+        running = {}
+        for pipe in self.system_envs['pipeline_list']:
+            _log_process(f"Current pipeline: {pipe} (concurrent)")
+            receiver, sender = context.Pipe(duplex=False)
+            worker = context.Process(target=self._run_pipeline_worker, args=(pipe, stage_lock, setup_barrier, sender), name=f"alo-{pipe}")
+            worker.start()
+            sender.close()
+            running[receiver] = (pipe, worker)
+        ## pipeline type - result of the worker ({elapsed} or {error})
+        results = {}
+        while running:
+            for receiver in wait_connections(list(running)):
+                pipe, worker = running.pop(receiver)
+                try:
+                    results[pipe] = receiver.recv()
+                except EOFError:
+                    results[pipe] = {'error': "worker process exited without result"}
+                receiver.close()
+                worker.join()
+                ## the worker exited without passing the barrier (e.g. killed): do not block the other one
+                if 'error' in results[pipe]:
+                    setup_barrier.abort()
+        total_time = time() - start_time
+        ## combined timing: wall time of the concurrent run vs. sum of the pipelines (sequential run)
+        for pipe, result in results.items():
+            if 'elapsed' in result:
+                self.proc_logger.process_message(f"{pipe} total time (concurrent): {round(result['elapsed'], 3)}s")
+        sum_time = sum(result['elapsed'] for result in results.values() if 'elapsed' in result)
+        self.proc_logger.process_message(f"concurrent pipelines total time: {round(total_time, 3)}s (sum of pipelines: {round(sum_time, 3)}s)")
+        failed = {pipe: result['error'] for pipe, result in results.items() if 'error' in result}
+        if len(failed) > 0:
+            ## error backup is done by each worker
+            self.proc_logger.process_error("Failed to execute concurrent pipelines: \n" + \
+                                        "\n".join(f"<< {pipe} >> \n {error}" for pipe, error in failed.items()))
+
+    def _run_pipeline_worker(self, pipe, stage_lock, setup_barrier, sender):
+        """ execute the pipeline in the forked worker process and send the result to the parent process 
+
+        Args:
+            pipe            (str): pipeline type (train_pipeline, inference_pipeline)
+            stage_lock      (Lock): lock shared by the pipeline workers 
+            setup_barrier   (Barrier): barrier shared by the pipeline workers (passed after setup and load)
+            sender          (Connection): connection to the parent process 
+        
+        Returns: -
+
+        """
+        self.system_envs['current_pipeline'] = pipe
+        if pipe == 'inference_pipeline':
+            ## assets of the inference read the model from the train artifacts in {system_envs['artifacts']}
+            self.system_envs['artifacts'] = dict(self.system_envs['artifacts'], train_artifacts=CONCURRENT_TRAIN_ARTIFACTS_PATH)
+        start_time = time()
+        try:
+            self._execute_pipeline(pipe, stage_lock, setup_barrier)
+            result = {'elapsed': time() - start_time}
+        except Exception:
+            result = {'error': traceback.format_exc()}
+            try:
+                with stage_lock:
+                    self._error_backup(pipe)
+            except Exception as e:
+                result['error'] += f"\n Failed to backup error: {str(e)}"
+        try:
+            ## the worker exits by os._exit: write the queued log records before the parent process is notified
+            flush_process_logger()
+            sender.send(result)
+        finally:
+            sender.close()
+
+    def _save_trace(self, pipe):
+        """ save span trace of the pipeline run into {pipeline}_artifacts/log/
+
+        Args:
+            pipe    (str): pipeline type (train_pipeline, inference_pipeline)
+        
+        Returns: -
+
+        """
+        log_path = TRAIN_LOG_PATH if pipe == 'train_pipeline' else INFERENCE_LOG_PATH
+        try:
+            TRACER.save(log_path + TRACE_FILE)
+        except Exception as e:
+            self.proc_logger.process_warning(f"Failed to save span trace: {str(e)}")
+
+    def _start_metrics_server(self):
+        """ start local metrics endpoint (GET /metrics) if metrics port is given
+
+        Args: -
+        
+        Returns: -
+
+        """
+        if self.metrics_port is None:
+            return
+        try:
+            self.metrics_server = MetricsServer(METRICS, self.metrics_port)
+            self.metrics_server.start()
+            self.proc_logger.process_message(f"Metrics endpoint started: http://{METRICS_HOST}:{self.metrics_port}/metrics")
+        except Exception as e:
+            ## do not kill main.py process for the metrics endpoint (only warning)
+            self.proc_logger.process_warning(f"Failed to start metrics endpoint on port {self.metrics_port}: {str(e)}")
+
     def error_loop(self, pipe):
         """ error handler for loop mode 
 
@@ -258,6 +473,7 @@ class ALO:
             "loop"  (str): fixed string 
 
         """
+        METRICS.inc('alo_requests_total', pipeline=pipe, status='fail')
         ## do not kill main.py process when loop mode is True (only warning)
         self.proc_logger.process_warning(f"==========       Error occurs in loop        ==========") 
         self.proc_logger.process_warning(traceback.format_exc())
@@ -332,6 +548,8 @@ class ALO:
             try:
                 ## load sagemaker_config.yaml - (account_id, role, region, ecr_repository, s3_bucket_uri, train_instance_type)
                 sm_config = self.meta.get_yaml(SAGEMAKER_CONFIG) 
+                ## lazy import: boto3, sagemaker are only needed for sagemaker mode
+                from src.sagemaker_handler import SagemakerHandler
                 sm_handler = SagemakerHandler(self.external_path_permission['aws_key_profile'], sm_config)
                 sm_handler.init()
             except Exception as e:
@@ -419,6 +637,8 @@ class ALO:
                 exp_plan_register = inference_exp_plan
             else:
                 exp_plan_register = exp_plan
+        ## lazy import: boto3, docker, requests are only needed for solution registration
+        from src.solution_register import SolutionRegister
         register = SolutionRegister(infra_setup=infra_setup, solution_info=solution_info, experimental_plan=exp_plan_register)
         if upload:
             register.login(username, password)
@@ -439,6 +659,7 @@ class ALO:
         Returns: -
 
         """
+        import pyfiglet
         ascii_art = pyfiglet.figlet_format(msg, font="slant")
         print_color("=" * 80 + "\n", 'BOLD-CYAN')
         print_color(ascii_art, 'BOLD-CYAN')
@@ -480,16 +701,96 @@ class ALO:
         self.meta = Metadata()
         _log_process("Finish setting-up ALO source code")
 
-    def _set_alolib(self):
-        """ setup alolib (alo library) 
-            alolib version must be same as alo's version
+    def _report_startup(self):
+        """ log startup report (per phase wall time, import cost) and keep it in {self.startup_report}
+
+        Args: -
+            
+        Returns: -
+
+        """
+        STARTUP.import_timer.uninstall()
+        self.startup_report = STARTUP.report()
+        phases = ", ".join([f"{phase}: {sec}s" for phase, sec in self.startup_report['phases'].items()])
+        self.proc_logger.process_message(f"ALO startup time: {self.startup_report['total_sec']}s ({phases})")
+        ## regression check of the lazy imports 
+        import_time = self.startup_report['phases'].get('imports', 0)
+        if import_time > STARTUP_IMPORT_BUDGET:
+            self.proc_logger.process_warning(f"ALO import time {import_time}s exceeds the budget {STARTUP_IMPORT_BUDGET}s. Check the import time below.")
+        if len(self.startup_report['imports']) > 0:
+            imports = ", ".join([f"{package}: {stat['self_sec']}s/{stat['cumulative_sec']}s" for package, stat in self.startup_report['imports'].items()])
+            self.proc_logger.process_message(f"ALO startup import time (self/cumulative): {imports}")
+
+    def _get_alolib_fingerprint(self, alo_ver):
+        """ fingerprint of the alolib setup: alolib branch & commit, requirements.txt checksum, 
+            python interpreter and installed distributions snapshot 
+
+        Args: 
+            alo_ver     (str): alo version (branch name)
+            
+        Returns: 
+            fingerprint (dict)
+
+        """
+        alolib_ver, alolib_commit = _read_git_head(ALO_LIB)
+        return {'alo_version': alo_ver, 'alolib_version': alolib_ver, 'alolib_commit': alolib_commit, \
+                'requirements': _get_file_checksum(ALO_LIB + "requirements.txt"), 'python': sys.executable, \
+                'distributions': _get_distributions_checksum()}
+
+    def _check_alolib_fingerprint(self):
+        """ check whether alolib setup is unchanged since the last installation (warm start)
 
         Args: -
             
+        Returns: 
+            bool
+
+        """
+        try:
+            alo_ver, _ = _read_git_head(PROJECT_HOME)
+            if (alo_ver is None) or (not os.path.exists(ALOLIB_FINGERPRINT_FILE)):
+                return False
+            with open(ALOLIB_FINGERPRINT_FILE, 'r') as f:
+                saved_fingerprint = json.load(f)
+            fingerprint = self._get_alolib_fingerprint(alo_ver)
+            return (fingerprint == saved_fingerprint) and (fingerprint['alolib_version'] == alo_ver)
+        except Exception:
+            return False
+
+    def _save_alolib_fingerprint(self, alo_ver):
+        """ save fingerprint of the alolib setup after installation
+
+        Args: 
+            alo_ver     (str): alo version (branch name)
+            
+        Returns: -
+
+        """
+        try:
+            with open(ALOLIB_FINGERPRINT_FILE, 'w') as f:
+                json.dump(self._get_alolib_fingerprint(alo_ver), f)
+        except Exception as e:
+            self.proc_logger.process_warning(f"Failed to save alolib fingerprint: {str(e)}")
+
+    def _set_alolib(self, refresh=False):
+        """ setup alolib (alo library) 
+            alolib version must be same as alo's version.
+            If the fingerprint is unchanged (warm start), git inspection and pip install are skipped.
+
+        Args: 
+            refresh     (bool): ignore the fingerprint and setup again
+            
         Returns: -
 
         """
         _log_process("Start ALO library installation")
+        if (not refresh) and self._check_alolib_fingerprint():
+            sys.path.append(ALO_LIB)
+            self.proc_logger.process_message("alolib and its requirements are unchanged. Skip alolib installation.")
+            _log_process("Finish ALO library installation")
+            return
+        ## lazy import: git is only needed when the fingerprint is changed
+        from git import Repo, GitCommandError
         try:
             alo_main = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             alo_repo = Repo(alo_main)
@@ -514,7 +815,8 @@ class ALO:
         result = subprocess.run(['pip', 'install', '-r', req], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
         if result.returncode == 0:
             self.proc_logger.process_message("Success installing alolib requirements.txt")
-            self.proc_logger.process_message(result.stdout)
+            self.proc_logger.process_message("%s", result.stdout)
+            self._save_alolib_fingerprint(alo_ver)
         else:
             self.proc_logger.process_error(f"Failed installing alolib requirements.txt : \n {result.stderr}")
         _log_process("Finish ALO library installation")
@@ -623,7 +925,7 @@ class ALO:
                 system_envs['pipeline_list'] = [*self.user_parameters]
             else:
                 system_envs['pipeline_list'] = [f"{pipeline_type}_pipeline"]
-        self.proc_logger.process_message(f"system_envs: {system_envs}")
+        self.proc_logger.process_message("system_envs: %s", system_envs)
         _log_process("Finish ALO system environments setup")
         return system_envs
 
@@ -650,8 +952,7 @@ class ALO:
                 ## load from yaml file   
                 if system_value.endswith('.yaml'):
                     try:
-                        with open(system_value, encoding='UTF-8') as file:
-                            content = yaml.load(file, Loader=yaml.FullLoader)  
+                        content = _load_yaml(system_value)
                         ## yaml to json string
                         json_loaded = json.loads(json.dumps(content))
                     except FileNotFoundError:
@@ -659,7 +960,7 @@ class ALO:
                 else:  
                     json_loaded = json.loads(system_value) 
                 _log_process("Finish loading solution-metadata")
-                self.proc_logger.process_message(f"==========        Loaded solution_metadata: \n{json_loaded}")
+                self.proc_logger.process_message("==========        Loaded solution_metadata: \n%s", json_loaded)
         except Exception as e:
             if self.redis_pubsub is not None:
                 self.redis_pubsub.publish("alo_fail", json.dumps(self.redis_error_table["E111"])) 
@@ -794,6 +1095,8 @@ class ALO:
         self.redis_error_table = self._read_redis_error_table()
         self.system_envs['redis_error_table'] = self.redis_error_table
         if system_envs['boot_on'] and system_envs['loop']:
+            ## lazy import: redis is only needed for loop mode
+            from src.redis import RedisList, RedisPubSub
             self.redis_list = RedisList(host=system_envs['redis_host'], port=system_envs['redis_port'], db=system_envs['redis_db_number'])
             self.redis_pubsub = RedisPubSub(host=system_envs['redis_host'], port=system_envs['redis_port'], db=system_envs['redis_db_number'])
             self.redis_pubsub.publish("alo_status", "booting")
@@ -813,6 +1116,8 @@ class ALO:
         Returns: -
 
         """
+        if channel == "alo_fail":
+            METRICS.inc('alo_errors_total', code=_get_error_code(msg))
         if self.redis_pubsub is not None: 
             self.redis_pubsub.publish(channel, msg)
         else: 
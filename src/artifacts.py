@@ -4,6 +4,7 @@ import yaml
 from datetime import datetime
 from src.constants import *
 from src.logger import ProcessLogger
+from src.tracer import TRACER
 
 #--------------------------------------------------------------------------------------------------------------------------
 #    GLOBAL VARIABLE
@@ -41,6 +42,7 @@ class Aritifacts:
             artifacts_dict[dir_name] = PROJECT_HOME + dir_name + "/"
         return artifacts_dict
 
+    @TRACER.traced('backup_history', 'save')
     def backup_history(self, pipe, system_envs, backup_exp_plan,  error=False, size=1000):
         """ backup history (experimental_plan.yaml and artifacts)
 
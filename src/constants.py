@@ -34,13 +34,35 @@ BASE_DIRS_STRUCTURE = {
 }
 ## performance check option (True: measure memory, cpu / False)
 CHECK_RESOURCE_LIST = [True, False] 
+## resource sampling interval (sec) of check_resource (experimental_plan.yaml - resource_interval)
+RESOURCE_INTERVAL = 0.5
+## stack sampling interval (sec) of the step profiler (experimental_plan.yaml - profile_steps)
+PROFILE_SAMPLE_INTERVAL = 0.005
+## memory attribution (experimental_plan.yaml - trace_memory): number of top allocation sites per step, \
+## leak suspected if a step retains memory (net growth) in each of the last {MEMORY_LEAK_RUNS} runs, more than {MEMORY_LEAK_THRESHOLD} bytes in total
+MEMORY_TOP_STATS = 10
+MEMORY_LEAK_RUNS = 3
+MEMORY_LEAK_THRESHOLD = 1024 * 1024
+## metrics endpoint of loop mode (main.py --metrics-port): listen host and latency histogram buckets (sec)
+METRICS_HOST = "0.0.0.0"
+METRICS_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+## number of top-level packages in the import cost of the startup report
+STARTUP_IMPORT_TOP_N = 15
+## import time budget (sec) of the startup: heavy dependencies (boto3, docker, redis, git, sagemaker) are imported lazily
+STARTUP_IMPORT_BUDGET = 0.5
 EXPERIMENTAL_OPTIONAL_KEY_LIST = ["ui_args_detail"]
+## max total size (MB) of the model objects cached for the assets (experimental_plan.yaml - model_cache_size)
+MODEL_CACHE_SIZE = 1024
+## max number of parsed yaml files (experimental plan, solution metadata, summary) kept in memory
+YAML_CACHE_SIZE = 128
 ###################################
 ##### Path
 ###################################
 ## alo base path
 PROJECT_HOME = os.path.dirname(os.path.abspath(os.path.dirname(__file__))) + "/"
 ALO_LIB = PROJECT_HOME + "alolib/"
+## fingerprint of the alolib setup (kept in the .git of alolib; removed together with alolib)
+ALOLIB_FINGERPRINT_FILE = ALO_LIB + ".git/alo_fingerprint.json"
 ASSET_HOME = PROJECT_HOME + "assets/"
 INPUT_DATA_HOME = PROJECT_HOME + "input/"
 TRAIN_ARTIFACTS_PATH = PROJECT_HOME + "train_artifacts/"
@@ -49,6 +71,13 @@ TRAIN_LOG_PATH = PROJECT_HOME + "train_artifacts/log/"
 TRAIN_MODEL_PATH = PROJECT_HOME + "train_artifacts/models/"
 INFERENCE_MODEL_PATH = PROJECT_HOME + "inference_artifacts/models/"
 EXPERIMENTAL_HISTORY_PATH = "log/experimental_history.json"
+## per-step resource usage timeline / summary (check_resource: True)
+RESOURCE_USAGE_PATH = "score/resource_usage.json"
+## per-step cpu profiles (pstats, collapsed stacks)
+PROFILE_PATH = "extra_output/profiles/"
+## train artifacts root of the inference pipeline run concurrently with the train pipeline (concurrent_pipelines: True); \
+## the external model (load_model_path) is loaded into its models/ apart from the train_artifacts being written
+CONCURRENT_TRAIN_ARTIFACTS_PATH = PROJECT_HOME + ".concurrent_train_artifacts/"
 ## artifacts.tar.gz temp saved path before export
 TEMP_ARTIFACTS_PATH = PROJECT_HOME + ".TEMP_ARTIFACTS_PATH/"
 ## model.tar.gz temp saved path before import  
@@ -59,6 +88,21 @@ INFERENCE_SCORE_PATH = PROJECT_HOME + "inference_artifacts/score/"
 INFERENCE_OUTPUT_PATH = PROJECT_HOME + "inference_artifacts/output/" 
 ASSET_PACKAGE_DIR = ".package_list/"
 ASSET_PACKAGE_PATH = PROJECT_HOME + ASSET_PACKAGE_DIR
+## install plan cache (one json per requirement set), not copied into the docker build 
+INSTALL_PLAN_DIR = "install_plan"
+INSTALL_PLAN_PATH = ASSET_PACKAGE_PATH + INSTALL_PLAN_DIR + "/"
+INSTALL_PLAN_MAX = 10
+## local wheelhouse of the requirements (experimental_plan.yaml - wheelhouse), also used by the register Dockerfile 
+WHEELHOUSE_DIR = "wheelhouse"
+WHEELHOUSE_PATH = ASSET_PACKAGE_PATH + WHEELHOUSE_DIR + "/"
+## max number of assets fetched (git clone) concurrently at the pipeline setup
+ASSET_FETCH_WORKERS = 4
+## max number of asset steps run concurrently (one forked worker process per step) when the steps declare << depends_on >> in asset_source
+STEP_MAX_WORKERS = os.cpu_count() or 1
+## bare-mirror cache of the asset git repositories (experimental_plan.yaml - shallow_clone), shared by the projects
+GIT_MIRROR_HOME = os.path.join(os.path.expanduser("~"), ".cache/alo/git-mirrors/")
+## source (url, branch, commit) and code checksum of the git asset, kept in the .git of the asset (get_asset_source: every)
+ASSET_STATE_FILE = ".git/alo_asset_state.json"
 ## AI solution related path 
 SOLUTION_HOME = PROJECT_HOME + "solution/"
 SOURCE_HOME = PROJECT_HOME + "src/"
@@ -88,6 +132,12 @@ COMPRESSED_INFERENCE_ARTIFACTS_ZIP = "inference_artifacts.zip"
 ## log file 
 PROCESS_LOG_FILE = "process.log"
 PIPELINE_LOG_FILE = "pipeline.log" 
+## structured SHOW events of current run (NDJSON sidecar of pipeline.log)
+SHOW_EVENT_FILE = "show_events.ndjson"
+## span trace of current run (Chrome-trace / Perfetto json)
+TRACE_FILE = "trace.json"
+## per-step memory attribution report of current run (trace_memory: True)
+MEMORY_REPORT_FILE = "memory_report.json"
 ## default experimental plan yaml
 DEFAULT_EXP_PLAN = SOLUTION_HOME + "experimental_plan.yaml"
 EXPERIMENTAL_PLAN_FORMAT_FILE = PROJECT_HOME + "src/ConfigFormats/experimental_plan_format.yaml"
@@ -1,16 +1,12 @@
-import boto3
 import hashlib
 import os
 import shutil
 import tarfile 
-from boto3.session import Session
-from botocore.client import Config
-from botocore.exceptions import ProfileNotFound, NoCredentialsError, ClientError
-from botocore.handlers import set_list_objects_encoding_type_url
 from functools import partial
 from urllib.parse import urlparse
 from src.constants import *
 from src.logger import ProcessLogger
+from src.tracer import TRACER
 
 #--------------------------------------------------------------------------------------------------------------------------
 #    GLOBAL VARIABLE
@@ -53,6 +49,9 @@ class S3Handler:
 
         """
         if (aws_key_profile != None) and (len(aws_key_profile)>0): 
+            ## lazy import: boto3 is only needed for aws s3 paths
+            import boto3
+            from botocore.exceptions import ProfileNotFound
             try:
                 session = boto3.Session(profile_name=aws_key_profile)
                 credentials = session.get_credentials().get_frozen_credentials()
@@ -96,6 +95,11 @@ class S3Handler:
             aws s3 client object 
         
         """
+        ## lazy import: boto3 is only needed for aws s3 paths
+        import boto3
+        from boto3.session import Session
+        from botocore.client import Config
+        from botocore.handlers import set_list_objects_encoding_type_url
         try:
             if self.access_key and self.access_key.startswith('GOOG'):
                 session = Session(aws_access_key_id=self.access_key,aws_secret_access_key=self.secret_key)
@@ -120,6 +124,11 @@ class S3Handler:
             aws s3 session resource  
         
         """
+        ## lazy import: boto3 is only needed for aws s3 paths
+        import boto3
+        from boto3.session import Session
+        from botocore.client import Config
+        from botocore.handlers import set_list_objects_encoding_type_url
         try:
             if self.access_key and self.access_key.startswith('GOOG'):
                 session = Session(aws_access_key_id=self.access_key,aws_secret_access_key=self.secret_key)
@@ -142,7 +151,8 @@ class S3Handler:
         """
         PROC_LOGGER.process_message(f">>>>>> Start downloading file from s3 << {_from} >> into \n local << {_to} >>")
         if not os.path.exists(_to):
-            self.s3.download_file(self.bucket, _from, _to)
+            with TRACER.span(f"s3 download {os.path.basename(_to)}", 's3', key=_from):
+                self.s3.download_file(self.bucket, _from, _to)
             
     def download_folder(self, input_path):
         """ download all the contents in the s3 uri recursively
@@ -226,6 +236,7 @@ class S3Handler:
         Returns: -
         
         """
+        from botocore.exceptions import NoCredentialsError, ClientError
         s3 = self.create_s3_session_resource() 
         bucket = s3.Bucket(self.bucket)
         ## check bucket access  
@@ -248,7 +259,7 @@ class S3Handler:
         base_name = os.path.basename(os.path.normpath(file_path))
         bucket_upload_path = self.s3_folder + base_name 
         try:
-            with open(f'{file_path}', 'rb') as tar_file:  
+            with open(f'{file_path}', 'rb') as tar_file, TRACER.span(f"s3 upload {base_name}", 's3', key=bucket_upload_path):  
                 bucket.put_object(Key=bucket_upload_path, Body=tar_file, ContentType='artifacts/gzip')
         except: 
             PROC_LOGGER.process_error(f"Failed to upload << {file_path} >> onto << {self.s3_uri} >>.")
@@ -332,18 +343,18 @@ class ExternalHandler:
             PROC_LOGGER.process_message(f"Successfuly finish loading << {ext_path} >> into << {INPUT_DATA_HOME} >>")
         return data_checksums
             
-    def external_load_model(self, external_path, external_path_permission): 
+    def external_load_model(self, external_path, external_path_permission, models_path=TRAIN_MODEL_PATH): 
         """ Get model from external path (single path). Only supported in inference pipeline.
             If model.tar.gz file exists in the external path, download it into "train_artifacts/models/" as decompressed. 
             If model.tar.gz file doesn't exist in the external path, copy all the files (or folders) into "train_artifacts/models/"
         Args: 
             external_path               (dict): experimental_plan.yaml - external_path dict
             external_path_permission    (dict): experimental_plan.yaml - external_path_permission dict  
+            models_path                 (str): models path to load into (default: train_artifacts/models/)
             
         Returns: -
         
         """
-        models_path = TRAIN_MODEL_PATH
         ## empty "train_artifacts/models/"
         try: 
             if os.path.exists(models_path) == False: 
@@ -700,6 +711,7 @@ class ExternalHandler:
         else: 
             PROC_LOGGER.process_error(f'<< {_ext_path} >> is unsupported type of external save artifacts path. \n Do not enter the file path. (Finish the path with directory name)')
                 
+    @TRACER.traced('compress artifacts', 'save')
     def _compress_dir(self, _path, file_extension='tar.gz'): 
         """ compress directory 
         
@@ -1,10 +1,24 @@
-import pkg_resources
+import hashlib
+import json
 import os
 import subprocess
 import sys
 from collections import defaultdict
+from importlib.metadata import PathDistribution
+from pathlib import Path
+try:
+    from packaging.requirements import InvalidRequirement, Requirement
+    from packaging.utils import canonicalize_name
+    from packaging.version import InvalidVersion
+except ImportError:
+    ## packaging vendored in pip (always available where pip install works)
+    from pip._vendor.packaging.requirements import InvalidRequirement, Requirement
+    from pip._vendor.packaging.utils import canonicalize_name
+    from pip._vendor.packaging.version import InvalidVersion
 from src.logger import ProcessLogger 
 from src.constants import *
+from src.tracer import TRACER
+from src.utils import _get_distributions_checksum
 
 #--------------------------------------------------------------------------------------------------------------------------
 #    GLOBAL VARIABLE
@@ -12,7 +26,170 @@ from src.constants import *
 PROC_LOGGER = ProcessLogger(PROJECT_HOME)
 #--------------------------------------------------------------------------------------------------------------------------
 
+class DistributionIndex:
+    def __init__(self):
+        """ index of the installed distributions (normalized name - version), built once and 
+            rebuilt only when a requirement is not satisfied after some installations (stale index). 
+        
+        Args: -
+            
+        Returns: -
+
+        """
+        self.versions = None
+        self.stale = False
+        ## requirement - (status, version) checked against the current index
+        self.checked = {}
+
+    def build(self):
+        """ build index from the metadata directories on sys.path. 
+            The name and version of *.dist-info are in the directory name ({name}-{version}.dist-info), 
+            the others (e.g. *.egg-info) are read by importlib.metadata. 
+            The first found on sys.path wins, as in the import system.
+
+        Args: -
+            
+        Returns: -
+
+        """
+        versions = {}
+        for path in sys.path:
+            if not os.path.isdir(path):
+                continue
+            with os.scandir(path) as it:
+                entries = sorted(entry.name for entry in it if entry.name.endswith(('.dist-info', '.egg-info')))
+            for entry in entries:
+                stem = entry[:-len('.dist-info')]
+                if entry.endswith('.dist-info') and stem.count('-') == 1:
+                    name, version = stem.split('-')
+                else:
+                    try:
+                        metadata = PathDistribution(Path(path, entry)).metadata
+                        name, version = metadata['Name'], metadata['Version']
+                    except Exception:
+                        continue
+                    if (name is None) or (version is None):
+                        continue
+                versions.setdefault(canonicalize_name(name), version)
+        self.versions = versions
+        self.stale = False
+        self.checked = {}
+
+    def invalidate(self):
+        """ mark index stale (e.g. after pip install) 
+
+        Args: -
+            
+        Returns: -
+
+        """
+        self.stale = True
+        self.checked = {}
+
+    def _check(self, requirement):
+        """ check the requirement against the index
+
+        Args: 
+            requirement (Requirement): parsed requirement
+            
+        Returns: 
+            status      (str): ok / not_found / conflict
+            version     (str): installed version (None if not installed)
+
+        """
+        installed_version = self.versions.get(canonicalize_name(requirement.name))
+        if installed_version is None:
+            return 'not_found', None
+        ## url requirement (e.g. {package} @ git+http://~.git@ver~) or version not specified
+        if len(requirement.specifier) == 0:
+            return 'ok', installed_version
+        try:
+            if requirement.specifier.contains(installed_version, prereleases=True):
+                return 'ok', installed_version
+        except InvalidVersion:
+            ## installed version is not PEP 440 (e.g. 1.0-custom): cannot be compared, so it is re-installed
+            pass
+        return 'conflict', installed_version
+
+    def check(self, package):
+        """ check whether the requirement is satisfied by the installed distributions
+
+        Args: 
+            package     (str): requirement (e.g. pandas==1.5.3, numpy>=1.22,<2)
+            
+        Returns: 
+            status      (str): ok / not_found / conflict / invalid
+            version     (str): installed version (None if not installed)
+
+        """
+        if package in self.checked:
+            return self.checked[package]
+        try:
+            requirement = Requirement(package)
+        except InvalidRequirement:
+            return 'invalid', None
+        ## environment markers (e.g. ; python_version < "3.8") not matched: nothing to install
+        if (requirement.marker is not None) and (not requirement.marker.evaluate()):
+            return 'ok', None
+        if self.versions is None:
+            self.build()
+        status, version = self._check(requirement)
+        ## the requirement may have been installed as a dependency of another package: rebuild once and check again
+        if (status != 'ok') and self.stale:
+            self.build()
+            status, version = self._check(requirement)
+        self.checked[package] = (status, version)
+        return status, version
+
 class Packages:
+    def __init__(self, wheelhouse=None):
+        """ install the requirements of ALO and the assets
+
+        Args:           
+            wheelhouse  (str): local wheelhouse directory (None: always install from the index). 
+                               Requirements are installed from the wheelhouse with --no-index, 
+                               and only the misses are built into the wheelhouse from the index.
+            
+        Returns: -
+
+        """
+        self.wheelhouse = wheelhouse
+        ## installed distributions index and checksum prepared while the assets are fetched (prepare_dependency_check)
+        self.prepared = None
+
+    def prepare_dependency_check(self):
+        """ build the installed distributions index and checksum ahead of check_install_requirements 
+            (e.g. while the assets are being fetched). No package must be installed in between.
+
+        Args: -
+            
+        Returns: -
+
+        """
+        dist_index = DistributionIndex()
+        dist_index.build()
+        self.prepared = (dist_index, _get_distributions_checksum())
+
+    def precheck_requirements(self, packages):
+        """ check the requirements of a step against the prepared index (the results are reused by check_install_requirements)
+
+        Args:           
+            packages    (list): requirements of the step (extract_step_requirements)
+            
+        Returns: -
+
+        """
+        if (self.prepared is None) or (packages is None):
+            return
+        dist_index, _ = self.prepared
+        for package in packages:
+            package = package.replace(" ", "")
+            if package.startswith("#") or (package == "") or ("--force-reinstall" in package) or ("--index-url" in package):
+                continue
+            if '#' in package:
+                package = package[ : package.index('#')]
+            dist_index.check(package)
+
     def extract_requirements_txt(self, step_name): 
         """ If a requirements.txt exists within the ALO master or each user asset, 
             extract the packages written inside it into a list.
@@ -38,99 +215,255 @@ class Packages:
                 However, you have written {fixed_txt_name} at that step in << config/experimental_plan.yaml >>. \n \
                 Please remove {fixed_txt_name} in the yaml file.")
 
-    def _install_packages(self, dup_checked_requirements_dict, dup_chk_set): 
-        """ install all the packages 
+    def _pip_install(self, args, desc, command='install'):
+        """ run a single pip install subprocess (output is captured for outcome parsing)
 
         Args:           
-            step_name   (str): Name of the asset to be installed under assets directory.
+            args    (list): pip install arguments (packages and options)
+            desc    (str): description of the installation for the log and trace
+            command (str): pip command (install / wheel)
             
         Returns:
-            packages_in_txt (list): package list in requirements.txt
+            result  (CompletedProcess): returncode, stdout, stderr
+
+        """
+        PROC_LOGGER.process_message(f'>>> Start pip {command} ({desc}) - {args}')
+        with TRACER.span(f"pip {command} {desc}", 'pip', num_args=len(args)):
+            result = subprocess.run([sys.executable, '-m', 'pip', command] + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        PROC_LOGGER.process_message("%s", result.stdout)
+        if result.returncode != 0:
+            PROC_LOGGER.process_warning("%s", result.stderr)
+        return result
+
+    def _parse_pip_outcome(self, stdout):
+        """ parse installed packages from pip install output 
+            (e.g. "Successfully installed numpy-1.26.4 pandas-2.2.1")
+
+        Args:           
+            stdout  (str): pip install stdout
+            
+        Returns:
+            installed   (dict): normalized package name - installed version
+
+        """
+        installed = {}
+        for line in stdout.splitlines():
+            if line.startswith('Successfully installed '):
+                for item in line[len('Successfully installed '):].split():
+                    name, _, version = item.rpartition('-')
+                    installed[canonicalize_name(name)] = version
+        return installed
+
+    def _package_name(self, package):
+        """ normalized package name of the requirement 
+
+        Args:           
+            package     (str): requirement (e.g. pandas==1.5.3)
+            
+        Returns:
+            name        (str): normalized package name (requirement itself if not parsable)
+
+        """
+        try:
+            return canonicalize_name(Requirement(package).name)
+        except InvalidRequirement:
+            return package
+
+    def _install_batch(self, packages, desc, options=None):
+        """ install packages with a single pip invocation. 
+            If the batch fails, install the packages one by one to find out the failed package.
+
+        Args:           
+            packages    (list): requirements to install 
+            desc        (str): description of the installation
+            options     (list): pip install options (e.g. --force-reinstall; None: no option)
+            
+        Returns:
+            installed   (dict): normalized package name - installed version
+
+        """
+        options = list(options) if options is not None else []
+        if len(packages) == 0:
+            return {}
+        if self.wheelhouse is not None:
+            installed = self._install_from_wheelhouse(packages, desc, options)
+            if installed is not None:
+                return installed
+            PROC_LOGGER.process_warning(f'Failed to install packages from the wheelhouse ({desc}). Install from the index.')
+        result = self._pip_install(packages + options, desc)
+        if result.returncode == 0:
+            return self._parse_pip_outcome(result.stdout)
+        PROC_LOGGER.process_warning(f'Failed to install packages at once ({desc}). Start installing packages one by one.')
+        installed = {}
+        for package in packages:
+            result = self._pip_install([package] + options, package)
+            if result.returncode != 0:
+                PROC_LOGGER.process_error(f"Error occurs while installing {package} @ {desc} ~ \n{result.stderr}")
+            installed.update(self._parse_pip_outcome(result.stdout))
+        return installed
+
+    def _install_from_wheelhouse(self, packages, desc, options=None):
+        """ install packages from the local wheelhouse without the index (--no-index --find-links). 
+            If some of them (or their dependencies) are not in the wheelhouse, 
+            build their wheels into the wheelhouse from the index (pip wheel) and install again. 
+
+        Args:           
+            packages    (list): requirements to install 
+            desc        (str): description of the installation
+            options     (list): pip install options (e.g. --force-reinstall, --index-url {url}; None: no option)
+            
+        Returns:
+            installed   (dict): normalized package name - installed version (None if failed)
+
+        """
+        options = list(options) if options is not None else []
+        os.makedirs(self.wheelhouse, exist_ok=True)
+        offline_options = ['--no-index', '--find-links', self.wheelhouse]
+        ## --force-reinstall is only for pip install, --index-url only for pip wheel (index used)
+        install_options = ['--force-reinstall'] if '--force-reinstall' in options else []
+        index_options = [opt for opt in options if opt != '--force-reinstall']
+        result = self._pip_install(packages + install_options + offline_options, f'{desc}, wheelhouse')
+        if result.returncode == 0:
+            return self._parse_pip_outcome(result.stdout)
+        PROC_LOGGER.process_message(f'Some packages are not in the wheelhouse ({desc}). Build the missing wheels into {self.wheelhouse}')
+        result = self._pip_install(packages + index_options + ['--wheel-dir', self.wheelhouse, '--find-links', self.wheelhouse], desc, 'wheel')
+        if result.returncode != 0:
+            return None
+        result = self._pip_install(packages + install_options + offline_options, f'{desc}, wheelhouse')
+        if result.returncode != 0:
+            return None
+        return self._parse_pip_outcome(result.stdout)
+
+    def _install_packages(self, dup_checked_requirements_dict, dup_chk_set, dist_index=None): 
+        """ Install all the packages. 
+            The unsatisfied requirements of all the steps are installed with a single pip invocation, 
+            plus one for --force-reinstall packages and one per --index-url.
+
+        Args:           
+            dup_checked_requirements_dict   (dict): step name - requirements (duplicates removed by the step priority)
+            dup_chk_set                     (set): all the package names to check 
+            dist_index                      (DistributionIndex): installed distributions index (None: built here)
+            
+        Returns: -
 
         """
-        fixed_txt_name  = 'requirements.txt'
         total_num_install = len(dup_chk_set)
         count = 1
+        ## installed distributions index (instead of probing each package)
+        if dist_index is None:
+            dist_index = DistributionIndex()
+        ## unsatisfied requirements in the install priority (steps order)
+        missing_list = []
+        force_reinstall_list = []
+        ## index url - packages
+        index_url_dict = defaultdict(list)
         ## Check for the existence of each package in the {priority_sorted_pkg_list} \
-        ## in the user environment and install if not present.
+        ## in the user environment and collect the packages to install.
         for step_name, package_list in dup_checked_requirements_dict.items(): 
-            PROC_LOGGER.process_message(f"======================================== Start dependency installation : << {step_name} >> ")
+            PROC_LOGGER.process_message(f"======================================== Start dependency check : << {step_name} >> ")
             for package in package_list:
-                PROC_LOGGER.process_message(f"Start checking existence & installing package - {package} | Progress: ( {count} / {total_num_install} total packages ) ")
+                PROC_LOGGER.process_message(f"Start checking existence of package - {package} | Progress: ( {count} / {total_num_install} total packages ) ")
                 count += 1
                 if "--force-reinstall" in package: 
-                    try: 
-                        PROC_LOGGER.process_message(f'>>> Start installing package - {package}')
-                        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package.replace('--force-reinstall', '').strip(), '--force-reinstall'])            
-                    except OSError as e:
-                        PROC_LOGGER.process_error(f"Error occurs while --force-reinstalling {package} ~ " + e)  
+                    force_reinstall_list.append(package.replace('--force-reinstall', '').strip())
                     continue 
-                
                 if "--index-url" in package:
-                    try: 
-                        PROC_LOGGER.process_message(f'>>> Start installing package - {package}')
-                        split_name = package.split(" ")
-                        subprocess.check_call([sys.executable, '-m', 'pip', 'install', split_name[0], split_name[1],split_name[2]])
-                    except OSError as e:
-                        PROC_LOGGER.process_error(f"Error occurs while --force-reinstalling {package} ~ " + e)  
+                    ## {package} --index-url {url}
+                    split_name = package.split(" ")
+                    index_url_dict[split_name[2]].append(split_name[0])
                     continue 
                 ## Check whether the same version is already installed.
-                try:
-                    ## {package} @ git+http://~.git@ver~ format in the requirements.txt don't cause conflict.
-                    ## Even if the user specifies the package name without a version, the following code will pass
-                    pkg_resources.get_distribution(package) 
+                ## {package} @ git+http://~.git@ver~ format in the requirements.txt don't cause conflict.
+                ## Even if the user specifies the package name without a version, the check will pass
+                status, installed_version = dist_index.check(package)
+                if status == 'ok':
                     PROC_LOGGER.process_message(f'[OK] << {package} >> already exists')
                 ## In the case where the package is not installed at all in the user's virtual environment.
-                except pkg_resources.DistributionNotFound:  
-                    try: 
-                        PROC_LOGGER.process_message(f'>>> Start installing package - {package}')
-                        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-                    except OSError as e:
-                        ## only support txt file named requirements.txt
-                        PROC_LOGGER.process_error(f"Error occurs while installing {package}. If you want to install from packages written file, make sure that your file name is << {fixed_txt_name} >> ~ " + e)
+                elif status == 'not_found':  
+                    missing_list.append(package)
                 ## Reinstall if installed but the version is different.
-                except pkg_resources.VersionConflict:  
-                    try:
-                        PROC_LOGGER.process_warning(f'VersionConflict occurs. Start re-installing package << {package} >>. \n You should check the dependency for the package among assets.')
-                        subprocess.check_call([sys.executable, '-m', 'pip', 'install', package])
-                    except OSError as e:
-                        PROC_LOGGER.process_error(f"Error occurs while re-installing {package} ~ " + e)  
-                except pkg_resources.ResolutionError:  
-                    PROC_LOGGER.process_error(f'ResolutionError occurs while installing package {package} @ {step_name} step. \n Please check the package name or dependency with other asset.')
-                except pkg_resources.ExtractionError: 
-                    PROC_LOGGER.process_error(f'ExtractionError occurs while installing package {package} @ {step_name} step. \n Please check the package name or dependency with other asset.')
+                elif status == 'conflict':  
+                    PROC_LOGGER.process_warning(f'VersionConflict occurs (installed: {installed_version}). Re-install package << {package} >>. \n You should check the dependency for the package among assets.')
+                    missing_list.append(package)
+                else:  
+                    PROC_LOGGER.process_error(f'Invalid requirement << {package} >> @ {step_name} step. \n Please check the package name or dependency with other asset.')
+        ## install the unsatisfied requirements at once (pip resolves them together)
+        installed = self._install_batch(missing_list, 'requirements')
+        installed.update(self._install_batch(force_reinstall_list, 'force-reinstall', ['--force-reinstall']))
+        for index_url, packages in index_url_dict.items():
+            installed.update(self._install_batch(packages, f'index-url {index_url}', ['--index-url', index_url]))
+        ## per-package outcome 
+        if len(missing_list) > 0:
+            dist_index.invalidate()
+            for package in missing_list:
+                status, installed_version = dist_index.check(package)
+                if status == 'ok':
+                    PROC_LOGGER.process_message(f'[Installed] << {package} >> : {installed.get(self._package_name(package), installed_version)}')
+                else:
+                    PROC_LOGGER.process_warning(f'<< {package} >> is not satisfied after installation (installed: {installed_version}). \n You should check the dependency for the package among assets.')
+        for package in force_reinstall_list + [package for packages in index_url_dict.values() for package in packages]:
+            PROC_LOGGER.process_message(f'[Installed] << {package} >> : {installed.get(self._package_name(package), "already satisfied")}')
         PROC_LOGGER.process_message(f"======================================== Finish dependency installation \n")
         return 
 
-    def check_install_requirements(self, requirements_dict):
+    def extract_step_requirements(self, step_name, requirements_list):
+        """ requirements of the step, with the packages of requirements.txt (if written) extracted in its place. 
+            The asset of the step must be ready (requirements.txt is read from the assets/{step_name} directory).
+
+        Args:           
+            step_name           (str): step name
+            requirements_list   (list): requirements written in experimental_plan.yaml
+            
+        Returns:
+            extracted_list      (list): requirements without duplicates (None if no requirements)
+
+        """
+        fixed_txt_name = 'requirements.txt'
+        if requirements_list==None or requirements_list ==[]: 
+            return None
+        ## requirements.txt exists
+        if fixed_txt_name in requirements_list:
+            requirements_txt_list = self.extract_requirements_txt(step_name)
+            requirements_txt_list = sorted(set(requirements_txt_list), key = lambda x: requirements_txt_list.index(x)) 
+            yaml_written_list = sorted(set(requirements_list), key = lambda x: requirements_list.index(x)) 
+            fixed_txt_index = yaml_written_list.index(fixed_txt_name)                
+            return yaml_written_list[ : fixed_txt_index] + requirements_txt_list + yaml_written_list[fixed_txt_index + 1 : ]
+        ## requirements.txt does not exist
+        else:
+            return sorted(set(requirements_list), key = lambda x: requirements_list.index(x)) 
+
+    def check_install_requirements(self, requirements_dict, extracted_requirements_dict=None):
         """ Check whether the packages required for each step (written in requirements.txt or experimental_plan.yaml) 
             are installed in the current user's virtual environment; if not, attempt to install them.
             Packages with the --force-reinstall argument are reinstalled separately at the end, even if they are duplicates.
+            The result is kept as an install plan (.package_list/install_plan/), so that an unchanged requirement set 
+            skips the check and a changed one only checks the changed requirements.
+            (Note) --force-reinstall (and --index-url) packages are regarded as satisfied once installed: they are not 
+            reinstalled while the install plan covers them and the installed distributions are unchanged.
         
         Args:           
-            requirements_dict   (dict): requirements needed for each step.
-                                        (key - step name, value - requirements list)
+            requirements_dict           (dict): requirements needed for each step.
+                                                (key - step name, value - requirements list)
+            extracted_requirements_dict (dict): requirements of the steps already extracted by extract_step_requirements
+                                                (None: extracted here)
             
-        Returns: -
+        Returns: 
+            dup_checked_requirements_dict   (dict): step name - requirements (duplicates removed by the step priority)
+            extracted_requirements_dict     (dict): step name - requirements (requirements.txt extracted)
 
         """ 
-        fixed_txt_name = 'requirements.txt'
         ## If a requirements.txt exists for a certain step, check for the existence of the txt file within \
         ## the assets/{asset} directory and extract the packages listed within it.
+        ## (kept in the step order; steps without requirements are excluded)
+        already_extracted_dict = extracted_requirements_dict if extracted_requirements_dict is not None else dict()
         extracted_requirements_dict = dict() 
         for step_name, requirements_list in requirements_dict.items(): 
-            if requirements_list==None or requirements_list ==[]: 
-                continue 
-            ## requirements.txt exists
-            if fixed_txt_name in requirements_list:
-                requirements_txt_list = self.extract_requirements_txt(step_name)
-                requirements_txt_list = sorted(set(requirements_txt_list), key = lambda x: requirements_txt_list.index(x)) 
-                yaml_written_list = sorted(set(requirements_list), key = lambda x: requirements_list.index(x)) 
-                fixed_txt_index = yaml_written_list.index(fixed_txt_name)                
-                extracted_requirements_dict[step_name] = yaml_written_list[ : fixed_txt_index] + requirements_txt_list + yaml_written_list[fixed_txt_index + 1 : ]
-            ## requirements.txt does not exist
+            if step_name in already_extracted_dict:
+                extracted_list = already_extracted_dict[step_name]
             else:
-                extracted_requirements_dict[step_name] = sorted(set(requirements_list), key = lambda x: requirements_list.index(x)) 
+                extracted_list = self.extract_step_requirements(step_name, requirements_list)
+            if extracted_list is not None:
+                extracted_requirements_dict[step_name] = extracted_list
         ## (install priority)
         ## 1. ALO master dependency packages \
         ## 2. earlier steps in the current pipeline \ 
@@ -189,6 +522,125 @@ class Packages:
         ## force reinstall is added to perform the installation again at the end
         dup_checked_requirements_dict['force-reinstall'] = force_reinstall_list
         dup_checked_requirements_dict['link_install'] = link_install_list
+        ## install plan of the same requirement set and the same installed distributions: skip the dependency check
+        plan_key = self._get_install_plan_key(dup_checked_requirements_dict)
+        ## index and checksum prepared during the asset fetch (used once)
+        dist_index, distributions = self.prepared if self.prepared is not None else (None, _get_distributions_checksum())
+        self.prepared = None
+        plan = self._load_install_plan(plan_key)
+        if (plan is not None) and (plan['distributions'] == distributions) and (len(plan['unsatisfied']) == 0):
+            PROC_LOGGER.process_message(f"Skipped dependency check. The same requirements are already satisfied (install plan: {INSTALL_PLAN_PATH}{plan_key}.json)")
+            return dup_checked_requirements_dict, extracted_requirements_dict
+        ## check and install only the requirements not satisfied by the previous install plans (delta)
+        satisfied_set = self._get_satisfied_requirements(distributions)
+        delta_requirements_dict = {step_name: [pkg for pkg in package_list if pkg not in satisfied_set] \
+                                    for step_name, package_list in dup_checked_requirements_dict.items()}
+        delta_chk_set = set(pkg for package_list in delta_requirements_dict.values() for pkg in package_list)
+        if len(satisfied_set) > 0: 
+            PROC_LOGGER.process_message(f"Checking {len(delta_chk_set)} changed requirements only. The others are satisfied by the previous install plan.")
         ## install packages 
-        self._install_packages(dup_checked_requirements_dict, dup_chk_set)
+        self._install_packages(delta_requirements_dict, delta_chk_set, dist_index)
+        ## installing the delta may change the dependencies of the others: verify the whole requirement set
+        unsatisfied = self._verify_requirements(dup_checked_requirements_dict) if len(delta_chk_set) > 0 else []
+        self._save_install_plan(plan_key, dup_checked_requirements_dict, unsatisfied)
         return dup_checked_requirements_dict, extracted_requirements_dict
+
+    def _get_install_plan_key(self, dup_checked_requirements_dict):
+        """ key of the install plan: hash of the requirement set of all the steps (including requirements.txt contents) 
+            and the interpreter
+
+        Args:           
+            dup_checked_requirements_dict   (dict): step name - requirements
+            
+        Returns:
+            plan_key    (str)
+
+        """
+        key_source = {'requirements': dup_checked_requirements_dict, 'python': sys.executable, 'version': sys.version}
+        return hashlib.md5(json.dumps(key_source, sort_keys=True).encode()).hexdigest()
+
+    def _load_install_plan(self, plan_key):
+        """ load install plan (None if not exists or broken)
+
+        Args:           
+            plan_key    (str): install plan key
+            
+        Returns:
+            plan        (dict): key, python, distributions, requirements, satisfied, unsatisfied
+
+        """
+        try:
+            with open(INSTALL_PLAN_PATH + plan_key + '.json', 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _get_satisfied_requirements(self, distributions):
+        """ requirements satisfied in the install plans whose installed distributions are the same as now 
+
+        Args:           
+            distributions   (str): current installed distributions checksum
+            
+        Returns:
+            satisfied_set   (set)
+
+        """
+        satisfied_set = set()
+        if not os.path.isdir(INSTALL_PLAN_PATH):
+            return satisfied_set
+        for file in os.listdir(INSTALL_PLAN_PATH):
+            plan = self._load_install_plan(os.path.splitext(file)[0])
+            if (plan is not None) and (plan['python'] == sys.executable) and (plan['distributions'] == distributions):
+                satisfied_set.update(plan['satisfied'])
+        return satisfied_set
+
+    def _verify_requirements(self, dup_checked_requirements_dict):
+        """ requirements not satisfied by the installed distributions. 
+            --force-reinstall and --index-url requirements are regarded as satisfied once installed.
+
+        Args:           
+            dup_checked_requirements_dict   (dict): step name - requirements
+            
+        Returns:
+            unsatisfied (list)
+
+        """
+        dist_index = DistributionIndex()
+        unsatisfied = []
+        for package_list in dup_checked_requirements_dict.values():
+            for package in package_list:
+                if ("--force-reinstall" in package) or ("--index-url" in package):
+                    continue
+                status, _ = dist_index.check(package)
+                if status != 'ok':
+                    unsatisfied.append(package)
+        return unsatisfied
+
+    def _save_install_plan(self, plan_key, dup_checked_requirements_dict, unsatisfied):
+        """ save install plan of the requirement set (lockfile-style json). 
+            Only the latest {INSTALL_PLAN_MAX} plans are kept.
+
+        Args:           
+            plan_key                        (str): install plan key
+            dup_checked_requirements_dict   (dict): step name - requirements
+            unsatisfied                     (list): requirements not satisfied after installation
+            
+        Returns: -
+
+        """
+        all_requirements = [pkg for package_list in dup_checked_requirements_dict.values() for pkg in package_list]
+        plan = {'key': plan_key, 
+                'python': sys.executable, 
+                'distributions': _get_distributions_checksum(),
+                'requirements': dup_checked_requirements_dict,
+                'satisfied': [pkg for pkg in all_requirements if pkg not in unsatisfied],
+                'unsatisfied': unsatisfied}
+        try:
+            os.makedirs(INSTALL_PLAN_PATH, exist_ok=True)
+            with open(INSTALL_PLAN_PATH + plan_key + '.json', 'w') as f:
+                json.dump(plan, f, indent=4)
+            plan_files = sorted(os.listdir(INSTALL_PLAN_PATH), key=lambda x: os.path.getmtime(INSTALL_PLAN_PATH + x), reverse=True)
+            for file in plan_files[INSTALL_PLAN_MAX:]:
+                os.remove(INSTALL_PLAN_PATH + file)
+        except OSError as e:
+            PROC_LOGGER.process_warning(f"Failed to save install plan: {e}")
@@ -1,14 +1,46 @@
+import atexit
 import colorama
-import inspect 
+import hashlib
+import json
 import logging
-import logging.config
 import logging.handlers
+import multiprocessing.util
 import os 
+import queue
+import threading
+import time
+from collections import deque
 from colorama import Fore, Style
 from src.constants import *
 ## initialize colorama
 colorama.init()
 
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+## ALO MSG (message) level
+MSG_LOG_LEVEL = 11
+logging.addLevelName(MSG_LOG_LEVEL, 'MSG')
+## process loggers and their levels (name: level)
+PROCESS_LOGGERS = {"ERROR": logging.ERROR, "WARNING": logging.WARNING, "INFO": logging.INFO, "MSG": MSG_LOG_LEVEL}
+## handlers are configured once per process and shared by every ProcessLogger instance.
+## records are put into {_LOG_QUEUE} and written to console / files by the {_LOG_LISTENER} background thread
+_LOG_LOCK = threading.RLock()
+_LOG_QUEUE = None
+_LOG_QUEUE_HANDLER = None
+_LOG_LISTENER = None
+_LOG_HANDLERS = []
+_LOG_FILES = []
+_LOGGERS = {}
+## stack level of the original caller seen from the logger method call in the log decorators
+CALLER_STACK_LEVEL = 2
+## payloads (%-style args, callables) longer than this are truncated and hashed when rendered
+LOG_PAYLOAD_BYTES_LIMIT = int(os.getenv('ALO_LOG_PAYLOAD_LIMIT', 8192))
+## SHOW log level name (alolib) and max number of SHOW events kept in memory
+SHOW_LEVEL_NAME = 'SHOW'
+SHOW_EVENT_BUFFER_SIZE = 10000
+#--------------------------------------------------------------------------------------------------------------------------
+
 class ColoredFormatter(logging.Formatter):
     COLORS = {
         logging.INFO: Fore.GREEN,
@@ -30,6 +62,236 @@ class ColoredFormatter(logging.Formatter):
         message = super().format(record)
         return f"{log_color}{message}{Style.RESET_ALL}"
 
+def _make_process_handlers(service):
+    """ make console & file handlers for process logging
+        (process logs are written into train & inference artifacts redundantly)
+
+    Args:
+        service (str): service name written in the log format (e.g. ALO)
+
+    Returns:
+        handlers    (list): console, train file, inference file handlers
+        log_files   (list): process log file paths
+
+    """
+    ## caller info (original caller of ProcessLogger API) is filled by logging.Logger.findCaller()
+    log_format = f"[%(asctime)s|{service}|%(levelname)s|%(filename)s(%(lineno)d)|%(funcName)s()] %(message)s"
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ColoredFormatter(log_format))
+    handlers, log_files = [console_handler], []
+    for log_path in [TRAIN_LOG_PATH, INFERENCE_LOG_PATH]:
+        file_handler = logging.FileHandler(log_path + PROCESS_LOG_FILE)
+        file_handler.setFormatter(logging.Formatter(log_format))
+        handlers.append(file_handler)
+        log_files.append(log_path + PROCESS_LOG_FILE)
+    for handler in handlers:
+        handler.setLevel(MSG_LOG_LEVEL)
+    return handlers, log_files
+
+def _close_process_handlers():
+    """ stop the background listener (pending records are written first) and close handlers
+
+    Args: -
+
+    Returns: -
+
+    """
+    global _LOG_LISTENER, _LOG_HANDLERS
+    with _LOG_LOCK:
+        if _LOG_LISTENER is not None:
+            _LOG_LISTENER.stop()
+            _LOG_LISTENER = None
+        for handler in _LOG_HANDLERS:
+            try:
+                handler.flush()
+                handler.close()
+            except Exception:
+                pass
+        _LOG_HANDLERS = []
+
+def configure_process_logging(service='ALO', force=False):
+    """ configure process logging handlers once per process.
+        Re-configure only if forced or the process log files have been removed (e.g. log directory refreshed).
+
+    Args:
+        service (str): service name written in the log format
+        force   (bool): whether to re-configure even if already configured
+
+    Returns: -
+
+    """
+    global _LOG_QUEUE, _LOG_QUEUE_HANDLER, _LOG_LISTENER, _LOG_HANDLERS, _LOG_FILES
+    with _LOG_LOCK:
+        if (not force) and (_LOG_LISTENER is not None) and all(os.path.isfile(f) for f in _LOG_FILES):
+            return
+        _close_process_handlers()
+        for name in PROCESS_LOGGERS:
+            _logger = logging.getLogger(name)
+            if _LOG_QUEUE_HANDLER in _logger.handlers:
+                _logger.removeHandler(_LOG_QUEUE_HANDLER)
+        _LOG_HANDLERS, _LOG_FILES = _make_process_handlers(service)
+        _LOG_QUEUE = queue.SimpleQueue()
+        _LOG_QUEUE_HANDLER = logging.handlers.QueueHandler(_LOG_QUEUE)
+        _LOG_LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, *_LOG_HANDLERS, respect_handler_level=True)
+        _LOG_LISTENER.start()
+        _attach_process_logging()
+
+def _attach_process_logging():
+    """ attach the queue handler to the process loggers (not propagated: the records of other libraries 
+        are not written into process.log). The running listener and its handlers are kept as they are.
+
+    Args: -
+
+    Returns: -
+
+    """
+    with _LOG_LOCK:
+        logging.getLogger().setLevel(MSG_LOG_LEVEL)
+        for name, level in PROCESS_LOGGERS.items():
+            _logger = logging.getLogger(name)
+            if _LOG_QUEUE_HANDLER not in _logger.handlers:
+                _logger.addHandler(_LOG_QUEUE_HANDLER)
+            _logger.propagate = False
+            _logger.setLevel(level)
+            _logger.disabled = False
+            _LOGGERS[name] = _logger
+
+def get_process_logger(name):
+    """ get cached process logger.
+        If another module re-configured logging (e.g. handlers removed, loggers disabled), restore it.
+
+    Args:
+        name    (str): process logger name (ERROR, WARNING, INFO, MSG)
+
+    Returns:
+        process logger (logging.Logger)
+
+    """
+    _logger = _LOGGERS.get(name)
+    if (_logger is None) or (_LOG_LISTENER is None):
+        configure_process_logging()
+        _logger = _LOGGERS[name]
+    elif _logger.disabled or (_LOG_QUEUE_HANDLER not in _logger.handlers):
+        ## re-configured by another module (e.g. dictConfig): re-attach without restarting the listener
+        _attach_process_logging()
+    return _logger
+
+def flush_process_logger():
+    """ block until every queued log record is written into console and files
+
+    Args: -
+
+    Returns: -
+
+    """
+    with _LOG_LOCK:
+        if _LOG_LISTENER is None:
+            return
+        ## QueueListener.stop() processes all the pending records before joining
+        _LOG_LISTENER.stop()
+        for handler in _LOG_HANDLERS:
+            handler.flush()
+        _LOG_LISTENER.start()
+
+def _reset_process_logging_after_fork():
+    """ listener thread does not survive fork. make child process re-configure logging at the next log call.
+        (the handlers belong to the parent process; they are dropped, not closed)
+
+    Args: -
+
+    Returns: -
+
+    """
+    global _LOG_LOCK, _LOG_LISTENER, _LOG_HANDLERS
+    _LOG_LOCK = threading.RLock()
+    _LOG_LISTENER = None
+    _LOG_HANDLERS = []
+    _LOGGERS.clear()
+
+def _register_child_flush(_):
+    """ multiprocessing child process exits with os._exit (atexit is not run): 
+        write the queued records by its finalizer instead
+
+    Args: -
+
+    Returns: -
+
+    """
+    multiprocessing.util.Finalize(None, _close_process_handlers, exitpriority=100)
+
+## flush-on-exit
+atexit.register(_close_process_handlers)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_process_logging_after_fork)
+## called in the child after multiprocessing cleared the finalizers inherited from the parent
+multiprocessing.util.register_after_fork(_register_child_flush, _register_child_flush)
+
+class LogPayload:
+    def __init__(self, payload, limit=None):
+        """ deferred log payload. {payload} is rendered only when the log record is emitted 
+            (logging calls str() after the level check), and summarized if it exceeds the byte limit.
+
+        Args:
+            payload (object, callable): object to be logged. callable is called at rendering time 
+            limit   (int): byte limit of rendered payload (None: LOG_PAYLOAD_BYTES_LIMIT)
+
+        Returns: -
+
+        """
+        self.payload = payload
+        self.limit = LOG_PAYLOAD_BYTES_LIMIT if limit is None else limit
+
+    def __str__(self):
+        """ render payload (size-capped)
+
+        Args: -
+
+        Returns:
+            rendered payload (str)
+
+        """
+        payload = self.payload() if callable(self.payload) else self.payload
+        return summarize_payload(payload, self.limit)
+
+def summarize_payload(payload, limit=None):
+    """ render payload as string. If it exceeds {limit} bytes, 
+        keep the head only and append total size and hash of the full rendering.
+
+    Args:
+        payload (object): object to be rendered
+        limit   (int): byte limit (None: LOG_PAYLOAD_BYTES_LIMIT, 0: unlimited)
+
+    Returns:
+        summary (str): rendered payload
+
+    """
+    limit = LOG_PAYLOAD_BYTES_LIMIT if limit is None else limit
+    text = payload if isinstance(payload, str) else str(payload)
+    if (limit <= 0) or (len(text) <= limit // 4):
+        return text
+    encoded = text.encode('utf-8', errors='replace')
+    if len(encoded) <= limit:
+        return text
+    digest = hashlib.sha1(encoded).hexdigest()[:12]
+    head = encoded[:limit].decode('utf-8', errors='ignore')
+    return f"{head} ... << truncated: {len(encoded)} bytes / sha1: {digest} >>"
+
+def _make_log_args(msg, args):
+    """ convert message and %-style args into deferred payloads 
+
+    Args:
+        msg     (str, callable): logging message (callable is called at rendering time)
+        args    (tuple): %-style args for the message
+
+    Returns:
+        msg     (str, LogPayload)
+        args    (tuple): LogPayload tuple
+
+    """
+    if callable(msg):
+        msg = LogPayload(msg)
+    return msg, tuple(LogPayload(arg) for arg in args)
+
 def log_decorator(func):
     """ log function decorator for finding original caller 
 
@@ -40,16 +302,17 @@ def log_decorator(func):
         wrapper (function): wrapped function 
     
     """
-    def wrapper(*args, **kwargs):
-        caller_frame = inspect.stack()[1]
-        caller_file = os.path.basename(caller_frame.filename)
-        caller_line = caller_frame.lineno
-        ## TODO insert class name? 
-        caller_func = caller_frame.function
+    def wrapper(self, msg, *args):
         ## Call the original function 
-        logger_method, msg = func(*args, **kwargs)
-        logger_method(msg = f'{caller_file}({caller_line})|{caller_func}()] {msg}')
+        logger_method, msg = func(self, msg)
+        ## message & args are rendered by logging only when the record passes the level check
+        msg, args = _make_log_args(msg, args)
+        ## caller file / line / function are resolved by logging (frame walk without reading source) \
+        ## only when the record passes the level check. stacklevel=2: the caller of wrapper
+        logger_method(msg, *args, stacklevel = CALLER_STACK_LEVEL)
         if logger_method.__name__ == "error":
+            ## flush-on-error: make sure error message is written before raising
+            flush_process_logger()
             raise
     return wrapper
 
@@ -63,22 +326,22 @@ def custom_log_decorator(func):
         wrapper (function): wrapped function 
     
     """
-    def wrapper(*args, **kwargs):
-        caller_frame = inspect.stack()[1]
-        caller_file = os.path.basename(caller_frame.filename)
-        caller_line = caller_frame.lineno
-        caller_func = caller_frame.function
+    def wrapper(self, msg, *args):
         ## Call the original function 
-        logger_method, msg, level = func(*args, **kwargs)
+        logger_method, msg, level = func(self, msg)
+        msg, args = _make_log_args(msg, args)
         ## integer logger level 
-        logger_method(msg = f'{caller_file}({caller_line})|{caller_func}()] {msg}', level = level)
+        logger_method(level, msg, *args, stacklevel = CALLER_STACK_LEVEL)
         if logger_method.__name__ == "error":
+            flush_process_logger()
             raise
     return wrapper
 
 class ProcessLogger: 
     def __init__(self, project_home: str):
-        """ initialize process logger config
+        """ initialize process logger config.
+            Handlers are configured once per process (not every logging call),
+            and log records are written by background thread through the queue.
 
         Args:           
             project_home    (str): ALO main path 
@@ -86,9 +349,6 @@ class ProcessLogger:
         Returns: -
         
         """
-        ## ALO MSG (message) level
-        MSG_LOG_LEVEL = 11
-        logging.addLevelName(MSG_LOG_LEVEL, 'MSG')
         self.project_home = project_home
         self.service = 'ALO'
         ## create log path 
@@ -96,46 +356,25 @@ class ProcessLogger:
             os.makedirs(TRAIN_LOG_PATH)
         if not os.path.exists(INFERENCE_LOG_PATH):
             os.makedirs(INFERENCE_LOG_PATH)
-        self.process_logging_config = { 
-            "version": 1,
-            "formatters": {
-                "proc_console": {
-                    "()": ColoredFormatter,
-                    "format": f"[%(asctime)s|{self.service}|%(levelname)s|%(message)s"
-                },
-                "proc_file": {
-                    "format": f"[%(asctime)s|{self.service}|%(levelname)s|%(message)s"
-                },
-            },
-            "handlers": {
-                "console": {
-                    "class": "logging.StreamHandler",
-                    "formatter": "proc_console",
-                    "level": "MSG",  
-                },
-                "file_train": {
-                    "class": "logging.FileHandler",
-                    "filename": TRAIN_LOG_PATH + "process.log", 
-                    "formatter": "proc_file",
-                    "level": "MSG",
-                },
-                "file_inference": {
-                    "class": "logging.FileHandler",
-                    "filename": INFERENCE_LOG_PATH + "process.log", 
-                    "formatter": "proc_file",
-                    "level": "MSG",
-                },
-            },
-            "root": {"handlers": ["console", "file_train", "file_inference"], "level": "MSG"},
-            "loggers": {"ERROR": {"level": "ERROR"}, "WARNING": {"level": "WARNING"}, "INFO": {"level": "INFO"}, "MSG": {"level": MSG_LOG_LEVEL}}
-        }
+        configure_process_logging(self.service)
+
+    def flush(self):
+        """ write all the queued log records
+
+        Args: -
+
+        Returns: -
+
+        """
+        flush_process_logger()
     
     @custom_log_decorator
     def process_message(self, msg: str):
         """ custom logging API used for ALO process logging  - level MSG_LOG_LEVEL(11)
 
         Args:           
-            msg (str): logging message
+            msg     (str, callable): logging message (callable is called only when the message is emitted)
+            *args   (object): %-style args of the message, rendered lazily and size-capped
             
         Returns: 
             logger.log
@@ -143,8 +382,7 @@ class ProcessLogger:
             logger.level
         
         """
-        logging.config.dictConfig(self.process_logging_config)
-        message_logger = logging.getLogger("MSG") 
+        message_logger = get_process_logger("MSG")
         level = message_logger.level
         return message_logger.log, msg, level
     
@@ -153,15 +391,15 @@ class ProcessLogger:
         """ info logging API used for ALO process logging
 
         Args:           
-            msg (str): logging message
+            msg     (str, callable): logging message (callable is called only when the message is emitted)
+            *args   (object): %-style args of the message, rendered lazily and size-capped
             
         Returns: 
             logger.info
             message (str)
         
         """
-        logging.config.dictConfig(self.process_logging_config)
-        info_logger = logging.getLogger("INFO") 
+        info_logger = get_process_logger("INFO")
         return info_logger.info, msg
     
     @log_decorator
@@ -169,15 +407,15 @@ class ProcessLogger:
         """ warning logging API used for ALO process logging
 
         Args:           
-            msg (str): logging message
+            msg     (str, callable): logging message (callable is called only when the message is emitted)
+            *args   (object): %-style args of the message, rendered lazily and size-capped
             
         Returns: 
             logger.warning
             message (str)
         
         """
-        logging.config.dictConfig(self.process_logging_config)
-        warning_logger = logging.getLogger("WARNING") 
+        warning_logger = get_process_logger("WARNING")
         return warning_logger.warning, msg
     
     @log_decorator
@@ -185,13 +423,182 @@ class ProcessLogger:
         """ error logging API used for ALO process logging
             it raises error 
         Args:           
-            msg (str): logging message
+            msg     (str, callable): logging message (callable is called only when the message is emitted)
+            *args   (object): %-style args of the message, rendered lazily and size-capped
             
         Returns: 
             logger.error
             message (str)
         
         """
-        logging.config.dictConfig(self.process_logging_config)
-        error_logger = logging.getLogger("ERROR")
-        return error_logger.error, msg
\ No newline at end of file
+        error_logger = get_process_logger("ERROR")
+        return error_logger.error, msg
+
+class ShowEventChannel:
+    def __init__(self, maxlen=SHOW_EVENT_BUFFER_SIZE):
+        """ structured channel of SHOW events (summary table of the pipeline run).
+            Events are kept in an in-memory ring buffer and appended into NDJSON sidecar file 
+            ({pipeline}_artifacts/log/show_events.ndjson) which is exported with the artifacts.
+
+        Args:
+            maxlen  (int): ring buffer size
+
+        Returns: -
+
+        """
+        self.lock = threading.Lock()
+        self.buffer = deque(maxlen=maxlen)
+        self.pipeline_type = None
+        self.sidecar = None
+
+    def begin(self, pipeline_type):
+        """ start collecting SHOW events of new pipeline run 
+
+        Args:
+            pipeline_type   (str): pipeline type (train_pipeline, inference_pipeline)
+
+        Returns: -
+
+        """
+        log_path = TRAIN_LOG_PATH if pipeline_type == 'train_pipeline' else INFERENCE_LOG_PATH
+        with self.lock:
+            self._close_sidecar()
+            self.buffer.clear()
+            self.pipeline_type = pipeline_type
+            os.makedirs(log_path, exist_ok=True)
+            self.sidecar = open(log_path + SHOW_EVENT_FILE, 'a', encoding='utf-8')
+
+    def record(self, service, message, created=None, line=None):
+        """ write SHOW event 
+
+        Args:
+            service (str): event service (ALO, USER)
+            message (str): SHOW message
+            created (float): event epoch time (None: now)
+            line    (str): SHOW line as written in pipeline.log (row of the summary table; None: message)
+
+        Returns: -
+
+        """
+        created = time.time() if created is None else created
+        event = {'time': created, 'service': service, 'pipeline': self.pipeline_type, 'message': message, \
+                'line': message if line is None else line}
+        with self.lock:
+            self.buffer.append(event)
+            if self.sidecar is not None:
+                try:
+                    self.sidecar.write(json.dumps(event, default=str) + '\n')
+                    self.sidecar.flush()
+                except (OSError, ValueError):
+                    ## sidecar removed or closed (e.g. log directory refreshed)
+                    self.sidecar = None
+
+    def events(self):
+        """ get SHOW events of current run 
+
+        Args: -
+
+        Returns:
+            events  (list): SHOW event dicts (time, service, pipeline, message)
+
+        """
+        with self.lock:
+            return list(self.buffer)
+
+    def extend(self, events):
+        """ write SHOW events collected in another process (e.g. forked step worker)
+
+        Args:
+            events  (list): SHOW event dicts (time, service, pipeline, message, line)
+
+        Returns: -
+
+        """
+        for event in events:
+            self.record(event['service'], event['message'], event['time'], event.get('line'))
+
+    def detach(self):
+        """ collect only the events of this (forked) process: the buffer inherited from the parent process is cleared 
+            and the sidecar is left to the parent process, which writes the events sent by this process (extend)
+
+        Args: -
+
+        Returns: -
+
+        """
+        with self.lock:
+            self.buffer.clear()
+            self._close_sidecar()
+
+    def close(self):
+        """ close sidecar file 
+
+        Args: -
+
+        Returns: -
+
+        """
+        with self.lock:
+            self._close_sidecar()
+
+    def _close_sidecar(self):
+        if self.sidecar is not None:
+            try:
+                self.sidecar.close()
+            except OSError:
+                pass
+            self.sidecar = None
+
+def _format_show_line(record):
+    """ SHOW line as written in pipeline.log: formatted by the pipeline.log handler of the emitting logger (alolib)
+
+    Args:
+        record  (logging.LogRecord): log record
+
+    Returns:
+        line    (str, None): None if no pipeline.log handler on the logger hierarchy (or failed to format)
+
+    """
+    _logger = logging.getLogger(record.name)
+    while _logger is not None:
+        for handler in _logger.handlers:
+            if isinstance(handler, logging.FileHandler) and handler.baseFilename.endswith(PIPELINE_LOG_FILE):
+                try:
+                    return handler.format(record).split('\n')[0]
+                except Exception:
+                    return None
+        _logger = _logger.parent if _logger.propagate else None
+    return None
+
+def _show_record_factory(*args, **kwargs):
+    """ log record factory routing SHOW level records into the SHOW event channel when they are created. 
+        Unlike a handler, it is not removed by the logging re-configuration of alolib (dictConfig), 
+        and sees the records of non-propagating loggers too.
+
+    Args:
+        *args, **kwargs: arguments of the previous log record factory
+
+    Returns:
+        record  (logging.LogRecord): log record
+
+    """
+    record = _BASE_RECORD_FACTORY(*args, **kwargs)
+    if record.levelname == SHOW_LEVEL_NAME:
+        try:
+            message = record.getMessage()
+            service = 'USER' if ('USER' in record.name.upper()) or ('|USER|' in message) else 'ALO'
+            SHOW_EVENTS.record(service, message, record.created, _format_show_line(record))
+        except Exception:
+            ## never break the logging call of the asset
+            pass
+    return record
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+## SHOW events written by ALO & alolib (SHOW_EVENTS.record() or log record with SHOW level)
+SHOW_EVENTS = ShowEventChannel()
+atexit.register(SHOW_EVENTS.close)
+_BASE_RECORD_FACTORY = logging.getLogRecordFactory()
+logging.setLogRecordFactory(_show_record_factory)
+#--------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,172 @@
+import sys
+import tracemalloc
+import types
+from collections import defaultdict
+from contextlib import contextmanager
+from src.constants import *
+
+def deep_sizeof(obj, seen=None):
+    """ approximate deep size of the object (bytes).
+        pandas objects use memory_usage(deep=True), buffers (e.g. numpy array) use nbytes.
+
+    Args:
+        obj     (object): object to measure
+        seen    (set): ids of already measured objects
+
+    Returns:
+        size    (int)
+
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    ## pandas DataFrame / Series
+    if hasattr(obj, 'memory_usage') and callable(obj.memory_usage):
+        try:
+            usage = obj.memory_usage(deep=True)
+            return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+        except Exception:
+            pass
+    ## numpy array etc.
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return max(nbytes, sys.getsizeof(obj))
+    size = sys.getsizeof(obj)
+    ## do not follow shared objects (modules, classes, functions)
+    if isinstance(obj, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+class MemoryTracer:
+    def __init__(self):
+        """ tracemalloc-based memory attribution of asset steps.
+            Keeps the net memory growth of each step across runs of the process (loop mode requests),
+            to flag the steps which retain more memory at every run.
+
+        Args: -
+
+        Returns: -
+
+        """
+        ## (pipeline, step) - net growth of the traced memory (bytes) during the step, per run
+        self.history = defaultdict(list)
+        ## tracemalloc is started by this tracer (not by the user)
+        self.owner = False
+
+    def _take_snapshot(self):
+        """ snapshot without the allocations of tracemalloc / importlib itself
+
+        Args: -
+
+        Returns:
+            snapshot    (tracemalloc.Snapshot)
+
+        """
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>")))
+
+    def _measure(self, asset_structure):
+        """ deep size of the data / config of the asset structure.
+            Measurement failures (e.g. user objects raising in memory_usage) must not hide the error of the asset.
+
+        Args:
+            asset_structure (object): AssetStructure whose data / config are measured
+
+        Returns:
+            data_bytes      (int, None): None if failed to measure
+            config_bytes    (int, None): None if failed to measure
+
+        """
+        try:
+            return deep_sizeof(asset_structure.data), deep_sizeof(asset_structure.config)
+        except Exception:
+            return None, None
+
+    @contextmanager
+    def trace(self, pipeline_type, step_name, asset_structure, report):
+        """ trace memory allocated during the code block (asset step)
+
+        Args:
+            pipeline_type   (str): pipeline type
+            step_name       (str): asset step name
+            asset_structure (object): AssetStructure whose data / config are measured
+            report          (dict): step name - memory record (filled at the end of the step)
+
+        Returns: -
+
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owner = True
+        data_before, config_before = self._measure(asset_structure)
+        snapshot_before = self._take_snapshot()
+        traced_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            snapshot_after = self._take_snapshot()
+            data_after, config_after = self._measure(asset_structure)
+            top_stats = snapshot_after.compare_to(snapshot_before, 'lineno')[:MEMORY_TOP_STATS]
+            ## growth of this step only (the process-wide traced memory also counts the other steps / requests)
+            net_growth = traced_after - traced_before
+            history = self.history[(pipeline_type, step_name)]
+            history.append(net_growth)
+            report[step_name] = {
+                'net_growth_bytes': net_growth,
+                'peak_bytes': traced_peak,
+                'data_bytes': data_after,
+                'data_growth_bytes': None if None in (data_before, data_after) else data_after - data_before,
+                'config_bytes': config_after,
+                'config_growth_bytes': None if None in (config_before, config_after) else config_after - config_before,
+                'top_allocations': [{'site': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", \
+                                    'size_diff_bytes': stat.size_diff, 'count_diff': stat.count_diff} \
+                                    for stat in top_stats if stat.size_diff != 0],
+                'runs': len(history),
+                'leak_suspected': self.is_leaking(history)}
+
+    def is_leaking(self, history):
+        """ the step retained memory (positive net growth) in each of the last {MEMORY_LEAK_RUNS} runs,
+            more than {MEMORY_LEAK_THRESHOLD} bytes in total
+
+        Args:
+            history     (list): net growth of the traced memory during the step, per run
+
+        Returns:
+            bool
+
+        """
+        if len(history) < MEMORY_LEAK_RUNS:
+            return False
+        recent = history[-MEMORY_LEAK_RUNS:]
+        return all(growth > 0 for growth in recent) and (sum(recent) > MEMORY_LEAK_THRESHOLD)
+
+    def stop(self):
+        """ stop tracemalloc if started by this tracer (history is kept)
+
+        Args: -
+
+        Returns: -
+
+        """
+        if self.owner and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.owner = False
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+MEMORY_TRACER = MemoryTracer()
+#--------------------------------------------------------------------------------------------------------------------------
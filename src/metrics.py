@@ -0,0 +1,239 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+from src.constants import *
+
+class MetricsRegistry:
+    def __init__(self):
+        """ in-process metrics registry (counters and fixed-bucket histograms)
+            rendered in the Prometheus text exposition format.
+
+        Args: -
+
+        Returns: -
+
+        """
+        self.lock = threading.Lock()
+        ## metric name - {type, help, labelnames, buckets, values}
+        self.metrics = {}
+
+    def _register(self, name, metric_type, help_msg, labelnames, buckets=None):
+        """ register metric (idempotent)
+
+        Args:
+            name        (str): metric name
+            metric_type (str): counter / histogram
+            help_msg    (str): HELP line of the metric
+            labelnames  (tuple): label names
+            buckets     (tuple): upper bounds of the histogram buckets (sorted)
+
+        Returns: -
+
+        """
+        with self.lock:
+            if name not in self.metrics:
+                self.metrics[name] = {'type': metric_type, 'help': help_msg, 'labelnames': tuple(labelnames), \
+                                    'buckets': tuple(buckets) if buckets is not None else None, 'values': {}}
+
+    def counter(self, name, help_msg, labelnames=()):
+        """ register counter
+
+        Args:
+            name        (str): metric name
+            help_msg    (str): HELP line of the metric
+            labelnames  (tuple): label names
+
+        Returns: -
+
+        """
+        self._register(name, 'counter', help_msg, labelnames)
+
+    def histogram(self, name, help_msg, labelnames=(), buckets=METRICS_LATENCY_BUCKETS):
+        """ register fixed-bucket histogram
+
+        Args:
+            name        (str): metric name
+            help_msg    (str): HELP line of the metric
+            labelnames  (tuple): label names
+            buckets     (tuple): upper bounds of the buckets
+
+        Returns: -
+
+        """
+        self._register(name, 'histogram', help_msg, labelnames, sorted(buckets))
+
+    def _label_values(self, metric, labels):
+        """ label values of the metric in the order of the label names
+
+        Args:
+            metric  (dict): registered metric
+            labels  (dict): label name - value
+
+        Returns:
+            values  (tuple)
+
+        """
+        return tuple(str(labels.get(k, '')) for k in metric['labelnames'])
+
+    def inc(self, name, value=1, **labels):
+        """ increase counter
+
+        Args:
+            name    (str): counter name
+            value   (float): increment
+            **labels(dict): label values
+
+        Returns: -
+
+        """
+        metric = self.metrics[name]
+        key = self._label_values(metric, labels)
+        with self.lock:
+            metric['values'][key] = metric['values'].get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """ observe a value into the histogram
+
+        Args:
+            name    (str): histogram name
+            value   (float): observed value (e.g. seconds)
+            **labels(dict): label values
+
+        Returns: -
+
+        """
+        metric = self.metrics[name]
+        key = self._label_values(metric, labels)
+        ## first bucket whose upper bound >= value (last one: +Inf)
+        index = bisect_left(metric['buckets'], value)
+        with self.lock:
+            if key not in metric['values']:
+                ## [non-cumulative bucket counts (+Inf included), sum, count]
+                metric['values'][key] = [[0] * (len(metric['buckets']) + 1), 0.0, 0]
+            state = metric['values'][key]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, name, **labels):
+        """ observe the elapsed time (sec) of the code block into the histogram
+
+        Args:
+            name    (str): histogram name
+            **labels(dict): label values
+
+        Returns: -
+
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start, **labels)
+
+    def render(self):
+        """ render metrics in the Prometheus text exposition format (version 0.0.4)
+
+        Args: -
+
+        Returns:
+            text    (str)
+
+        """
+        def _format_labels(labelnames, values, extra=()):
+            pairs = list(zip(labelnames, values)) + list(extra)
+            if len(pairs) == 0:
+                return ''
+            escaped = [(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in pairs]
+            return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+        lines = []
+        with self.lock:
+            for name, metric in self.metrics.items():
+                lines.append(f"# HELP {name} {metric['help']}")
+                lines.append(f"# TYPE {name} {metric['type']}")
+                for key, value in sorted(metric['values'].items()):
+                    if metric['type'] == 'counter':
+                        lines.append(f"{name}{_format_labels(metric['labelnames'], key)} {value}")
+                        continue
+                    counts, total, count = value
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(metric['buckets']) + ['+Inf'], counts):
+                        cumulative += bucket_count
+                        lines.append(f"{name}_bucket{_format_labels(metric['labelnames'], key, [('le', str(bound))])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(metric['labelnames'], key)} {total}")
+                    lines.append(f"{name}_count{_format_labels(metric['labelnames'], key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+class MetricsServer:
+    def __init__(self, registry, port, host=METRICS_HOST):
+        """ tiny HTTP exposition endpoint (GET /metrics) served by a daemon thread
+
+        Args:
+            registry    (MetricsRegistry): registry to expose
+            port        (int): listen port
+            host        (str): listen host
+
+        Returns: -
+
+        """
+        self.registry = registry
+        self.port = port
+        self.host = host
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        """ start serving
+
+        Args: -
+
+        Returns: -
+
+        """
+        registry = self.registry
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ['/', '/metrics']:
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            ## do not write access logs into stderr
+            def log_message(self, format, *args):
+                pass
+        self.server = ThreadingHTTPServer((self.host, self.port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name='alo-metrics-server', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """ stop serving
+
+        Args: -
+
+        Returns: -
+
+        """
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+METRICS = MetricsRegistry()
+METRICS.counter('alo_requests_total', 'Number of executed pipelines', ('pipeline', 'status'))
+METRICS.counter('alo_errors_total', 'Number of alo_fail errors by redis error code', ('code',))
+METRICS.histogram('alo_stage_duration_seconds', 'Duration of the pipeline stages (setup, load, run, save, total)', ('pipeline', 'stage'))
+METRICS.histogram('alo_queue_wait_seconds', 'Waiting time for the next request (request_inference) in loop mode')
+METRICS.counter('alo_model_cache_events_total', 'Hits, misses and evictions of the model cache (asset_structure.model_cache)', ('event',))
+METRICS.histogram('alo_artifact_save_seconds', 'Duration of saving artifacts (including external save)', ('pipeline',))
+#--------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import re
+import threading
+from src.constants import *
+from src.tracer import TRACER
+
+class GitMirror:
+    def __init__(self, mirror_home=GIT_MIRROR_HOME):
+        """ persistent bare-mirror cache of the asset git repositories ({mirror_home}/{url hash}.git).
+            Only the heads of the requested refs are fetched (depth 1) into the mirror,
+            and the assets are shallow, single-branch clones of the mirror (local, no network).
+            A (url, ref) is fetched from the remote once per run (until reset), so that the steps sharing the same repo
+            (e.g. input step of train and inference pipeline) fetch once.
+
+        Args:
+            mirror_home (str): mirror cache directory
+
+        Returns: -
+
+        """
+        self.mirror_home = mirror_home
+        self.lock = threading.Lock()
+        ## mirror path - lock (concurrent asset fetches of the same repo)
+        self.mirror_locks = {}
+        ## (url, ref) fetched in this run (cleared by reset)
+        self.fetched = set()
+
+    def reset(self):
+        """ forget the refs fetched so far, so that the next fetch of a ref gets the new head from the remote 
+            (called at the start of each run)
+
+        Args: -
+
+        Returns: -
+
+        """
+        with self.lock:
+            self.fetched.clear()
+
+    def get_mirror_path(self, url):
+        """ mirror path of the repository url
+
+        Args:
+            url     (str): git url
+
+        Returns:
+            path    (str)
+
+        """
+        return os.path.join(self.mirror_home, hashlib.md5(url.encode()).hexdigest() + '.git')
+
+    def _get_mirror_lock(self, mirror_path):
+        """ lock of the mirror
+
+        Args:
+            mirror_path (str): mirror path
+
+        Returns:
+            lock        (threading.Lock)
+
+        """
+        with self.lock:
+            return self.mirror_locks.setdefault(mirror_path, threading.Lock())
+
+    def fetch(self, url, ref):
+        """ fetch the head of the ref (branch or tag) from the remote into the mirror (as refs/heads/{ref})
+
+        Args:
+            url     (str): git url
+            ref     (str): branch or tag
+
+        Returns:
+            mirror_path (str)
+
+        """
+        ## lazy import: git is only needed for git url assets
+        import git
+        mirror_path = self.get_mirror_path(url)
+        with self._get_mirror_lock(mirror_path):
+            if (url, ref) in self.fetched:
+                return mirror_path
+            if not os.path.isdir(mirror_path):
+                os.makedirs(self.mirror_home, exist_ok=True)
+                git.Repo.init(mirror_path, bare=True)
+            mirror_repo = git.Repo(mirror_path)
+            with TRACER.span(f"git fetch {ref}", 'git', url=url, mirror=mirror_path):
+                mirror_repo.git.fetch('--depth', '1', '--no-tags', url, ref)
+                ## annotated tag: the commit of the tag
+                mirror_repo.git.update_ref(f'refs/heads/{ref}', 'FETCH_HEAD^{commit}')
+            self.fetched.add((url, ref))
+        return mirror_path
+
+    def get_remote_commit(self, url, ref):
+        """ commit of the ref (branch or tag) at the remote (git ls-remote; nothing is fetched). 
+            A full commit hash is returned as it is (immutable).
+
+        Args:
+            url     (str): git url
+            ref     (str): branch, tag or commit hash
+
+        Returns:
+            commit  (str): None if the ref is not found
+
+        """
+        if re.fullmatch(r'[0-9a-f]{40}', ref):
+            return ref
+        import git
+        with TRACER.span(f"git ls-remote {ref}", 'git', url=url):
+            ## refs/tags/{ref}* to include the peeled tag
+            output = git.cmd.Git().ls_remote(url, f'refs/heads/{ref}', f'refs/tags/{ref}*')
+        refs = dict(reversed(line.split('\t')) for line in output.splitlines() if '\t' in line)
+        ## annotated tag: peeled ({tag}^{}) is the commit of the tag
+        for name in [f'refs/heads/{ref}', f'refs/tags/{ref}^{{}}', f'refs/tags/{ref}']:
+            if name in refs:
+                return refs[name]
+        return None
+
+    def clone(self, url, ref, path):
+        """ shallow, single-branch clone of the ref into {path} from the mirror (the mirror is fetched first).
+            The origin of the clone is set to {url}.
+
+        Args:
+            url     (str): git url
+            ref     (str): branch or tag
+            path    (str): clone path
+
+        Returns:
+            repo    (git.Repo)
+
+        """
+        import git
+        mirror_path = self.fetch(url, ref)
+        with TRACER.span(f"git clone {os.path.basename(path)}", 'git', url=url, branch=ref, mirror=mirror_path):
+            ## file:// is needed for --depth of the local repository
+            repo = git.Repo.clone_from('file://' + mirror_path, path, depth=1, single_branch=True, branch=ref)
+        repo.git.remote('set-url', 'origin', url)
+        return repo
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+GIT_MIRROR = GitMirror()
+#--------------------------------------------------------------------------------------------------------------------------
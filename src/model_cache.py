@@ -0,0 +1,199 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from src.constants import *
+from src.metrics import METRICS
+
+class ModelCache:
+    def __init__(self, max_bytes=MODEL_CACHE_SIZE * 1024 * 1024):
+        """ process-level cache of the model objects loaded by the assets (e.g. across loop mode requests).
+            Exposed to the assets as asset_structure.model_cache.
+            Entries are keyed by model path and content checksum (a changed model file is a new entry, 
+            which replaces the entries of the previous contents), and evicted in LRU order when the total size exceeds {max_bytes}.
+
+        Args:
+            max_bytes   (int): max total size (bytes) of the cached models (0: disabled)
+
+        Returns: -
+
+        """
+        self.max_bytes = max_bytes
+        self.lock = threading.RLock()
+        ## (model path, checksum) - [model object, size (bytes)]
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        ## model path - (stat signature, checksum): the content is hashed again only if the files changed
+        self.checksums = {}
+        ## models path - external model path loaded into it (load_model_path)
+        self.model_sources = {}
+
+    def _get_signature(self, model_path):
+        """ stat signature of the model file or directory (relative path, size, mtime of the files)
+
+        Args:
+            model_path  (str): model file or directory path
+
+        Returns:
+            signature   (tuple)
+
+        """
+        if os.path.isfile(model_path):
+            stat = os.stat(model_path)
+            return (('', stat.st_size, stat.st_mtime_ns),)
+        signature = []
+        for root, dirs, files in os.walk(model_path):
+            dirs.sort()
+            for file in sorted(files):
+                file_path = os.path.join(root, file)
+                stat = os.stat(file_path)
+                signature.append((os.path.relpath(file_path, model_path), stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def get_checksum(self, model_path):
+        """ md5 checksum of the content of the model file or directory
+
+        Args:
+            model_path  (str): model file or directory path
+
+        Returns:
+            checksum    (str)
+
+        """
+        model_path = os.path.abspath(model_path)
+        signature = self._get_signature(model_path)
+        with self.lock:
+            if (model_path in self.checksums) and (self.checksums[model_path][0] == signature):
+                return self.checksums[model_path][1]
+        checksum = hashlib.md5()
+        for rel_path, _, _ in signature:
+            checksum.update(rel_path.encode())
+            with open(os.path.join(model_path, rel_path) if rel_path else model_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    checksum.update(chunk)
+        checksum = checksum.hexdigest()
+        with self.lock:
+            self.checksums[model_path] = (signature, checksum)
+        return checksum
+
+    def get(self, model_path, loader, size=None):
+        """ cached model of the path, or the model loaded by {loader} (then cached)
+
+        Args:
+            model_path  (str): model file or directory path
+            loader      (function): loader(model_path) -> model object
+            size        (int): size (bytes) of the model (None: size of the model files; \
+                               deep size of python objects is too slow to measure for large models)
+
+        Returns:
+            model       (object)
+
+        """
+        model_path = os.path.abspath(model_path)
+        key = (model_path, self.get_checksum(model_path))
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                METRICS.inc('alo_model_cache_events_total', event='hit')
+                return self.entries[key][0]
+        METRICS.inc('alo_model_cache_events_total', event='miss')
+        model = loader(model_path)
+        if size is None:
+            size = sum(file_size for _, file_size, _ in self.checksums[model_path][0])
+        ## larger than the cache: not cached
+        if size > self.max_bytes:
+            return model
+        with self.lock:
+            ## previous contents of the same path can not be loaded anymore
+            self._remove([cached_key for cached_key in self.entries if (cached_key[0] == model_path) and (cached_key != key)])
+            if key not in self.entries:
+                self.entries[key] = [model, size]
+                self.total_bytes += size
+            self._evict()
+        return model
+
+    def _remove(self, keys):
+        """ remove the entries
+
+        Args:
+            keys    (list): (model path, checksum) keys of the entries
+
+        Returns: -
+
+        """
+        with self.lock:
+            for key in keys:
+                _, size = self.entries.pop(key)
+                self.total_bytes -= size
+
+    def _evict(self):
+        """ evict the least recently used models until the total size fits in {max_bytes}
+
+        Args: -
+
+        Returns: -
+
+        """
+        with self.lock:
+            while self.entries and (self.total_bytes > self.max_bytes):
+                _, (_, size) = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                METRICS.inc('alo_model_cache_events_total', event='eviction')
+
+    def set_max_bytes(self, max_bytes):
+        """ change the max total size (experimental_plan.yaml - model_cache_size)
+
+        Args:
+            max_bytes   (int): max total size (bytes) of the cached models (0: disabled)
+
+        Returns: -
+
+        """
+        with self.lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def invalidate(self, path_prefix=None):
+        """ remove the cached models under the path
+
+        Args:
+            path_prefix (str): models path (None: all)
+
+        Returns:
+            num_removed (int)
+
+        """
+        with self.lock:
+            if path_prefix is None:
+                removed = list(self.entries)
+            else:
+                path_prefix = os.path.abspath(path_prefix)
+                removed = [key for key in self.entries if os.path.commonpath([key[0], path_prefix]) == path_prefix]
+            self._remove(removed)
+        return len(removed)
+
+    def set_model_source(self, models_path, source):
+        """ record the external model (load_model_path, i.e. model_uri of the solution metadata) loaded into the models path.
+            The models cached under the path are invalidated if the source is different from the previous one.
+
+        Args:
+            models_path (str): models path (e.g. train_artifacts/models/)
+            source      (str): external model path
+
+        Returns:
+            num_removed (int)
+
+        """
+        models_path = os.path.abspath(models_path)
+        with self.lock:
+            previous = self.model_sources.get(models_path)
+            self.model_sources[models_path] = source
+            if previous == source:
+                return 0
+            return self.invalidate(models_path)
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+MODEL_CACHE = ModelCache()
+#--------------------------------------------------------------------------------------------------------------------------
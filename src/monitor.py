@@ -0,0 +1,212 @@
+import psutil
+import sys
+import threading
+import time
+from array import array
+try:
+    import resource
+except ImportError:
+    ## not supported on windows
+    resource = None
+from src.constants import *
+
+class ResourceSampler:
+    def __init__(self, interval=RESOURCE_INTERVAL):
+        """ background sampler of the resource usage of the current process (e.g. during an asset step).
+            Samples are kept in typed arrays (one array per metric) instead of per-sample dicts,
+            so that long steps with short interval stay cheap in memory.
+
+        Args:
+            interval    (float): sampling interval (sec)
+
+        Returns: -
+
+        """
+        self.interval = interval
+        self.process = psutil.Process()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self._reset()
+
+    def __getstate__(self):
+        """ picklable state (sampled arrays), e.g. to send the sampler of a step worker process to the parent.
+            The process handle and the sampling thread are not transferred.
+
+        Args: -
+
+        Returns:
+            state   (dict)
+
+        """
+        state = self.__dict__.copy()
+        for key in ['process', 'stop_event', 'thread']:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        """ restore the state (of the process which unpickles)
+
+        Args:
+            state   (dict): picklable state
+
+        Returns: -
+
+        """
+        self.__dict__.update(state)
+        self.process = psutil.Process()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _reset(self):
+        """ reset sampled arrays
+
+        Args: -
+
+        Returns: -
+
+        """
+        ## elapsed time (sec), cpu (%), rss (bytes), io read / write (bytes), number of threads
+        self.elapsed = array('d')
+        self.cpu = array('d')
+        self.rss = array('Q')
+        self.read_bytes = array('Q')
+        self.write_bytes = array('Q')
+        self.num_threads = array('I')
+        self.start_time = time.perf_counter()
+        self.end_time = self.start_time
+        self.start_maxrss = self._get_maxrss()
+        self.end_maxrss = self.start_maxrss
+
+    def _get_maxrss(self):
+        """ high-water mark of the process rss (bytes). 0 if not supported
+
+        Args: -
+
+        Returns:
+            maxrss  (int)
+
+        """
+        if resource is None:
+            return 0
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        ## linux: KB, macOS: bytes
+        return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+    def _sample(self):
+        """ append a sample of the current process into arrays
+
+        Args: -
+
+        Returns: -
+
+        """
+        with self.process.oneshot():
+            cpu = self.process.cpu_percent(None)
+            rss = self.process.memory_info().rss
+            num_threads = self.process.num_threads()
+            try:
+                io = self.process.io_counters()
+                read_bytes, write_bytes = io.read_bytes, io.write_bytes
+            ## io counters not supported (e.g. macOS) or permission denied
+            except (AttributeError, psutil.Error):
+                read_bytes, write_bytes = 0, 0
+        self.elapsed.append(time.perf_counter() - self.start_time)
+        self.cpu.append(cpu)
+        self.rss.append(rss)
+        self.read_bytes.append(read_bytes)
+        self.write_bytes.append(write_bytes)
+        self.num_threads.append(num_threads)
+
+    def _run(self):
+        """ sampling loop of the background thread
+
+        Args: -
+
+        Returns: -
+
+        """
+        while not self.stop_event.wait(self.interval):
+            try:
+                self._sample()
+            ## process info may be temporarily unavailable; skip the sample
+            except psutil.Error:
+                continue
+
+    def start(self):
+        """ start sampling in a daemon thread
+
+        Args: -
+
+        Returns: -
+
+        """
+        self._reset()
+        self.stop_event.clear()
+        ## cpu_percent(None) is relative to the previous call: \
+        ## the first sample only sets the reference point, so its cpu is recorded as 0
+        self.process.cpu_percent(None)
+        self._sample()
+        self.cpu[0] = 0.0
+        self.thread = threading.Thread(target=self._run, name='alo-resource-sampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """ stop sampling (a last sample is taken at the stop time)
+
+        Args: -
+
+        Returns: -
+
+        """
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join()
+        self.thread = None
+        self._sample()
+        self.end_time = time.perf_counter()
+        self.end_maxrss = self._get_maxrss()
+
+    def summary(self):
+        """ summary of the sampled resource usage
+
+        Args: -
+
+        Returns:
+            summary     (dict): duration, cpu, memory, io, threads
+
+        """
+        mb = 1024 * 1024
+        peak_rss = max(self.rss) if self.rss else 0
+        ## the process high-water mark is raised during the sampling: \
+        ## it is the exact peak, even between two samples
+        if self.end_maxrss > self.start_maxrss:
+            peak_rss = max(peak_rss, self.end_maxrss)
+        num_samples = len(self.elapsed)
+        return {'duration_sec': round(self.end_time - self.start_time, 3),
+                'num_samples': num_samples,
+                'cpu_percent_mean': round(sum(self.cpu) / num_samples, 2) if num_samples else 0,
+                'cpu_percent_max': round(max(self.cpu), 2) if num_samples else 0,
+                'rss_mb_start': round(self.rss[0] / mb, 2) if num_samples else 0,
+                'rss_mb_end': round(self.rss[-1] / mb, 2) if num_samples else 0,
+                'rss_mb_peak': round(peak_rss / mb, 2),
+                'io_read_mb': round((self.read_bytes[-1] - self.read_bytes[0]) / mb, 2) if num_samples else 0,
+                'io_write_mb': round((self.write_bytes[-1] - self.write_bytes[0]) / mb, 2) if num_samples else 0,
+                'num_threads_max': max(self.num_threads) if num_samples else 0}
+
+    def timeline(self):
+        """ sampled timeline (column-oriented; one list per metric)
+
+        Args: -
+
+        Returns:
+            timeline    (dict)
+
+        """
+        return {'interval': self.interval,
+                'elapsed_sec': [round(t, 3) for t in self.elapsed],
+                'cpu_percent': self.cpu.tolist(),
+                'rss_bytes': self.rss.tolist(),
+                'io_read_bytes': self.read_bytes.tolist(),
+                'io_write_bytes': self.write_bytes.tolist(),
+                'num_threads': self.num_threads.tolist()}
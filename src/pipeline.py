@@ -1,23 +1,33 @@
-import git
 import hashlib
 import importlib
 import json
+import multiprocessing
 import os
 import random
 import re
 import shutil
 import sys
-import yaml
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import datetime
+from multiprocessing.connection import wait as wait_connections
 from typing import Dict
 from src.artifacts import Aritifacts
 from src.constants import *
 from src.external import ExternalHandler
 from src.install import Packages
-from src.logger import ProcessLogger
-from src.utils import  _log_process
-from src.yaml import Metadata
+from src.logger import ProcessLogger, SHOW_EVENTS, flush_process_logger
+from src.memory import MEMORY_TRACER
+from src.metrics import METRICS
+from src.model_cache import MODEL_CACHE
+from src.mirror import GIT_MIRROR
+from src.monitor import ResourceSampler
+from src.profiler import StepProfiler
+from src.scheduler import StepScheduler, has_step_dependencies
+from src.tracer import TRACER
+from src.utils import  _compile_bytecode, _get_error_code, _log_process, _read_git_head
+from src.yaml import Metadata, _load_yaml
 
 #--------------------------------------------------------------------------------------------------------------------------
 #    GLOBAL VARIABLE
@@ -35,6 +45,8 @@ class AssetStructure:
             - self.data: input/output data to be used in the asset
             - self.config: Globally shared configuration values between assets 
                         (can be added by the asset constructor)
+            - self.model_cache: process-level cache of model objects (kept across loop mode requests)
+                        e.g. model = asset_structure.model_cache.get(model_path, loader)
                         
         Args: -           
             
@@ -46,6 +58,7 @@ class AssetStructure:
         ## FIXME unused 
         self.data = {}
         self.config = {}
+        self.model_cache = MODEL_CACHE
 
 class Pipeline:
     def __init__(self, experimental_plan: Dict, pipeline_type: str, system_envs: Dict):
@@ -69,10 +82,36 @@ class Pipeline:
         self.pipeline_type = pipeline_type
         self.system_envs = system_envs
         ## declare instances
-        self.install = Packages()
         self.external = ExternalHandler()
         self.asset_structure = AssetStructure()
         self.artifact = Aritifacts()
+        ## step name - ResourceSampler (check_resource: True)
+        self.resource_usage = {}
+        ## step name - memory record (trace_memory: True)
+        self.memory_usage = {}
+        ## git assets verified up to date with the remote at the setup (get_asset_source: every)
+        self.unchanged_assets = set()
+        ## StepScheduler while the steps run along << depends_on >> (None: sequential)
+        self.scheduler = None
+        ## step name - UserAsset class kept imported across requests (warm_context: True)
+        self.asset_classes = {}
+        ## reused for a new request (warm_context: True); setup only renews the artifacts
+        self.is_warm = False
+        self._set_experimental_plan(experimental_plan)
+        self.install = Packages(WHEELHOUSE_PATH if self.control['wheelhouse'] == True else None)
+        ## must exist in the initialization (init) to accommodate cases \
+        ## where only pipeline.run() is executed.
+        self._set_asset_structure()
+
+    def _set_experimental_plan(self, experimental_plan: Dict):
+        """ experimental plan info to class variables (name, version, user_parameters, asset_source, control, ..)
+        
+        Args: 
+            experimental_plan  (dict): experimental plan yaml info as dict 
+            
+        Returns: -
+
+        """
         def _get_yaml_data(key, pipeline_type = 'all'): 
             data_dict = {}
             if key == "name" or key == "version":
@@ -91,10 +130,26 @@ class Pipeline:
             return data_dict
         ## converts to class self variables
         for key, value in experimental_plan.items():
-            setattr(self, key, _get_yaml_data(key, pipeline_type))
-        ## must exist in the initialization (init) to accommodate cases \
-        ## where only pipeline.run() is executed.
+            setattr(self, key, _get_yaml_data(key, self.pipeline_type))
+
+    def reset(self, experimental_plan: Dict):
+        """ reuse the pipeline for a new request (warm_context: True in loop mode). 
+            The experimental plan (updated by the solution metadata of the request) is applied again 
+            and the per-request state (asset structure, resource / memory usage) is reset; 
+            the installed packages and the imported asset classes are kept.
+        
+        Args: 
+            experimental_plan  (dict): experimental plan yaml info as dict 
+            
+        Returns: -
+
+        """
+        self._set_experimental_plan(experimental_plan)
+        self.asset_structure = AssetStructure()
         self._set_asset_structure()
+        self.resource_usage = {}
+        self.memory_usage = {}
+        self.is_warm = True
 
     def setup(self): 
         """ setup pipeline
@@ -106,6 +161,11 @@ class Pipeline:
 
         """      
         _log_process(f"<< SETUP >> {self.pipeline_type} start", highlight=True)
+        ## warm context: assets and packages are set up at boot-on
+        if self.is_warm:
+            self._empty_artifacts(self.pipeline_type)
+            _log_process(f"<< SETUP >> {self.pipeline_type} finish (warm context)", highlight=True)
+            return
         ## package list setup - only remove current pipeline step{N}.txt
         self._empty_package_list(self.pipeline_type)
         ## empty artifact
@@ -113,6 +173,12 @@ class Pipeline:
         _, packs = self._setup_asset(self.asset_source[self.pipeline_type], self.control['get_asset_source'])
         if packs is not None: 
             self._create_package(packs)
+        ## boot-on: precompile assets, alolib and ALO source into checked-hash bytecode, \
+        ## since the asset modules are imported again at every request (see memory_release)
+        if self.system_envs['boot_on']:
+            with TRACER.span('compile bytecode', 'setup'):
+                compiled, up_to_date = _compile_bytecode([ASSET_HOME, ALO_LIB, SOURCE_HOME])
+            PROC_LOGGER.process_message(f"Precompiled bytecode: {compiled} files compiled, {up_to_date} files up to date")
         _log_process(f"<< SETUP >> {self.pipeline_type} finish", highlight=True)
 
     def load(self, data_path=[]):
@@ -130,7 +196,13 @@ class Pipeline:
             ## load external model
             if self.pipeline_type == 'inference_pipeline':
                 if (self.external_path['load_model_path'] != None) and (self.external_path['load_model_path'] != ""):
-                    self.external.external_load_model(self.external_path, self.external_path_permission)
+                    ## models/ of the train artifacts given to the assets (see concurrent_pipelines)
+                    models_path = self.system_envs['artifacts']['train_artifacts'] + 'models/'
+                    ## a different external model (model_uri of the solution metadata): cached models are stale
+                    num_removed = MODEL_CACHE.set_model_source(models_path, self.external_path['load_model_path'])
+                    if num_removed > 0:
+                        PROC_LOGGER.process_message(f"Invalidated {num_removed} cached models: << load_model_path >> changed to {self.external_path['load_model_path']}")
+                    self.external.external_load_model(self.external_path, self.external_path_permission, models_path)
                     ## Remove the {train_id} from the experiment history and record a special sentence
                     self.system_envs['inference_history']['train_id'] = "load-external-model"
             ## load external data
@@ -163,7 +235,9 @@ class Pipeline:
 
         """  
         _log_process(f"<< RUN >> {self.pipeline_type} start", highlight=True)
-        if steps == 'all':
+        if steps == 'all' and has_step_dependencies(self.asset_source[self.pipeline_type]):
+            self._run_step_graph()
+        elif steps == 'all':
             for step, asset_config in enumerate(self.asset_source[self.pipeline_type]):
                 _log_process(f"current step: {asset_config['step']}")
                 self.asset_structure.args[asset_config['step']] = self.get_parameter(asset_config['step'])
@@ -211,7 +285,7 @@ class Pipeline:
         checksum_dict = {}
         for i, asset_config in enumerate(self.asset_source[self.pipeline_type]):
             _path = ASSET_HOME + asset_config['step'] + "/"
-            checksum = self._code_checksum(_path)
+            checksum = self._get_asset_code_checksum(asset_config['step'], _path)
             checksum_dict[asset_config['step']] = checksum
             ## convert the checksum of each folder to a string and update {total_checksum}
             total_checksum.update(str(checksum).encode())
@@ -222,6 +296,12 @@ class Pipeline:
         ## store the total_checksum in the form of a string, \
         ## adjusting its length to be 12 characters long
         self.system_envs[f'{ptype}_history']['code_id'] = total_checksum_str 
+        ## save per-step resource usage
+        if len(self.resource_usage) > 0:
+            self._save_resource_usage()
+        ## save per-step memory attribution report
+        if len(self.memory_usage) > 0:
+            self._save_memory_report()
         _log_process(f"<< RUN >> {self.pipeline_type} finish", highlight=True)
 
     def save(self):
@@ -243,7 +323,8 @@ class Pipeline:
         ## save artifacts
         if not self.system_envs['boot_on']:
             ## (Note) within save_artifacts, there is also transmission to the edge app via Redis
-            self._save_artifacts()
+            with METRICS.time('alo_artifact_save_seconds', pipeline=self.pipeline_type):
+                self._save_artifacts()
             ## define up to backup as the final execution time
             self.system_envs['experimental_end_time'] = datetime.now().strftime(TIME_FORMAT)
             PROC_LOGGER.process_message(f"Process finish-time: {datetime.now().strftime(TIME_FORMAT_DISPLAY)}")
@@ -338,9 +419,8 @@ class Pipeline:
             file_score = base_path + folder + f"/score/{ptype}_summary.yaml"
             if os.path.exists(file_score):
                 try:
-                    with open(file_score, 'r') as f:
-                        history_score = yaml.safe_load(f)
-                        history_dict[folder].update(history_score)
+                    history_score = _load_yaml(file_score)
+                    history_dict[folder].update(history_score)
                 except:
                     history_dict[folder].update(empty_score_dict)
             else:
@@ -484,6 +564,28 @@ class Pipeline:
         ## convert the final checksum to a 64-bit integer
         return int(checksum.hexdigest(), 16) & ((1 << 64) - 1)
 
+    def _get_asset_code_checksum(self, step_name, folder_path):
+        """ code checksum of the asset. 
+            The checksum kept in the asset state is reused if the git asset is unchanged since the previous run.
+            
+        Args: 
+            step_name   (str): step name
+            folder_path (str): asset folder path
+        
+        Returns: 
+            64-bit integer checksum (int)
+
+        """
+        state = self._load_asset_state(folder_path)
+        if (step_name in self.unchanged_assets) and (state is not None) and (state.get('code_checksum') is not None):
+            return state['code_checksum']
+        checksum = self._code_checksum(folder_path)
+        ## git asset: keep the checksum of the commit
+        if state is not None:
+            state['code_checksum'] = checksum
+            self._save_asset_state(folder_path, state)
+        return checksum
+
     def _check_output(self):
         """ Check for proper creation of inference_summary.yaml 
             and output csv / image files (jpg, png, svg).
@@ -518,6 +620,64 @@ class Pipeline:
         else:
             PROC_LOGGER.process_error(f"[Failed] You have to save inference output file. The number of output files must be 1 or 2. \n Your output: {output_files}")
 
+    def _save_resource_usage(self):
+        """ Save per-step resource usage (timeline and summary) into {pipeline}_artifacts/score/
+            and add the summary into the experimental history.
+            
+        Args: - 
+        
+        Returns: -
+
+        """
+        ptype = self.pipeline_type.split('_')[0]
+        resource_summary = {}
+        resource_usage = {}
+        for step_name, sampler in self.resource_usage.items():
+            summary = sampler.summary()
+            resource_summary[step_name] = summary
+            resource_usage[step_name] = {'summary': summary, 'timeline': sampler.timeline()}
+            PROC_LOGGER.process_message(f"<< {step_name} >> resource usage - duration: {summary['duration_sec']}s, " \
+                    f"cpu(mean/max): {summary['cpu_percent_mean']}/{summary['cpu_percent_max']}%, " \
+                    f"rss(end/peak): {summary['rss_mb_end']}/{summary['rss_mb_peak']}MB, " \
+                    f"io(read/write): {summary['io_read_mb']}/{summary['io_write_mb']}MB, threads: {summary['num_threads_max']}")
+        path = PROJECT_HOME + f"{ptype}_artifacts/" + RESOURCE_USAGE_PATH
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump(resource_usage, f)
+        except Exception as e:
+            PROC_LOGGER.process_warning(f"Failed to save resource usage: {path} \n {str(e)}")
+        self.system_envs[f'{ptype}_history']['resource_usage'] = resource_summary
+
+    def _save_memory_report(self):
+        """ Save per-step memory attribution report into {pipeline}_artifacts/log/
+            In loop mode, tracemalloc keeps tracing across requests to detect leaking steps.
+            
+        Args: - 
+        
+        Returns: -
+
+        """
+        ## data / config size is None if it could not be measured
+        to_mb = lambda size: "n/a" if size is None else f"{round(size / (1024 * 1024), 2)}MB"
+        for step_name, record in self.memory_usage.items():
+            msg = f"<< {step_name} >> memory - net growth: {to_mb(record['net_growth_bytes'])}, " \
+                    f"peak: {to_mb(record['peak_bytes'])}, data: {to_mb(record['data_bytes'])} " \
+                    f"({to_mb(record['data_growth_bytes'])}), config: {to_mb(record['config_bytes'])}"
+            if record['leak_suspected']:
+                PROC_LOGGER.process_warning(msg + f" - memory leak suspected: the step retained memory in each of the last {MEMORY_LEAK_RUNS} runs.")
+            else:
+                PROC_LOGGER.process_message(msg)
+        log_path = TRAIN_LOG_PATH if self.pipeline_type == 'train_pipeline' else INFERENCE_LOG_PATH
+        try:
+            os.makedirs(log_path, exist_ok=True)
+            with open(log_path + MEMORY_REPORT_FILE, 'w') as f:
+                json.dump(self.memory_usage, f, indent=1)
+        except Exception as e:
+            PROC_LOGGER.process_warning(f"Failed to save memory report: {log_path + MEMORY_REPORT_FILE} \n {str(e)}")
+        if not self.system_envs['loop']:
+            MEMORY_TRACER.stop()
+
     def _send_redis_summary(self):
         """ Once save artifacts is complete, put OK into the Redis queue. 
             If a solution metadata exists (operational mode), the Redis host is not None 
@@ -621,6 +781,36 @@ class Pipeline:
         PROC_LOGGER.process_error("get asset source error") 
 
     def process_asset_step(self, asset_config, step):
+        """ import and run user asset (recorded as a span of the trace)
+        Args: 
+            asset_config    (dict): asset config info 
+            step            (int): asset step order 
+        
+        Returns: -
+
+        """
+        ## per-step resource sampling (not in boot-on mode: assets are only imported)
+        sampler = None
+        if (self.control['check_resource'] == True) and (not self.system_envs['boot_on']):
+            interval = self.control['resource_interval']
+            if (type(interval) not in [int, float]) or (interval <= 0):
+                PROC_LOGGER.process_error(f"<< resource_interval >> must be a positive number (sec): {interval}")
+            sampler = ResourceSampler(interval)
+            sampler.start()
+        ## per-step memory attribution (tracemalloc)
+        if (self.control['trace_memory'] == True) and (not self.system_envs['boot_on']):
+            memory_trace = MEMORY_TRACER.trace(self.pipeline_type, asset_config['step'], self.asset_structure, self.memory_usage)
+        else:
+            memory_trace = nullcontext()
+        try:
+            with TRACER.span(asset_config['step'], 'step', step_number=step), memory_trace:
+                self._run_asset_step(asset_config, step)
+        finally:
+            if sampler is not None:
+                sampler.stop()
+                self.resource_usage[asset_config['step']] = sampler
+
+    def _run_asset_step(self, asset_config, step):
         """ import and run user asset
         Args: 
             asset_config    (dict): asset config info 
@@ -637,12 +827,26 @@ class Pipeline:
         # convert asset{N} --> asset
         # needed for such as inference1, inference2..  
         _file = ''.join(filter(lambda x: x.isalpha() or x == '_', _file))
-        user_asset = self.import_asset(_path, _file)
+        ## warm context (loop mode): the asset class imported at boot-on is kept across requests
+        warm_context = self.system_envs['loop'] and (self.control['warm_context'] == True)
+        if warm_context and (asset_config['step'] in self.asset_classes):
+            user_asset = self.asset_classes[asset_config['step']]
+        else:
+            user_asset = self.import_asset(_path, _file)
+            if warm_context:
+                self.asset_classes[asset_config['step']] = user_asset
         ## nested dict
         meta_dict = {'artifacts': self.system_envs['artifacts'], 'pipeline': self.pipeline_type, \
                 'step': step, 'step_number': step, 'step_name': self.user_parameters[self.pipeline_type][step]['step']}
         self.asset_structure.config['meta'] = meta_dict 
-        if step > 0:
+        if self.scheduler is not None:
+            ## dependency graph: the last dependency is the previous step (no dependency: none)
+            dependencies = self.scheduler.dependencies[asset_config['step']]
+            if len(dependencies) > 0:
+                self.asset_structure.envs['prev_step'] = dependencies[-1]
+            else:
+                self.asset_structure.envs.pop('prev_step', None)
+        elif step > 0:
             ## needed for load_config, load_data at asset.py 
             self.asset_structure.envs['prev_step'] = self.user_parameters[self.pipeline_type][step - 1]['step']
         self.asset_structure.envs['step'] = self.user_parameters[self.pipeline_type][step]['step']
@@ -665,15 +869,264 @@ class Pipeline:
         except: 
             self._publish_redis_msg("alo_fail", json.dumps(self.system_envs['redis_error_table']["E151"]))   
         ## execute run() function in user asset 
+        profiler = self._start_profiler(asset_config['step']) if self._is_profiled(asset_config['step']) else None
         try: 
             self.asset_structure.data, self.asset_structure.config = ua.run()
         except: 
             self._publish_redis_msg("alo_fail", json.dumps(self.system_envs['redis_error_table']["E152"]))  
             PROC_LOGGER.process_error(f"Failed to user asset run")
+        finally:
+            if profiler is not None:
+                self._save_profiler(profiler)
+        ## warm context: asset modules and path stay as imported at boot-on
+        if warm_context:
+            return
         # FIXME memory release : on / off needed? 
         self.memory_release(_path)
         sys.path = [item for item in sys.path if self.asset_structure.envs['step'] not in item]
 
+    def _run_step_graph(self):
+        """ run the steps along the dependency graph of << depends_on >> (asset_source). 
+            The input data / config of a step is the output of its dependency, 
+            or the outputs of its dependencies merged in the asset_source order (later step wins on the same key). 
+            The steps without dependency start with the data / config of the pipeline, 
+            and the outputs of the final steps (no dependent) become the data / config of the pipeline. 
+            Ready steps run concurrently, each in a forked worker process (up to {STEP_MAX_WORKERS}), 
+            so that CPU-bound assets are not serialized by the GIL. 
+            Without fork (e.g. windows) or in boot-on mode, the steps run one by one in the topological order. 
+        
+        Args: -
+        
+        Returns: -
+
+        """
+        asset_source = self.asset_source[self.pipeline_type]
+        try:
+            self.scheduler = StepScheduler(asset_source)
+        except ValueError as e:
+            PROC_LOGGER.process_error(f"Invalid << depends_on >> of {self.pipeline_type}: {e}")
+        for asset_config in asset_source:
+            self.asset_structure.args[asset_config['step']] = self.get_parameter(asset_config['step'])
+        ## step name - output (data, config)
+        outputs = {}
+        initial = (self.asset_structure.data, self.asset_structure.config)
+        try:
+            if (not self.system_envs['boot_on']) and (STEP_MAX_WORKERS > 1) and ('fork' in multiprocessing.get_all_start_methods()):
+                self._run_forked_steps(outputs, initial)
+            else:
+                for step_name in self.scheduler.order:
+                    step = self.scheduler.step_names.index(step_name)
+                    _log_process(f"current step: {step_name} (depends on: {self.scheduler.dependencies[step_name]})")
+                    self._set_step_inputs(step_name, outputs, initial)
+                    try:
+                        self.process_asset_step(asset_source[step], step)
+                    except:
+                        PROC_LOGGER.process_error(f"Failed to process step: << {step_name} >>")
+                    outputs[step_name] = (self.asset_structure.data, self.asset_structure.config)
+                    self.scheduler.finish(step_name)
+            self.asset_structure.data, self.asset_structure.config = \
+                self._merge_step_outputs([outputs[step_name] for step_name in self.scheduler.get_final_steps()])
+        finally:
+            self.scheduler = None
+
+    def _set_step_inputs(self, step_name, outputs, initial):
+        """ set the input data / config of the step into the asset structure 
+        
+        Args: 
+            step_name   (str): asset step name 
+            outputs     (dict): step name - output (data, config) of the finished steps 
+            initial     (tuple): data / config of the pipeline (input of the steps without dependency) 
+        
+        Returns: -
+
+        """
+        dependencies = self.scheduler.dependencies[step_name]
+        output_list = [outputs[dependency] for dependency in dependencies] if len(dependencies) > 0 else [initial]
+        self.asset_structure.data, self.asset_structure.config = self._merge_step_outputs(output_list)
+
+    def _merge_step_outputs(self, output_list):
+        """ merge the outputs (data, config) of the steps in the order of the list (later output wins on the same key). 
+            The merged dicts are new (shallow copies): sibling steps do not share the top-level dicts. 
+        
+        Args: 
+            output_list (list): outputs (data, config) 
+        
+        Returns: 
+            data, config 
+
+        """
+        if not all(type(data) == dict and type(config) == dict for data, config in output_list):
+            ## not mergeable (returned by a user asset): output of the last one
+            return output_list[-1]
+        data, config = {}, {}
+        for step_data, step_config in output_list:
+            data.update(step_data)
+            config.update(step_config)
+        return data, config
+
+    def _run_forked_steps(self, outputs, initial):
+        """ run the ready steps concurrently in forked worker processes (up to {STEP_MAX_WORKERS}). 
+            The output, resource usage, memory record, spans and redis messages of a step are sent back to this process. 
+        
+        Args: 
+            outputs     (dict): step name - output (data, config); filled with the finished steps 
+            initial     (tuple): data / config of the pipeline (input of the steps without dependency) 
+        
+        Returns: -
+
+        """
+        asset_source = self.asset_source[self.pipeline_type]
+        context = multiprocessing.get_context('fork')
+        ## receiving connection - (step name, worker process)
+        running = {}
+        try:
+            while not self.scheduler.is_finished():
+                for step_name in self.scheduler.get_ready_steps()[:STEP_MAX_WORKERS - len(running)]:
+                    step = self.scheduler.step_names.index(step_name)
+                    _log_process(f"current step: {step_name} (depends on: {self.scheduler.dependencies[step_name]})")
+                    self._publish_redis_msg("alo_status", f"run.{step_name}")
+                    ## the worker is forked with the inputs of the step in the asset structure
+                    self._set_step_inputs(step_name, outputs, initial)
+                    receiver, sender = context.Pipe(duplex=False)
+                    worker = context.Process(target=self._run_step_worker, args=(asset_source[step], step, sender), \
+                                            name=f"alo-step-{step_name}")
+                    worker.start()
+                    sender.close()
+                    running[receiver] = (step_name, worker)
+                    self.scheduler.start(step_name)
+                for receiver in wait_connections(list(running)):
+                    step_name, worker = running.pop(receiver)
+                    try:
+                        result = receiver.recv()
+                    except EOFError:
+                        result = {'error': "worker process exited without result"}
+                    receiver.close()
+                    worker.join()
+                    for channel, msg in result.get('redis_msgs', []):
+                        self._publish_redis_msg(channel, msg)
+                    TRACER.merge(result.get('trace', []))
+                    SHOW_EVENTS.extend(result.get('show_events', []))
+                    if 'outputs' not in result:
+                        PROC_LOGGER.process_error(f"Failed to process step: << {step_name} >> (exit code: {worker.exitcode}) \n {result['error']}")
+                    outputs[step_name] = result['outputs']
+                    if result['resource_usage'] is not None:
+                        self.resource_usage[step_name] = result['resource_usage']
+                    if result['memory_usage'] is not None:
+                        self.memory_usage[step_name] = result['memory_usage']
+                        MEMORY_TRACER.history[(self.pipeline_type, step_name)].extend(result['memory_history'])
+                    self.scheduler.finish(step_name)
+        finally:
+            ## a step failed: stop the other running steps
+            for receiver, (step_name, worker) in running.items():
+                worker.terminate()
+                worker.join()
+                receiver.close()
+
+    def _run_step_worker(self, asset_config, step, sender):
+        """ run the step in the forked worker process and send the result to the parent process 
+        
+        Args: 
+            asset_config    (dict): asset config info 
+            step            (int): asset step order 
+            sender          (Connection): connection to the parent process 
+        
+        Returns: -
+
+        """
+        step_name = asset_config['step']
+        ## redis connection is owned by the parent process: failures are published by the parent \
+        ## (the run status is already published at the start of the worker)
+        redis_msgs = []
+        self._publish_redis_msg = lambda channel, msg: redis_msgs.append((channel, msg)) if channel != "alo_status" else None
+        num_events = len(TRACER.events)
+        TRACER.pid = os.getpid()
+        ## SHOW events of the step are sent to the parent process (summary table)
+        SHOW_EVENTS.detach()
+        result = {'redis_msgs': redis_msgs}
+        try:
+            self.process_asset_step(asset_config, step)
+            result.update({'outputs': (self.asset_structure.data, self.asset_structure.config), 
+                        'resource_usage': self.resource_usage.get(step_name), 
+                        'memory_usage': self.memory_usage.get(step_name),
+                        'memory_history': MEMORY_TRACER.history[(self.pipeline_type, step_name)][-1:]})
+        except BaseException as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+        result['trace'] = TRACER.events[num_events:]
+        result['show_events'] = SHOW_EVENTS.events()
+        try:
+            ## the worker exits by os._exit: write the queued log records before the parent process is notified
+            flush_process_logger()
+            sender.send(result)
+        except Exception as e:
+            ## e.g. output data not picklable
+            error = f"Failed to send the output of << {step_name} >> to the parent process: {e}"
+            try:
+                flush_process_logger()
+                sender.send({'redis_msgs': redis_msgs, 'trace': result['trace'], 'show_events': result['show_events'], 'error': error})
+            except Exception as e:
+                ## trace / SHOW events not picklable either: the error only 
+                try:
+                    sender.send({'error': f"{error} \n {e}"})
+                except Exception:
+                    ## broken pipe: the parent process reports the exit without result
+                    pass
+        finally:
+            sender.close()
+
+    def _is_profiled(self, step_name):
+        """ check whether the step is in << profile_steps >> control 
+        
+        Args: 
+            step_name   (str): asset step name 
+        
+        Returns: 
+            bool
+
+        """
+        profile_steps = self.control['profile_steps']
+        if (profile_steps is None) or (profile_steps == []):
+            return False
+        if profile_steps == 'all':
+            return True
+        if type(profile_steps) == str:
+            profile_steps = [profile_steps]
+        if type(profile_steps) != list:
+            PROC_LOGGER.process_error(f"<< profile_steps >> must be << all >> or list of step names: {profile_steps}")
+        return step_name in profile_steps
+
+    def _start_profiler(self, step_name):
+        """ start cpu profiler of the step
+        
+        Args: 
+            step_name   (str): asset step name 
+        
+        Returns: 
+            profiler    (StepProfiler, None): None if failed to start
+
+        """
+        profiler = StepProfiler(f"{self.pipeline_type.split('_')[0]}_{step_name}")
+        if not profiler.start():
+            PROC_LOGGER.process_warning(f"Skip profiling << {step_name} >>: another profiler is already active.")
+            return None
+        return profiler
+
+    def _save_profiler(self, profiler):
+        """ stop cpu profiler and save profiles into {pipeline}_artifacts/extra_output/profiles/
+        
+        Args: 
+            profiler    (StepProfiler): started profiler 
+        
+        Returns: -
+
+        """
+        profiler.stop()
+        save_dir = PROJECT_HOME + f"{self.pipeline_type.split('_')[0]}_artifacts/" + PROFILE_PATH
+        try:
+            file_list = profiler.save(save_dir)
+            PROC_LOGGER.process_message(f"Successfully saved cpu profiles: {file_list}")
+        except Exception as e:
+            PROC_LOGGER.process_warning(f"Failed to save cpu profiles into {save_dir} \n {str(e)}")
+
     def _setup_asset(self, asset_source, get_asset_source):
         """ Clone the asset's git repository and install packages.
             Check for duplicate step names and raise an error if any exist. 
@@ -725,6 +1178,9 @@ class Pipeline:
         self.asset_structure.envs['proc_start_time'] = self.system_envs['start_time']
         self.asset_structure.envs['save_train_artifacts_path'] = self.external_path['save_train_artifacts_path']
         self.asset_structure.envs['save_inference_artifacts_path'] = self.external_path['save_inference_artifacts_path']
+        if (type(self.control['model_cache_size']) not in [int, float]) or (self.control['model_cache_size'] < 0):
+            PROC_LOGGER.process_error(f"<< model_cache_size >> must be a non-negative number (MB): {self.control['model_cache_size']}")
+        MODEL_CACHE.set_max_bytes(int(self.control['model_cache_size'] * 1024 * 1024))
 
     def _install_steps(self, asset_source, get_asset_source='once'):
         """ install requirements of the steps
@@ -738,21 +1194,102 @@ class Pipeline:
             extracted_requirements_dict     (dict)
 
         """
-        try: 
-            requirements_dict = dict()
-            for step, asset_config in enumerate(asset_source):
-                self._install_asset(asset_config, get_asset_source)
-                requirements_dict[asset_config['step']] = asset_config['source']['requirements']
-        except: 
+        requirements_dict = dict()
+        for asset_config in asset_source:
+            requirements_dict[asset_config['step']] = asset_config['source']['requirements']
+        ## fetch the assets concurrently (git clones are I/O bound). While the others are still being fetched, \
+        ## the installed distributions are indexed and the requirements of the finished steps are extracted and checked
+        extracted_requirements_dict = dict()
+        failed_steps = []
+        extract_failed_steps = []
+        num_workers = max(1, min(ASSET_FETCH_WORKERS, len(asset_source)))
+        self.install.prepared = None
+        with ThreadPoolExecutor(max_workers=num_workers + 1, thread_name_prefix='alo-asset') as executor:
+            prepare_future = executor.submit(self.install.prepare_dependency_check)
+            futures = {executor.submit(self._install_asset, asset_config, get_asset_source): asset_config['step'] for asset_config in asset_source}
+            for future in as_completed(futures):
+                step_name = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    failed_steps.append(step_name)
+                    PROC_LOGGER.process_warning(f"Failed to install << {step_name} >> asset: {e}")
+                    continue
+                ## git asset unchanged since the previous run: reuse the requirements extracted and checked then
+                step_requirements = self._get_unchanged_requirements(step_name, requirements_dict[step_name])
+                if step_requirements is not None:
+                    extracted_requirements_dict[step_name] = step_requirements['extracted']
+                    PROC_LOGGER.process_message(f"<< {step_name} >> asset is unchanged. Reused the requirements checked at the previous run.")
+                    continue
+                ## invalid requirements (e.g. requirements.txt not found) are logged by extract_step_requirements \
+                ## and reported at once after all the assets are fetched
+                try:
+                    extracted_requirements_dict[step_name] = self.install.extract_step_requirements(step_name, requirements_dict[step_name])
+                except Exception:
+                    extract_failed_steps.append(step_name)
+                    continue
+                try:
+                    prepare_future.result()
+                    self.install.precheck_requirements(extracted_requirements_dict[step_name])
+                except Exception as e:
+                    ## checked again by check_install_requirements below
+                    PROC_LOGGER.process_warning(f"Failed to check requirements of << {step_name} >> in advance: {e}")
+        if len(failed_steps) > 0: 
             self._publish_redis_msg("alo_fail", json.dumps(self.system_envs['redis_error_table']["E131"])) 
-            PROC_LOGGER.process_error(f"Failed to install asset") 
+            ## in the step order
+            failed_steps = [step_name for step_name in requirements_dict if step_name in failed_steps]
+            PROC_LOGGER.process_error(f"Failed to install asset: {failed_steps}") 
+        if len(extract_failed_steps) > 0: 
+            self._publish_redis_msg("alo_fail", json.dumps(self.system_envs['redis_error_table']["E132"])) 
+            extract_failed_steps = [step_name for step_name in requirements_dict if step_name in extract_failed_steps]
+            PROC_LOGGER.process_error(f"Failed to extract requirements of the steps: {extract_failed_steps}") 
         try: 
-            dup_checked_requirements_dict, extracted_requirements_dict = self.install.check_install_requirements(requirements_dict)
+            dup_checked_requirements_dict, extracted_requirements_dict = self.install.check_install_requirements(requirements_dict, extracted_requirements_dict)
         except: 
             self._publish_redis_msg("alo_fail", json.dumps(self.system_envs['redis_error_table']["E132"]))  
             PROC_LOGGER.process_error(f"Failed to install requirements") 
+        ## keep the checked requirements in the state of the git assets (reused while the asset is unchanged)
+        for step_name, requirements_list in requirements_dict.items():
+            self._save_asset_requirements(step_name, requirements_list, extracted_requirements_dict.get(step_name))
         return dup_checked_requirements_dict, extracted_requirements_dict
 
+    def _get_unchanged_requirements(self, step_name, requirements_list):
+        """ requirements of the git asset checked at the previous run, 
+            if the asset is unchanged (unchanged_assets) and the same requirements are written in experimental_plan.yaml
+        
+        Args: 
+            step_name           (str): step name
+            requirements_list   (list): requirements written in experimental_plan.yaml
+
+        Returns: 
+            step_requirements   (dict): written, extracted (None if not reusable)
+
+        """
+        if step_name not in self.unchanged_assets:
+            return None
+        state = self._load_asset_state(os.path.join(ASSET_HOME, step_name))
+        if (state is None) or (state.get('requirements') is None) or (state['requirements']['written'] != requirements_list):
+            return None
+        return state['requirements']
+
+    def _save_asset_requirements(self, step_name, requirements_list, extracted_list):
+        """ save the checked requirements into the state of the git asset (skipped for the local assets)
+        
+        Args: 
+            step_name           (str): step name
+            requirements_list   (list): requirements written in experimental_plan.yaml
+            extracted_list      (list): requirements extracted by extract_step_requirements (None if no requirements)
+
+        Returns: -
+
+        """
+        step_path = os.path.join(ASSET_HOME, step_name)
+        state = self._load_asset_state(step_path)
+        if state is None:
+            return
+        state['requirements'] = {'written': requirements_list, 'extracted': extracted_list}
+        self._save_asset_state(step_path, state)
+
     def _empty_package_list(self, pipeline):
         """ package list setup - only remove current pipeline step{N}.txt
         
@@ -874,19 +1411,42 @@ class Pipeline:
         ## code: git url & branch specified
         else: 
             if _is_git_url(asset_source_code):
-                if (check_asset_source == "every") or (check_asset_source == "once" and _renew_asset(step_path)):
+                ## incremental refresh: keep the working tree if the remote branch has not moved
+                if (check_asset_source == "every") and self._is_asset_unchanged(step_path, asset_source_code, git_branch):
+                    self.unchanged_assets.add(step_name)
+                    PROC_LOGGER.process_message(f"<< {step_name} >> asset is up to date with << {git_branch} >> of {asset_source_code}. Skip renewing asset.")
+                elif (check_asset_source == "every") or (check_asset_source == "once" and _renew_asset(step_path)):
                     PROC_LOGGER.process_message(f"Start renewing asset : {step_path}")
                     ## to receive new from git, remove the currently existing folder
                     if os.path.exists(step_path):
                         shutil.rmtree(step_path)  
                     os.makedirs(step_path)
                     os.chdir(PROJECT_HOME)
-                    repo = git.Repo.clone_from(asset_source_code, step_path)
-                    try:
-                        repo.git.checkout(git_branch)
-                        PROC_LOGGER.process_message(f"{step_path} successfully pulled.")
-                    except:
-                        PROC_LOGGER.process_error(f"Your have written incorrect git branch: {git_branch}")
+                    ## shallow, single-branch clone from the local mirror cache (the mirror fetches only the branch head)
+                    shallow_cloned = False
+                    if self.control['shallow_clone'] == True:
+                        try:
+                            GIT_MIRROR.clone(asset_source_code, git_branch, step_path)
+                            shallow_cloned = True
+                            PROC_LOGGER.process_message(f"{step_path} successfully pulled. (shallow clone)")
+                        ## e.g. commit hash written as the branch: full clone and checkout
+                        except Exception as e:
+                            PROC_LOGGER.process_warning(f"Failed to shallow clone << {git_branch} >> of {asset_source_code}. Start full clone. \n {e}")
+                            shutil.rmtree(step_path)
+                            os.makedirs(step_path)
+                    if not shallow_cloned:
+                        ## lazy import: git is only needed for git url assets
+                        import git
+                        with TRACER.span(f"git clone {step_name}", 'git', url=asset_source_code, branch=git_branch):
+                            repo = git.Repo.clone_from(asset_source_code, step_path)
+                        try:
+                            with TRACER.span(f"git checkout {step_name}", 'git', branch=git_branch):
+                                repo.git.checkout(git_branch)
+                            PROC_LOGGER.process_message(f"{step_path} successfully pulled.")
+                        except:
+                            PROC_LOGGER.process_error(f"Your have written incorrect git branch: {git_branch}")
+                    _, commit = _read_git_head(step_path)
+                    self._save_asset_state(step_path, {'url': asset_source_code, 'branch': git_branch, 'commit': commit})
                 ## (Note) assets and requirements already installed 
                 elif (check_asset_source == "once" and not _renew_asset(step_path)):
                     modification_time = os.path.getmtime(step_path)
@@ -899,6 +1459,70 @@ class Pipeline:
                 PROC_LOGGER.process_error(f'You have written wrong git url: {asset_source_code}')
         return
 
+    def _load_asset_state(self, step_path):
+        """ load the source state of the git asset (None if not a git asset or not exists)
+        
+        Args: 
+            step_path   (str): asset path
+
+        Returns: 
+            state       (dict): url, branch, commit, code_checksum, requirements
+
+        """
+        try:
+            with open(os.path.join(step_path, ASSET_STATE_FILE), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_asset_state(self, step_path, state):
+        """ save the source state of the git asset
+        
+        Args: 
+            step_path   (str): asset path
+            state       (dict): url, branch, commit, code_checksum, requirements
+
+        Returns: -
+
+        """
+        try:
+            with open(os.path.join(step_path, ASSET_STATE_FILE), 'w') as f:
+                json.dump(state, f)
+        except OSError as e:
+            PROC_LOGGER.process_warning(f"Failed to save asset state: {str(e)}")
+
+    def _is_asset_unchanged(self, step_path, url, branch):
+        """ whether the git asset is the head of the remote branch (git ls-remote) without local modifications 
+            (modified or untracked files, except the bytecode caches)
+        
+        Args: 
+            step_path   (str): asset path
+            url         (str): git url
+            branch      (str): branch (or tag, commit hash)
+
+        Returns: 
+            bool
+
+        """
+        state = self._load_asset_state(step_path)
+        if (state is None) or (state.get('url') != url) or (state.get('branch') != branch):
+            return False
+        try:
+            _, commit = _read_git_head(step_path)
+            if (commit is None) or (commit != state.get('commit')) or (commit != GIT_MIRROR.get_remote_commit(url, branch)):
+                return False
+            ## lazy import: git is only needed for git url assets
+            import git
+            repo = git.Repo(step_path)
+            if repo.is_dirty(untracked_files=False):
+                return False
+            ## untracked files (e.g. a new .py file) also change the asset and its code checksum
+            untracked_files = [file for file in repo.untracked_files if ('__pycache__' not in file.split('/')) and (not file.endswith('.pyc'))]
+            return len(untracked_files) == 0
+        except Exception as e:
+            PROC_LOGGER.process_warning(f"Failed to check the remote head of << {branch} >> of {url}. Start renewing asset. \n {str(e)}")
+            return False
+
     def _create_package(self, packs):
         """ create package list written txt file 
         
@@ -930,6 +1554,8 @@ class Pipeline:
         Returns: -
 
         """
+        if channel == "alo_fail":
+            METRICS.inc('alo_errors_total', code=_get_error_code(msg))
         redis_pubsub = self.system_envs["redis_pubsub_instance"]
         if redis_pubsub is not None: 
             redis_pubsub.publish(channel, msg)
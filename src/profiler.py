@@ -0,0 +1,118 @@
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from src.constants import *
+
+class StepProfiler:
+    def __init__(self, name, interval=PROFILE_SAMPLE_INTERVAL):
+        """ CPU profiler of an asset step (user asset run()).
+            - deterministic: cProfile of the calling thread, saved as pstats ({name}.pstats)
+            - sampling: stacks of the calling thread collected by a daemon thread every {interval} sec,
+                        saved as collapsed stacks ({name}.collapsed; input of flamegraph.pl, speedscope, etc.)
+
+        Args:
+            name        (str): profile name (e.g. step name)
+            interval    (float): stack sampling interval (sec)
+
+        Returns: -
+
+        """
+        self.name = name
+        self.interval = interval
+        self.profile = None
+        self.stacks = Counter()
+        self.target_ident = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _collapse(self, frame):
+        """ collapse the stack of the frame into a single line (root first, separated by ';')
+
+        Args:
+            frame   (frame): leaf frame
+
+        Returns:
+            stack   (str)
+
+        """
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def _run(self):
+        """ stack sampling loop of the background thread
+
+        Args: -
+
+        Returns: -
+
+        """
+        while not self.stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    def start(self):
+        """ start profiling the calling thread
+
+        Args: -
+
+        Returns:
+            started     (bool): False if another profiler is already active
+
+        """
+        self.target_ident = threading.get_ident()
+        self.profile = cProfile.Profile()
+        try:
+            self.profile.enable()
+        ## only one profiler can be active at a time
+        except ValueError:
+            self.profile = None
+            return False
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='alo-step-profiler', daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """ stop profiling
+
+        Args: -
+
+        Returns: -
+
+        """
+        if self.profile is not None:
+            self.profile.disable()
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def save(self, save_dir):
+        """ save pstats and collapsed stacks
+
+        Args:
+            save_dir    (str): directory to save the profiles
+
+        Returns:
+            file_list   (list): saved file paths
+
+        """
+        os.makedirs(save_dir, exist_ok=True)
+        file_list = []
+        if self.profile is not None:
+            pstats_file = os.path.join(save_dir, f"{self.name}.pstats")
+            self.profile.dump_stats(pstats_file)
+            file_list.append(pstats_file)
+        collapsed_file = os.path.join(save_dir, f"{self.name}.collapsed")
+        with open(collapsed_file, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        file_list.append(collapsed_file)
+        return file_list
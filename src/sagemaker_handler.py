@@ -122,7 +122,7 @@ class SagemakerHandler:
                 item for item in exp_plan_dict['user_parameters'] if delete_pipe not in item]
             exp_plan_dict['asset_source'] = [
                 item for item in exp_plan_dict['asset_source'] if delete_pipe not in item]
-            PROC_LOGGER.process_message(f"{delete_pipe} deleted in experimental plan. Re-written experimental plan for sagemaker: \n {exp_plan_dict}")
+            PROC_LOGGER.process_message("%s deleted in experimental plan. Re-written experimental plan for sagemaker: \n %s", delete_pipe, exp_plan_dict)
         ## rewrite experimental plan yaml
         self.meta.save_yaml(exp_plan_dict, SAGEMAKER_EXP_PLAN)
         
@@ -179,8 +179,16 @@ class SagemakerHandler:
             content = file.read()
         path = ASSET_PACKAGE_PATH.replace(PROJECT_HOME, "./")
         replace_string = '\n'.join([f"COPY {path}{file} {docker_location}" for file in file_list])
+        ## local wheelhouse (wheelhouse: True) is copied and used first; the index is used only for the misses 
+        find_links = ''
+        if os.path.isdir(WHEELHOUSE_PATH) and len(os.listdir(WHEELHOUSE_PATH)) > 0:
+            replace_string += f"\nCOPY {path}{WHEELHOUSE_DIR} {docker_location}{WHEELHOUSE_DIR}"
+            find_links = f"--find-links {docker_location}{WHEELHOUSE_DIR} "
         requirement_files = [file for file in file_list if file.endswith('.txt')]
-        pip_install_commands = '\n'.join([f"RUN pip3 install --no-cache-dir -r {docker_location}{file}" for file in requirement_files])
+        pip_install_commands = '\n'.join([f"RUN pip3 install --no-cache-dir {find_links}-r {docker_location}{file}" for file in requirement_files])
+        ## precompile the source into checked-hash bytecode (PYTHONDONTWRITEBYTECODE: not written at import time)
+        pip_install_commands += "\n" + f"RUN python3 -m compileall -q -j 0 -x '/\\.git/' --invalidation-mode checked-hash " + \
+            ' '.join([f"{docker_location}{folder}" for folder in ['src', 'alolib', 'assets']])
         if search_string in content:
             content = content.replace(search_string, replace_string + "\n" + pip_install_commands)
             with open(PROJECT_HOME + 'Dockerfile', 'w', encoding='utf-8') as file:
@@ -0,0 +1,160 @@
+from src.constants import *
+
+def has_step_dependencies(asset_source):
+    """ check whether any step of the pipeline declares << depends_on >>
+        (otherwise the steps run one after another in the asset_source order)
+
+    Args:
+        asset_source    (list): asset source of the pipeline (experimental_plan.yaml)
+
+    Returns:
+        bool
+
+    """
+    return any('depends_on' in asset_config for asset_config in asset_source)
+
+def get_step_dependencies(asset_source):
+    """ dependencies of each step
+        - depends_on: step name or list of step names ([]: no dependency, i.e. starts at first)
+        - without depends_on: the previous step in the asset_source (same as the sequential pipeline)
+
+    Args:
+        asset_source    (list): asset source of the pipeline (experimental_plan.yaml)
+
+    Returns:
+        dependencies    (dict): step name - dependency step names (in the asset_source order)
+
+    """
+    step_names = [asset_config['step'] for asset_config in asset_source]
+    order = {step_name: i for i, step_name in enumerate(step_names)}
+    if len(order) != len(step_names):
+        raise ValueError(f"duplicated steps: {sorted(set(name for name in step_names if step_names.count(name) > 1))}")
+    dependencies = {}
+    for i, asset_config in enumerate(asset_source):
+        step_name = asset_config['step']
+        if 'depends_on' not in asset_config:
+            dependencies[step_name] = [step_names[i - 1]] if i > 0 else []
+            continue
+        depends_on = asset_config['depends_on']
+        if depends_on is None:
+            depends_on = []
+        elif type(depends_on) == str:
+            depends_on = [depends_on]
+        elif type(depends_on) != list:
+            raise ValueError(f"<< depends_on >> of << {step_name} >> must be a step name or a list of step names: {depends_on}")
+        for dependency in depends_on:
+            if dependency not in order:
+                raise ValueError(f"<< {step_name} >> depends on unknown step: {dependency}")
+            if dependency == step_name:
+                raise ValueError(f"<< {step_name} >> depends on itself")
+        ## asset_source order: the outputs of the dependencies are merged in this order
+        dependencies[step_name] = sorted(set(depends_on), key=order.get)
+    return dependencies
+
+def sort_steps(dependencies):
+    """ topological order of the steps (Kahn's algorithm).
+        Among the steps ready at the same time, the earlier one in the asset_source comes first.
+
+    Args:
+        dependencies    (dict): step name - dependency step names (get_step_dependencies)
+
+    Returns:
+        order           (list): step names
+
+    """
+    step_names = list(dependencies)
+    num_waiting = {step_name: len(dependencies[step_name]) for step_name in step_names}
+    dependents = {step_name: [] for step_name in step_names}
+    for step_name in step_names:
+        for dependency in dependencies[step_name]:
+            dependents[dependency].append(step_name)
+    ready = [step_name for step_name in step_names if num_waiting[step_name] == 0]
+    order = []
+    while ready:
+        step_name = ready.pop(0)
+        order.append(step_name)
+        for dependent in dependents[step_name]:
+            num_waiting[dependent] -= 1
+            if num_waiting[dependent] == 0:
+                ready.append(dependent)
+                ready.sort(key=step_names.index)
+    if len(order) != len(step_names):
+        raise ValueError(f"cyclic dependency between steps: {[step_name for step_name in step_names if step_name not in order]}")
+    return order
+
+class StepScheduler:
+    def __init__(self, asset_source):
+        """ scheduler of the steps along the dependency graph of << depends_on >> (asset_source).
+            Raises ValueError if the dependencies are invalid (unknown step, self dependency, cycle).
+
+        Args:
+            asset_source    (list): asset source of the pipeline (experimental_plan.yaml)
+
+        Returns: -
+
+        """
+        self.step_names = [asset_config['step'] for asset_config in asset_source]
+        ## step name - dependency step names
+        self.dependencies = get_step_dependencies(asset_source)
+        ## topological order (validates the graph)
+        self.order = sort_steps(self.dependencies)
+        self.started = set()
+        self.finished = set()
+
+    def get_ready_steps(self):
+        """ steps not started yet whose dependencies are all finished (in the topological order)
+
+        Args: -
+
+        Returns:
+            step_names  (list)
+
+        """
+        return [step_name for step_name in self.order if (step_name not in self.started) and \
+                all(dependency in self.finished for dependency in self.dependencies[step_name])]
+
+    def start(self, step_name):
+        """ mark the step as started
+
+        Args:
+            step_name   (str): step name
+
+        Returns: -
+
+        """
+        self.started.add(step_name)
+
+    def finish(self, step_name):
+        """ mark the step as finished (its dependents may become ready)
+
+        Args:
+            step_name   (str): step name
+
+        Returns: -
+
+        """
+        self.finished.add(step_name)
+
+    def is_finished(self):
+        """ check whether all the steps are finished
+
+        Args: -
+
+        Returns:
+            bool
+
+        """
+        return len(self.finished) == len(self.step_names)
+
+    def get_final_steps(self):
+        """ steps which no other step depends on (in the asset_source order);
+            their outputs are the output of the pipeline
+
+        Args: -
+
+        Returns:
+            step_names  (list)
+
+        """
+        dependencies = set(dependency for step_dependencies in self.dependencies.values() for dependency in step_dependencies)
+        return [step_name for step_name in self.step_names if step_name not in dependencies]
@@ -1132,7 +1132,7 @@ class SolutionRegister:
             shutil.copy2(SOLUTION_META, AWS_CODEBUILD_ZIP_PATH)
         ## REGISTER_SOURCE_PATH --> AWS_CODEBUILD_BUILD_SOURCE_PATH
         shutil.copytree(REGISTER_SOURCE_PATH, AWS_CODEBUILD_BUILD_SOURCE_PATH)
-        shutil.copytree(ASSET_PACKAGE_PATH, AWS_CODEBUILD_ZIP_PATH + ASSET_PACKAGE_DIR)
+        shutil.copytree(ASSET_PACKAGE_PATH, AWS_CODEBUILD_ZIP_PATH + ASSET_PACKAGE_DIR, ignore=shutil.ignore_patterns(INSTALL_PLAN_DIR))
         ## save buildspec.yml 
         try: 
             with open(AWS_CODEBUILD_ZIP_PATH + AWS_CODEBUILD_BUILDSPEC_FILE, 'w') as file:
@@ -1901,7 +1901,10 @@ class SolutionRegister:
         ## experimental_plan.yaml control reset
         exp_plan_dict['control'] = [{'get_asset_source': 'once'}, {'backup_artifacts': False}, \
                                     {'backup_log': False}, {'backup_size':1000}, {'interface_mode': 'memory'}, \
-                                    {'save_inference_format': 'zip'}, {'check_resource': False}]
+                                    {'save_inference_format': 'zip'}, {'check_resource': False}, \
+                                    {'resource_interval': RESOURCE_INTERVAL}, {'profile_steps': []}, {'trace_memory': False}, \
+                                    {'wheelhouse': False}, {'shallow_clone': True}, {'concurrent_pipelines': False}, \
+                                    {'warm_context': False}, {'model_cache_size': MODEL_CACHE_SIZE}]
         logger.info(f"[INFO] reset experimental plan control for edgeapp inference: {exp_plan_dict['control']}")
         ## experimental_plan.yaml external_path_permission reset 
         for idx, _dict in enumerate(exp_plan_dict['external_path_permission']):
@@ -1955,8 +1958,16 @@ class SolutionRegister:
                 content = file.read()
             path = ASSET_PACKAGE_PATH.replace(PROJECT_HOME, "./")
             replace_string = '\n'.join([f"COPY {path}{file} {docker_location}" for file in file_list])
+            ## local wheelhouse (wheelhouse: True) is copied and used first; the index is used only for the misses 
+            find_links = ''
+            if os.path.isdir(WHEELHOUSE_PATH) and len(os.listdir(WHEELHOUSE_PATH)) > 0:
+                replace_string += f"\nCOPY {path}{WHEELHOUSE_DIR} {docker_location}{WHEELHOUSE_DIR}"
+                find_links = f"--find-links {docker_location}{WHEELHOUSE_DIR} "
             requirement_files = [file for file in file_list if file.endswith('.txt')]
-            pip_install_commands = '\n'.join([f"RUN pip3 install --no-cache-dir -r {docker_location}{file}" for file in requirement_files])
+            pip_install_commands = '\n'.join([f"RUN pip3 install --no-cache-dir {find_links}-r {docker_location}{file}" for file in requirement_files])
+            ## precompile the source into checked-hash bytecode (PYTHONDONTWRITEBYTECODE: not written at import time)
+            pip_install_commands += "\n" + f"RUN python3 -m compileall -q -j 0 -x '/\\.git/' --invalidation-mode checked-hash " + \
+                ' '.join([f"{docker_location}{folder}" for folder in ['src', 'alolib', 'assets']])
             if search_string in content:
                 content = content.replace(search_string, replace_string + "\n" + pip_install_commands)
                 with open(PROJECT_HOME + 'Dockerfile', 'w', encoding='utf-8') as file:
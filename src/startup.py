@@ -0,0 +1,150 @@
+import builtins
+import sys
+import threading
+from time import perf_counter
+from src.constants import *
+
+class ImportTimer:
+    def __init__(self):
+        """ measure the import cost of modules (like python -X importtime), aggregated by top-level package.
+            builtins.__import__ is wrapped while installed; imports of already loaded modules are not measured.
+
+        Args: -
+
+        Returns: -
+
+        """
+        self.original_import = None
+        ## top-level package - [self time (sec), cumulative time (sec), number of imported modules]
+        self.stats = {}
+        ## stack of [top-level package, child time (sec)] of the imports in progress (main thread only)
+        self.stack = []
+        self.main_ident = threading.get_ident()
+
+    def install(self):
+        """ start measuring imports
+
+        Args: -
+
+        Returns: -
+
+        """
+        if self.original_import is not None:
+            return
+        self.original_import = builtins.__import__
+        original_import = self.original_import
+        def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            ## already loaded, relative import or other threads: not measured
+            if level != 0 or name in sys.modules or threading.get_ident() != self.main_ident:
+                return original_import(name, globals, locals, fromlist, level)
+            package = name.split('.')[0]
+            ## nested import of the same package is counted into the outer one (cumulative)
+            is_outer = all(frame[0] != package for frame in self.stack)
+            self.stack.append([package, 0.0])
+            start = perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = perf_counter() - start
+                _, child_time = self.stack.pop()
+                if self.stack:
+                    self.stack[-1][1] += elapsed
+                stat = self.stats.setdefault(package, [0.0, 0.0, 0])
+                stat[0] += elapsed - child_time
+                stat[1] += elapsed if is_outer else 0
+                stat[2] += 1
+        builtins.__import__ = _timed_import
+
+    def uninstall(self):
+        """ stop measuring imports (restore builtins.__import__)
+
+        Args: -
+
+        Returns: -
+
+        """
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def report(self, top_n=STARTUP_IMPORT_TOP_N):
+        """ import cost of top-level packages, sorted by self time
+
+        Args:
+            top_n   (int): number of packages in the report
+
+        Returns:
+            report  (dict): package - {self_sec, cumulative_sec, modules}
+
+        """
+        ranked = sorted(self.stats.items(), key=lambda x: x[1][0], reverse=True)[:top_n]
+        return {package: {'self_sec': round(stat[0], 4), 'cumulative_sec': round(stat[1], 4), 'modules': stat[2]} \
+                for package, stat in ranked}
+
+class StartupTimer:
+    def __init__(self):
+        """ wall time breakdown of the ALO startup (time-to-first-step).
+            Each lap() records the time elapsed since the previous lap as a phase.
+
+        Args: -
+
+        Returns: -
+
+        """
+        self.last = perf_counter()
+        ## phase name - wall time (sec)
+        self.phases = {}
+        self.import_timer = ImportTimer()
+        ## the imports phase (since the start of the process) is recorded once per process
+        self.started = False
+
+    def begin(self):
+        """ start the startup breakdown of an ALO instance.
+            The first call records the time since the start of the process as << imports >>; 
+            later calls (another ALO instance in the same process) restart the breakdown without imports phase.
+
+        Args: -
+
+        Returns: -
+
+        """
+        if not self.started:
+            self.started = True
+            self.lap('imports')
+            return
+        self.import_timer.uninstall()
+        self.import_timer = ImportTimer()
+        self.phases = {}
+        self.last = perf_counter()
+
+    def lap(self, phase):
+        """ record the time since the previous lap as {phase}
+
+        Args:
+            phase   (str): phase name
+
+        Returns: -
+
+        """
+        now = perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+
+    def report(self):
+        """ startup report (per phase wall time and import cost)
+
+        Args: -
+
+        Returns:
+            report  (dict): {total_sec, phases, imports}
+
+        """
+        return {'total_sec': round(sum(self.phases.values()), 4),
+                'phases': {phase: round(sec, 4) for phase, sec in self.phases.items()},
+                'imports': self.import_timer.report()}
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+STARTUP = StartupTimer()
+#--------------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from src.constants import *
+
+class SpanTracer:
+    def __init__(self):
+        """ lightweight span tracer.
+            Nested spans (pipeline > stage > asset step > sub-operation) are recorded as
+            Chrome-trace complete events ("ph": "X"), which can be opened in Perfetto or chrome://tracing.
+            Nesting is given by the time range of the spans in the same thread.
+
+        Args: -
+
+        Returns: -
+
+        """
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.events = []
+        self.origin = time.perf_counter()
+
+    def reset(self):
+        """ remove recorded spans and restart the clock (e.g. new pipeline run)
+
+        Args: -
+
+        Returns: -
+
+        """
+        with self.lock:
+            self.pid = os.getpid()
+            self.events = []
+            self.origin = time.perf_counter()
+
+    @contextmanager
+    def span(self, name, category='alo', **args):
+        """ record the code block as a span
+
+        Args:
+            name        (str): span name
+            category    (str): span category (e.g. pipeline, stage, step, git, pip, s3)
+            **args      (dict): additional info shown in the trace viewer
+
+        Returns: -
+
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {'name': name, 'cat': category, 'ph': 'X', \
+                    'ts': round((start - self.origin) * 1e6, 3), 'dur': round((end - start) * 1e6, 3), \
+                    'pid': self.pid, 'tid': threading.get_ident()}
+            if args:
+                event['args'] = {k: str(v) for k, v in args.items()}
+            with self.lock:
+                self.events.append(event)
+
+    def merge(self, events):
+        """ add spans recorded by another process (e.g. forked step worker; same clock origin)
+
+        Args:
+            events      (list): spans of the other process
+
+        Returns: -
+
+        """
+        with self.lock:
+            self.events.extend(events)
+
+    def traced(self, name, category='alo'):
+        """ decorator which records every call of the function as a span
+
+        Args:
+            name        (str): span name
+            category    (str): span category
+
+        Returns:
+            decorator   (function)
+
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self, category=None):
+        """ total duration (sec) per span name
+
+        Args:
+            category    (str, None): span category to filter (None: all)
+
+        Returns:
+            summary     (dict): span name - total duration (sec)
+
+        """
+        summary = {}
+        with self.lock:
+            for event in self.events:
+                if (category is None) or (event['cat'] == category):
+                    summary[event['name']] = summary.get(event['name'], 0) + event['dur'] / 1e6
+        return summary
+
+    def save(self, file_path):
+        """ save spans as Chrome-trace json file
+
+        Args:
+            file_path   (str): trace json file path
+
+        Returns: -
+
+        """
+        with self.lock:
+            events = sorted(self.events, key=lambda x: x['ts'])
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        ## spans merged from the worker processes are shown as separate processes
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, \
+                    'args': {'name': 'ALO' if pid == self.pid else f'ALO worker {pid}'}} \
+                    for pid in sorted(set(event['pid'] for event in events) | {self.pid})]
+        for pid, tid in sorted(set((event['pid'], event['tid']) for event in events)):
+            metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, \
+                            'args': {'name': thread_names.get(tid, str(tid)) if pid == self.pid else str(tid)}})
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            json.dump({'traceEvents': metadata + events, 'displayTimeUnit': 'ms'}, f)
+
+#--------------------------------------------------------------------------------------------------------------------------
+#    GLOBAL VARIABLE
+#--------------------------------------------------------------------------------------------------------------------------
+TRACER = SpanTracer()
+#--------------------------------------------------------------------------------------------------------------------------
@@ -1,7 +1,12 @@
 import argparse
-from datetime import datetime
+import hashlib
+import importlib.util
+import json
+import os
+import py_compile
+import sys
 from src.constants import *
-from src.logger import ProcessLogger
+from src.logger import ProcessLogger, SHOW_EVENTS
 
 #--------------------------------------------------------------------------------------------------------------------------
 #    GLOBAL VARIABLE
@@ -57,9 +62,152 @@ def set_args():
     parser.add_argument("--mode", type=str, default="all", help="ALO mode: train, inference, all")
     parser.add_argument("--loop", dest='loop', action='store_true', help="On/off infinite loop: True, False")
     parser.add_argument("--computing", type=str, default="local", help="training resource: local, sagemaker, ..") # local = on-premise
+    parser.add_argument("--metrics-port", dest='metrics_port', type=int, default=None, help="loop mode metrics endpoint port (Prometheus text format): e.g. 9100")
+    parser.add_argument("--refresh-alolib", dest='refresh_alolib', action='store_true', help="re-check alolib git and re-install alolib requirements even if unchanged")
     args = parser.parse_args()
     return args
 
+def _read_git_head(repo_path):
+    """ read branch and commit of the git repository from the .git directory (without git commands)
+
+    Args: 
+        repo_path   (str): git repository path
+        
+    Returns: 
+        branch      (str): branch name (None if detached HEAD)
+        commit      (str): commit hash (None if not resolved)
+
+    """
+    git_dir = os.path.join(repo_path, '.git')
+    with open(os.path.join(git_dir, 'HEAD'), 'r') as f:
+        head = f.readline().strip()
+    ## detached HEAD status (not branch name but commit hash)
+    if not head.startswith('ref:'):
+        return None, head
+    ## ref format ~ "ref: refs/heads/{branch name}"
+    ref = head[len('ref:'):].strip()
+    branch = ref[len('refs/heads/'):] if ref.startswith('refs/heads/') else ref
+    ref_file = os.path.join(git_dir, ref)
+    if os.path.exists(ref_file):
+        with open(ref_file, 'r') as f:
+            return branch, f.readline().strip()
+    ## refs packed by git gc ~ "{commit} {ref}"
+    packed_refs = os.path.join(git_dir, 'packed-refs')
+    if os.path.exists(packed_refs):
+        with open(packed_refs, 'r') as f:
+            for line in f:
+                items = line.strip().split(' ')
+                if len(items) == 2 and items[1] == ref:
+                    return branch, items[0]
+    return branch, None
+
+def _get_file_checksum(file_path):
+    """ md5 checksum of the file (None if not exists)
+
+    Args: 
+        file_path   (str): file path
+        
+    Returns: 
+        checksum    (str)
+
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+def _get_distributions_checksum():
+    """ checksum of the installed distributions snapshot. 
+        Metadata directory names (e.g. numpy-1.26.4.dist-info) contain name and version, 
+        so listing the directories of sys.path is enough (much faster than reading metadata).
+
+    Args: -
+        
+    Returns: 
+        checksum    (str)
+
+    """
+    entries = []
+    for path in sys.path:
+        if not os.path.isdir(path):
+            continue
+        with os.scandir(path) as it:
+            entries += [os.path.join(path, entry.name) for entry in it if entry.name.endswith(('.dist-info', '.egg-info', '.egg-link'))]
+    return hashlib.md5('\n'.join(sorted(entries)).encode()).hexdigest()
+
+def _is_bytecode_valid(cache_path, source):
+    """ whether the pyc is a checked-hash pyc of the source (for the current interpreter)
+
+    Args: 
+        cache_path  (str): pyc path
+        source      (bytes): source code
+        
+    Returns: 
+        bool
+
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            header = f.read(16)
+    except OSError:
+        return False
+    ## magic number (4) | flags (4; 0b11 - hash based & check source) | source hash (8)
+    return (len(header) == 16) and (header[:4] == importlib.util.MAGIC_NUMBER) and \
+        (int.from_bytes(header[4:8], 'little') == 0b11) and (header[8:] == importlib.util.source_hash(source))
+
+def _compile_bytecode(dir_list):
+    """ precompile the .py files under the directories into __pycache__ as checked-hash pyc. 
+        The interpreter validates checked-hash pyc against the source hash at every import (stale pyc is never used), 
+        and reads it even if writing bytecode is disabled (PYTHONDONTWRITEBYTECODE). 
+        Up-to-date pyc are not compiled again.
+
+    Args: 
+        dir_list    (list): directories to compile (not existing ones are skipped)
+        
+    Returns: 
+        compiled    (int): number of compiled files
+        up_to_date  (int): number of files already compiled
+
+    """
+    compiled, up_to_date = 0, 0
+    for dir_path in dir_list:
+        if not os.path.isdir(dir_path):
+            continue
+        for root, dirs, files in os.walk(dir_path):
+            dirs[:] = [d for d in dirs if d not in ['.git', '__pycache__']]
+            for file in files:
+                if not file.endswith('.py'):
+                    continue
+                source_path = os.path.join(root, file)
+                cache_path = importlib.util.cache_from_source(source_path)
+                with open(source_path, 'rb') as f:
+                    source = f.read()
+                if _is_bytecode_valid(cache_path, source):
+                    up_to_date += 1
+                    continue
+                try:
+                    py_compile.compile(source_path, cfile=cache_path, doraise=True, \
+                                    invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+                    compiled += 1
+                except (py_compile.PyCompileError, OSError) as e:
+                    PROC_LOGGER.process_warning(f"Failed to compile {source_path}: {str(e)}")
+    return compiled, up_to_date
+
+def _get_error_code(msg):
+    """ get error code (e.g. E152) from alo_fail redis message
+
+    Args: 
+        msg     (str): jsonized redis error table entry
+        
+    Returns: 
+        code    (str): error code (unknown if not parsable)
+
+    """
+    try:
+        return json.loads(msg)['ERROR_CODE']
+    except Exception:
+        return 'unknown'
+
 def _log_process(msg, highlight=False):
     """ logging format for ALO process
 
@@ -82,7 +230,9 @@ def _log_process(msg, highlight=False):
         raise ValueError("hightlight arg. must be boolean")
 
 def _log_show(pipeline_type): 
-    """ logging for SHOW keyword values in log file
+    """ logging for SHOW events of current pipeline run (summary table)
+        SHOW events are collected in the SHOW event channel during the run (every SHOW record is routed into it 
+        when created), so the log file is not parsed.
 
     Args: 
         pipeline_type   (str): pipeline name 
@@ -91,39 +241,23 @@ def _log_show(pipeline_type):
 
     """
     assert pipeline_type in ['train_pipeline', 'inference_pipeline']
-    if pipeline_type == 'train_pipeline': 
-        file_path = TRAIN_LOG_PATH + PIPELINE_LOG_FILE
-        ## (Note) during boot, since logs have not been created yet, skip.
-        if not os.path.isfile(file_path):
-            return
-        with open(file_path, 'r') as f:
-            log_lines = f.readlines()
-    else: 
-        file_path = INFERENCE_LOG_PATH + PIPELINE_LOG_FILE
-        if not os.path.isfile(file_path):
-            return
-        with open(file_path, 'r') as f:
-            log_lines = f.readlines()
+    events = SHOW_EVENTS.events()
     user_show, alo_show  = [], [] ## N
     user_time_inc, alo_time_inc = [], [] ## N-1
-    for line in log_lines:
-        if line.startswith("[SHOW"): 
-            split_line = line.split('|')
-            _time = split_line[1]
-            if 'USER' in split_line: 
-                user_show.append(line.strip('\n'))
-                user_time_inc.append(datetime.strptime(_time, '%Y-%m-%d %H:%M:%S,%f'))
-            elif 'ALO' in split_line: 
-                alo_show.append(line.strip('\n'))
-                alo_time_inc.append(datetime.strptime(_time, '%Y-%m-%d %H:%M:%S,%f'))
-    user_time_diff = ['- time increment: 0s --- '] + ['- time increment: {}s --- '.format((j - i).total_seconds()) for i, j in zip(user_time_inc[:-1], user_time_inc[1:])]
-    alo_time_diff = ['- time increment: 0s --- '] + ['- time increment: {}s --- '.format((j - i).total_seconds()) for i, j in zip(alo_time_inc[:-1], alo_time_inc[1:])]
+    for event in events:
+        if event['service'] == 'USER': 
+            user_show.append(event['line'])
+            user_time_inc.append(event['time'])
+        else: 
+            alo_show.append(event['line'])
+            alo_time_inc.append(event['time'])
+    user_time_diff = ['- time increment: 0s --- '] + ['- time increment: {}s --- '.format(round(j - i, 6)) for i, j in zip(user_time_inc[:-1], user_time_inc[1:])]
+    alo_time_diff = ['- time increment: 0s --- '] + ['- time increment: {}s --- '.format(round(j - i, 6)) for i, j in zip(alo_time_inc[:-1], alo_time_inc[1:])]
     PROC_LOGGER.process_info(f'\n===========================================================    < SUMMARY SHOW - ALO >    ===========================================================\n' \
         + '\n'.join([x + y for x, y in zip(alo_time_diff, alo_show)])) 
     PROC_LOGGER.process_info(f'\n===========================================================    < SUMMARY SHOW - USER >    ===========================================================\n' \
         + '\n'.join([x + y for x, y in zip(user_time_diff, user_show)])) 
-            
-        
+
 def refresh_log(pipeline): 
     """ refresh ALO log file
 
@@ -141,5 +275,8 @@ def refresh_log(pipeline):
         if os.path.isfile(log_path + PIPELINE_LOG_FILE):
             with open(log_path + PIPELINE_LOG_FILE, 'r+') as f2:
                 f2.truncate(0)  
+        if os.path.isfile(log_path + SHOW_EVENT_FILE):
+            with open(log_path + SHOW_EVENT_FILE, 'r+') as f3:
+                f3.truncate(0)  
     except:
         PROC_LOGGER.process_error(f"Failed to refresh {pipeline} log") 
\ No newline at end of file
@@ -1,16 +1,57 @@
 import os
+import threading
 import yaml
 import json 
+from collections import OrderedDict
 from src.constants import *
 from src.logger import ProcessLogger
+from src.scheduler import StepScheduler
 from copy import deepcopy 
+try:
+    ## libyaml (C) loader: much faster than the pure-python loaders
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
 
 #--------------------------------------------------------------------------------------------------------------------------
 #    GLOBAL VARIABLE
 #--------------------------------------------------------------------------------------------------------------------------
 PROC_LOGGER = ProcessLogger(PROJECT_HOME)
+## parsed yaml cache: absolute path - ((mtime_ns, size), parsed object)
+YAML_CACHE = OrderedDict()
+YAML_CACHE_LOCK = threading.Lock()
+## key schema compiled from the experimental plan format template (once per process)
+EXP_PLAN_FORMAT_KEYS = None
 #--------------------------------------------------------------------------------------------------------------------------
 
+def _load_yaml(yaml_file):
+    """ parse yaml file. The parsed object is cached by (path, mtime, size) 
+        and a deepcopy is returned, so that callers can modify it freely.
+
+    Args: 
+        yaml_file   (str): yaml file path
+        
+    Returns: 
+        yaml_dict   (dict): parsed yaml
+        
+    """
+    path = os.path.abspath(yaml_file)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with YAML_CACHE_LOCK:
+        cached = YAML_CACHE.get(path)
+        if (cached is not None) and (cached[0] == signature):
+            YAML_CACHE.move_to_end(path)
+            return deepcopy(cached[1])
+    with open(path, encoding='UTF-8') as f:
+        yaml_dict = yaml.load(f, Loader=YamlLoader)
+    with YAML_CACHE_LOCK:
+        YAML_CACHE[path] = (signature, yaml_dict)
+        YAML_CACHE.move_to_end(path)
+        while len(YAML_CACHE) > YAML_CACHE_SIZE:
+            YAML_CACHE.popitem(last=False)
+    return deepcopy(yaml_dict)
+
 class Metadata:
     def _get_yaml_data(self, exp_plan, prefix='', pipeline_type='all'):
         """ Internalize the keys of the experimental plan as class variables.
@@ -53,7 +94,7 @@ class Metadata:
         if not pipeline_type in ['train', 'inference', 'all']:
             raise ValueError("pipeline_type must be one of the < train, inference, all >")
         self._get_yaml_data(exp_plan, prefix = 'update_' )
-        PROC_LOGGER.process_message(f"Successfully loaded << experimental_plan.yaml >> (file: {exp_plan})") 
+        PROC_LOGGER.process_message("Successfully loaded << experimental_plan.yaml >> (file: %s)", exp_plan) 
         if self.name != self.update_name:
             PROC_LOGGER.process_message(f"Update name : {self.update_name}")
             self.name = self.update_name
@@ -62,10 +103,10 @@ class Metadata:
             self.version = self.update_version
         ## external path 
         if self.external_path != self.update_external_path:
-            PROC_LOGGER.process_message(f"Update external_path : {self.update_external_path}")
+            PROC_LOGGER.process_message("Update external_path : %s", self.update_external_path)
             self.external_path = self.update_external_path
         if self.external_path_permission != self.update_external_path_permission:
-            PROC_LOGGER.process_message(f"Update external_path_permission : {self.update_external_path_permission}")
+            PROC_LOGGER.process_message("Update external_path_permission : %s", self.update_external_path_permission)
             self.external_path_permission = self.update_external_path_permission
         ## asset source & user parameters 
         if self.user_parameters != self.update_user_parameters:
@@ -73,22 +114,22 @@ class Metadata:
                 self.user_parameters[f'{pipeline_type}_pipeline'] = self.update_user_parameters[f'{pipeline_type}_pipeline']
             else:
                 self.user_parameters = self.update_user_parameters
-            PROC_LOGGER.process_message(f"Update user_parameters : {self.update_user_parameters}")
+            PROC_LOGGER.process_message("Update user_parameters : %s", self.update_user_parameters)
         if self.asset_source != self.update_asset_source:
             if pipeline_type != 'all':
                 self.asset_source[f'{pipeline_type}_pipeline'] = self.update_asset_source[f'{pipeline_type}_pipeline']
             else:
                 self.asset_source = self.update_asset_source
-            PROC_LOGGER.process_message(f"Update asset_source : {self.update_asset_source}")
+            PROC_LOGGER.process_message("Update asset_source : %s", self.update_asset_source)
         if self.ui_args_detail != self.update_ui_args_detail:
             if pipeline_type != 'all':
                 self.ui_args_detail[f'{pipeline_type}_pipeline'] = self.update_ui_args_detail[f'{pipeline_type}_pipeline']
             else:
                 self.ui_args_detail = self.update_ui_args_detail
-            PROC_LOGGER.process_message(f"Update ui_args_detail : {self.update_ui_args_detail}")
+            PROC_LOGGER.process_message("Update ui_args_detail : %s", self.update_ui_args_detail)
         ## control        
         if self.control != self.update_control:
-            PROC_LOGGER.process_message(f"Update control : {self.update_control}")
+            PROC_LOGGER.process_message("Update control : %s", self.update_control)
             self.control = self.update_control
         ## make {backup_exp_plan} / values could be changed during experiments. 
         backup_exp_plan = {}
@@ -119,8 +160,7 @@ class Metadata:
         """
         yaml_dict = dict()
         try:
-            with open(yaml_file, encoding='UTF-8') as f:
-                yaml_dict  = yaml.load(f, Loader=yaml.FullLoader)
+            yaml_dict = _load_yaml(yaml_file)
         except FileNotFoundError:
             PROC_LOGGER.process_error(f"Not Found : {yaml_file}")
         except:
@@ -188,6 +228,7 @@ class Metadata:
             PROC_LOGGER.process_error("Failed to read experimental plan yaml.")
         ## match experimental plan yaml user parameters and asset git uri info.
         self._match_steps()
+        self._check_step_dependencies()
         return self.exp_plan
 
     def overwrite_solution_meta(self, exp_plan={}, sol_meta={}, system_envs={}, update_envs=True):
@@ -231,6 +272,7 @@ class Metadata:
             PROC_LOGGER.process_error("Failed to overwrite solution meta to experimental plan.")
         ## match experimental plan yaml user parameters and asset git uri info.
         self._match_steps()
+        self._check_step_dependencies()
         return self.exp_plan
     
     def check_exp_plan_keys(self, exp_plan: dict): 
@@ -242,7 +284,7 @@ class Metadata:
         Returns: -
         
         """
-        exp_plan_format = self.get_yaml(EXPERIMENTAL_PLAN_FORMAT_FILE) 
+        global EXP_PLAN_FORMAT_KEYS
         common_error_msg = f"Format error - experimental_plan.yaml keys: \
                             \n - Please refer to this file: \n {EXPERIMENTAL_PLAN_FORMAT_FILE} \n"
         unchecked_keys = ['train_pipeline', 'inference_pipeline']
@@ -267,7 +309,10 @@ class Metadata:
                 else:
                     PROC_LOGGER.process_error(f"experimental_plan.yaml key error: \n {parent_k}-{v} not allowed")  
             return sorted(key_list)
-        exp_plan_keys, exp_plan_format_keys = get_keys(exp_plan), get_keys(exp_plan_format)
+        ## the format template is compiled into the key schema only once
+        if EXP_PLAN_FORMAT_KEYS is None:
+            EXP_PLAN_FORMAT_KEYS = get_keys(self.get_yaml(EXPERIMENTAL_PLAN_FORMAT_FILE))
+        exp_plan_keys, exp_plan_format_keys = get_keys(exp_plan), list(EXP_PLAN_FORMAT_KEYS)
         missed_keys = [] 
         for k in exp_plan_format_keys: 
             if k not in exp_plan_keys: 
@@ -316,6 +361,30 @@ class Metadata:
         elif k == "check_resource": 
             default_value = False
             self.exp_plan["control"].append({"check_resource":default_value})
+        elif k == "resource_interval": 
+            default_value = RESOURCE_INTERVAL
+            self.exp_plan["control"].append({"resource_interval":default_value})
+        elif k == "profile_steps": 
+            default_value = []
+            self.exp_plan["control"].append({"profile_steps":default_value})
+        elif k == "trace_memory": 
+            default_value = False
+            self.exp_plan["control"].append({"trace_memory":default_value})
+        elif k == "wheelhouse": 
+            default_value = False
+            self.exp_plan["control"].append({"wheelhouse":default_value})
+        elif k == "shallow_clone": 
+            default_value = True
+            self.exp_plan["control"].append({"shallow_clone":default_value})
+        elif k == "concurrent_pipelines": 
+            default_value = False
+            self.exp_plan["control"].append({"concurrent_pipelines":default_value})
+        elif k == "warm_context": 
+            default_value = False
+            self.exp_plan["control"].append({"warm_context":default_value})
+        elif k == "model_cache_size": 
+            default_value = MODEL_CACHE_SIZE
+            self.exp_plan["control"].append({"model_cache_size":default_value})
         PROC_LOGGER.process_warning(f"experimental_plan.yaml control - {k} not found. Set it default value : {default_value}")
 
     def check_copy_exp_plan(self, exp_plan_file_path): 
@@ -367,6 +436,22 @@ class Metadata:
                 PROC_LOGGER.process_error(f"@ << {pipe} >> - You have entered unmatching steps between << user_parameters >> and << asset_source >> in your experimental_plan.yaml. \n - steps in user_parameters: {param_steps} \n - steps in asset_source: {source_steps}")
         return True
     
+    def _check_step_dependencies(self):
+        """ Verify the << depends_on >> of the steps within the asset_source (unknown step, self dependency, cycle).
+
+        Args: - 
+            
+        Returns: 
+            Boolean
+        
+        """
+        for pipe, asset_source in self.asset_source.items():
+            try:
+                StepScheduler(asset_source)
+            except ValueError as e:
+                PROC_LOGGER.process_error(f"@ << {pipe} >> - You have entered invalid << depends_on >> in the asset_source of your experimental_plan.yaml. \n - {e}")
+        return True
+
     def _update_yaml(self, system_envs):  
         """ solution_meta's << dataset_uri, artifact_uri, selected_user_parameters ... >> into exp_plan 
 
@@ -0,0 +1,31 @@
+""" ALO creates and writes {train, inference}_artifacts under PROJECT_HOME (e.g. process.log at import).
+    Redirect them into a temp directory before any ALO module is imported, so that the tests leave the repository clean.
+"""
+import os
+import sys
+import tempfile
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+import src.constants
+
+## constant name - path relative to PROJECT_HOME (e.g. TRAIN_LOG_PATH: train_artifacts/log/)
+ARTIFACTS_PATHS = {name: value[len(src.constants.PROJECT_HOME):] for name, value in vars(src.constants).items() \
+                    if name.isupper() and isinstance(value, str) and \
+                    value.startswith((src.constants.PROJECT_HOME + 'train_artifacts/', src.constants.PROJECT_HOME + 'inference_artifacts/'))}
+
+def redirect_artifacts(module, home, setattr=setattr):
+    """ point the artifacts paths of the module ({PROJECT_HOME}{train, inference}_artifacts/...) into {home}
+
+    Args:
+        module  (module): module which imported the constants (from src.constants import *)
+        home    (str): new root of the artifacts (ends with /)
+        setattr (function): attribute setter (e.g. monkeypatch.setattr)
+
+    Returns: -
+
+    """
+    for name, rel_path in ARTIFACTS_PATHS.items():
+        if hasattr(module, name):
+            setattr(module, name, home + rel_path)
+
+redirect_artifacts(src.constants, tempfile.mkdtemp(prefix='alo-test-') + '/')
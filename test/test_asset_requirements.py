@@ -0,0 +1,71 @@
+""" requirements of a git asset unchanged since the previous run (get_asset_source: every) are not extracted and checked again """
+import json
+import os
+import sys
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+import src.pipeline as alo_pipeline
+from src.constants import ASSET_STATE_FILE
+
+class _Install:
+    """ Packages stub recording the requirements extracted and checked """
+    def __init__(self):
+        self.prepared = None
+        self.extracted = []
+        self.prechecked = []
+
+    def prepare_dependency_check(self):
+        self.prepared = (None, '')
+
+    def extract_step_requirements(self, step_name, requirements_list):
+        self.extracted.append(step_name)
+        return requirements_list + ['extracted-from-requirements-txt']
+
+    def precheck_requirements(self, packages):
+        self.prechecked.append(packages)
+
+    def check_install_requirements(self, requirements_dict, extracted_requirements_dict=None):
+        return {}, extracted_requirements_dict
+
+def _make_pipeline(unchanged):
+    """ pipeline fetching the git asset << gitstep >> (unchanged: verified up to date with the remote)
+
+    Args:
+        unchanged   (bool): whether the asset is unchanged since the previous run
+
+    Returns:
+        pipeline    (Pipeline)
+
+    """
+    pipeline = alo_pipeline.Pipeline.__new__(alo_pipeline.Pipeline)
+    pipeline.install = _Install()
+    pipeline.unchanged_assets = set()
+    def _install_asset(asset_config, get_asset_source):
+        if unchanged:
+            pipeline.unchanged_assets.add(asset_config['step'])
+    pipeline._install_asset = _install_asset
+    return pipeline
+
+def test_unchanged_asset_requirements(tmp_path, monkeypatch):
+    monkeypatch.setattr(alo_pipeline, 'ASSET_HOME', str(tmp_path) + '/')
+    os.makedirs(tmp_path / 'gitstep' / '.git')
+    (tmp_path / 'gitstep' / ASSET_STATE_FILE).write_text(json.dumps({'url': 'https://example.com/asset.git', 'branch': 'main', 'commit': 'abc'}))
+    asset_source = [{'step': 'gitstep', 'source': {'code': 'https://example.com/asset.git', 'branch': 'main', 'requirements': ['requirements.txt']}}]
+    ## first run: extracted, checked and kept in the asset state
+    pipeline = _make_pipeline(unchanged=False)
+    _, extracted = pipeline._install_steps(asset_source, 'every')
+    assert pipeline.install.extracted == ['gitstep']
+    assert len(pipeline.install.prechecked) == 1
+    state = json.loads((tmp_path / 'gitstep' / ASSET_STATE_FILE).read_text())
+    assert state['requirements'] == {'written': ['requirements.txt'], 'extracted': extracted['gitstep']}
+    ## unchanged asset: the requirements of the previous run are reused
+    pipeline = _make_pipeline(unchanged=True)
+    _, reused = pipeline._install_steps(asset_source, 'every')
+    assert pipeline.install.extracted == []
+    assert pipeline.install.prechecked == []
+    assert reused == extracted
+    ## unchanged asset, but other requirements written in experimental_plan.yaml: extracted again
+    asset_source[0]['source']['requirements'] = ['requirements.txt', 'pandas']
+    pipeline = _make_pipeline(unchanged=True)
+    pipeline._install_steps(asset_source, 'every')
+    assert pipeline.install.extracted == ['gitstep']
@@ -0,0 +1,55 @@
+""" requirements checked against the installed distributions index (normalized name, PEP 440 version) """
+import os
+import sys
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.install import DistributionIndex
+
+def _make_site(path, distributions):
+    """ site directory with the *.dist-info directories of the distributions
+
+    Args:
+        path            (Path): site directory
+        distributions   (list): (name, version) as written in the dist-info directory name
+
+    Returns:
+        site directory (str)
+
+    """
+    for name, version in distributions:
+        os.makedirs(path / f"{name}-{version}.dist-info")
+    return str(path)
+
+def test_name_and_version_matching(tmp_path, monkeypatch):
+    site = _make_site(tmp_path / 'site', [('Scikit_Learn', '1.3.2'), ('numpy', '1.26.4'), ('oddpkg', '1.0custom')])
+    monkeypatch.setattr(sys, 'path', [site])
+    dist_index = DistributionIndex()
+    ## normalized names (PEP 503)
+    assert dist_index.check('scikit-learn==1.3.2') == ('ok', '1.3.2')
+    assert dist_index.check('SCIKIT.learn>=1.0,<2') == ('ok', '1.3.2')
+    assert dist_index.check('numpy') == ('ok', '1.26.4')
+    assert dist_index.check('numpy<1.26') == ('conflict', '1.26.4')
+    assert dist_index.check('numpy~=1.26.0') == ('ok', '1.26.4')
+    assert dist_index.check('pandas==2.0.0') == ('not_found', None)
+    ## not PEP 440: cannot be compared
+    assert dist_index.check('oddpkg>=1.0') == ('conflict', '1.0custom')
+    assert dist_index.check('numpy=>1.0') == ('invalid', None)
+    ## environment marker not matched: nothing to install
+    assert dist_index.check('pandas==2.0.0; python_version < "3"') == ('ok', None)
+
+def test_first_on_sys_path_wins(tmp_path, monkeypatch):
+    first = _make_site(tmp_path / 'first', [('numpy', '1.26.4')])
+    second = _make_site(tmp_path / 'second', [('numpy', '1.22.0')])
+    monkeypatch.setattr(sys, 'path', [first, second])
+    assert DistributionIndex().check('numpy==1.26.4') == ('ok', '1.26.4')
+
+def test_stale_index_rebuilt(tmp_path, monkeypatch):
+    site = tmp_path / 'site'
+    monkeypatch.setattr(sys, 'path', [_make_site(site, [('numpy', '1.22.0')])])
+    dist_index = DistributionIndex()
+    assert dist_index.check('numpy>=1.26') == ('conflict', '1.22.0')
+    ## e.g. pip install: checked again after the index is invalidated
+    os.rename(site / 'numpy-1.22.0.dist-info', site / 'numpy-1.26.4.dist-info')
+    assert dist_index.check('numpy>=1.26') == ('conflict', '1.22.0')
+    dist_index.invalidate()
+    assert dist_index.check('numpy>=1.26') == ('ok', '1.26.4')
@@ -0,0 +1,40 @@
+""" a ref is fetched into the mirror once per run, and anew after the reset (start of the next run) """
+import os
+import sys
+import pytest
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.mirror import GitMirror
+git = pytest.importorskip('git')
+
+def _commit(repo, message):
+    """ commit a file change into the repository
+
+    Args:
+        repo    (git.Repo): repository
+        message (str): commit message (also written into the file)
+
+    Returns:
+        commit  (str): commit hash
+
+    """
+    with open(os.path.join(repo.working_tree_dir, 'asset.py'), 'w') as f:
+        f.write(f"# {message}\n")
+    repo.index.add(['asset.py'])
+    return repo.index.commit(message, author=git.Actor('alo', 'alo@example.com')).hexsha
+
+def test_fetch_once_per_run(tmp_path):
+    remote = git.Repo.init(tmp_path / 'remote', initial_branch='main')
+    url = 'file://' + str(tmp_path / 'remote')
+    first_commit = _commit(remote, 'first')
+    mirror = GitMirror(str(tmp_path / 'mirrors'))
+    mirror_repo = git.Repo(mirror.fetch(url, 'main'))
+    assert mirror_repo.commit('main').hexsha == first_commit
+    ## the same run: not fetched again
+    second_commit = _commit(remote, 'second')
+    mirror.fetch(url, 'main')
+    assert mirror_repo.commit('main').hexsha == first_commit
+    ## next run: the new head of the remote
+    mirror.reset()
+    mirror.fetch(url, 'main')
+    assert mirror_repo.commit('main').hexsha == second_commit
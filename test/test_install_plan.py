@@ -0,0 +1,60 @@
+""" install plan cache: the same requirement set on the same installed distributions skips the dependency check,
+    a changed one only checks the changed requirements (--force-reinstall packages are regarded as satisfied once installed)
+"""
+import os
+import sys
+import pytest
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+import src.install as alo_install
+
+FORCE_REINSTALL = 'pandas==2.0.0 --force-reinstall'
+
+@pytest.fixture
+def packages(tmp_path, monkeypatch):
+    """ Packages writing the install plans into {tmp_path}, recording the requirements to install (nothing is installed)
+
+    Args:
+        tmp_path    (Path): pytest temp directory
+        monkeypatch (MonkeyPatch): pytest monkeypatch
+
+    Returns:
+        packages    (Packages): installed (list) - checked requirements of each check_install_requirements
+
+    """
+    monkeypatch.setattr(alo_install, 'INSTALL_PLAN_PATH', str(tmp_path / 'install_plan') + '/')
+    distributions = {'checksum': 'distributions-a'}
+    monkeypatch.setattr(alo_install, '_get_distributions_checksum', lambda: distributions['checksum'])
+    packages = alo_install.Packages()
+    packages.distributions = distributions
+    packages.installed = []
+    def _install_packages(dup_checked_requirements_dict, dup_chk_set, dist_index=None):
+        packages.installed.append(sorted(dup_chk_set))
+    monkeypatch.setattr(packages, '_install_packages', _install_packages)
+    monkeypatch.setattr(packages, '_verify_requirements', lambda dup_checked_requirements_dict: [])
+    return packages
+
+def test_install_plan_hit_and_miss(packages):
+    requirements_dict = {'input': ['numpy==1.26.4', FORCE_REINSTALL], 'train': ['scikit-learn>=1.3']}
+    ## miss: all the requirements are checked
+    packages.check_install_requirements(requirements_dict)
+    assert packages.installed == [sorted(['numpy==1.26.4', FORCE_REINSTALL, 'scikit-learn>=1.3'])]
+    ## hit: skipped, including the --force-reinstall package
+    packages.check_install_requirements(requirements_dict)
+    assert len(packages.installed) == 1
+    ## changed requirement set: only the changed requirement is checked
+    requirements_dict['train'].append('xgboost==2.0.3')
+    packages.check_install_requirements(requirements_dict)
+    assert packages.installed[1] == ['xgboost==2.0.3']
+    ## installed distributions changed (e.g. pip install outside ALO): all checked again
+    packages.distributions['checksum'] = 'distributions-b'
+    packages.check_install_requirements(requirements_dict)
+    assert packages.installed[2] == sorted(['numpy==1.26.4', FORCE_REINSTALL, 'scikit-learn>=1.3', 'xgboost==2.0.3'])
+
+def test_unsatisfied_install_plan(packages, monkeypatch):
+    requirements_dict = {'input': ['numpy==1.26.4']}
+    monkeypatch.setattr(packages, '_verify_requirements', lambda dup_checked_requirements_dict: ['numpy==1.26.4'])
+    packages.check_install_requirements(requirements_dict)
+    ## not satisfied at the previous run: checked again
+    packages.check_install_requirements(requirements_dict)
+    assert packages.installed == [['numpy==1.26.4'], ['numpy==1.26.4']]
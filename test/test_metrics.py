@@ -0,0 +1,39 @@
+""" metrics rendered in the Prometheus text exposition format """
+import os
+import sys
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.metrics import MetricsRegistry
+
+def test_render():
+    registry = MetricsRegistry()
+    registry.counter('alo_requests_total', 'Requests processed', ['status'])
+    registry.histogram('alo_step_seconds', 'Step duration (seconds)', ['step'], buckets=(1.0, 0.1))
+    registry.counter('alo_unused_total', 'Never increased')
+    registry.inc('alo_requests_total', status='success')
+    registry.inc('alo_requests_total', 2, status='success')
+    registry.inc('alo_requests_total', status='fail "x"\n')
+    for value in [0.05, 0.1, 0.5, 3.0]:
+        registry.observe('alo_step_seconds', value, step='train')
+    assert registry.render() == '\n'.join([
+        '# HELP alo_requests_total Requests processed',
+        '# TYPE alo_requests_total counter',
+        'alo_requests_total{status="fail \\"x\\"\\n"} 1',
+        'alo_requests_total{status="success"} 3',
+        '# HELP alo_step_seconds Step duration (seconds)',
+        '# TYPE alo_step_seconds histogram',
+        ## cumulative buckets (le: upper bound, inclusive)
+        'alo_step_seconds_bucket{step="train",le="0.1"} 2',
+        'alo_step_seconds_bucket{step="train",le="1.0"} 3',
+        'alo_step_seconds_bucket{step="train",le="+Inf"} 4',
+        'alo_step_seconds_sum{step="train"} 3.65',
+        'alo_step_seconds_count{step="train"} 4',
+        '# HELP alo_unused_total Never increased',
+        '# TYPE alo_unused_total counter',
+    ]) + '\n'
+
+def test_render_without_labels():
+    registry = MetricsRegistry()
+    registry.counter('alo_boot_total', 'Boot count')
+    registry.inc('alo_boot_total')
+    assert registry.render().splitlines()[-1] == 'alo_boot_total 1'
@@ -0,0 +1,73 @@
+""" model cache: LRU eviction by the total size, and the entries of a model file replaced when its content changes """
+import os
+import sys
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.model_cache import ModelCache
+
+class _Loader:
+    """ model loader counting the loads (model: content of the file) """
+    def __init__(self):
+        self.loaded = []
+
+    def __call__(self, model_path):
+        self.loaded.append(os.path.basename(model_path))
+        with open(model_path) as f:
+            return f.read()
+
+def _write(path, content):
+    path.write_text(content)
+    return str(path)
+
+def test_lru_eviction(tmp_path):
+    cache = ModelCache(max_bytes=25)
+    loader = _Loader()
+    first, second, third = [_write(tmp_path / name, name * 2) for name in ['first', 'secnd', 'third']]
+    assert cache.get(first, loader) == 'firstfirst'
+    cache.get(second, loader)
+    ## hit: first becomes the most recently used
+    assert cache.get(first, loader) == 'firstfirst'
+    assert loader.loaded == ['first', 'secnd']
+    ## 30 bytes > 25: the least recently used (second) is evicted
+    cache.get(third, loader)
+    assert [os.path.basename(model_path) for model_path, _ in cache.entries] == ['first', 'third']
+    assert cache.total_bytes == 20
+    cache.get(second, loader)
+    assert loader.loaded == ['first', 'secnd', 'third', 'secnd']
+    ## larger than the cache: loaded, but not cached
+    large = _write(tmp_path / 'large', 'x' * 26)
+    cache.get(large, loader)
+    assert all(model_path != large for model_path, _ in cache.entries)
+    cache.set_max_bytes(0)
+    assert (len(cache.entries) == 0) and (cache.total_bytes == 0)
+
+def test_checksum_change(tmp_path):
+    cache = ModelCache(max_bytes=1024)
+    loader = _Loader()
+    model_path = _write(tmp_path / 'model', 'previous')
+    cache.get(model_path, loader)
+    assert cache.get(model_path, loader) == 'previous'
+    ## new content: loaded again, the entry of the previous content is removed
+    _write(tmp_path / 'model', 'new model')
+    assert cache.get(model_path, loader) == 'new model'
+    assert loader.loaded == ['model', 'model']
+    assert list(cache.entries) == [(model_path, cache.get_checksum(model_path))]
+    assert cache.total_bytes == len('new model')
+
+def test_invalidate(tmp_path):
+    cache = ModelCache(max_bytes=1024)
+    loader = _Loader()
+    os.makedirs(tmp_path / 'models')
+    model_path = _write(tmp_path / 'models' / 'model', 'model')
+    other_path = _write(tmp_path / 'other', 'other')
+    cache.get(model_path, loader)
+    cache.get(other_path, loader)
+    ## same external model: kept
+    assert cache.set_model_source(str(tmp_path / 'models'), 's3://bucket/model-a') == 1
+    cache.get(model_path, loader)
+    assert cache.set_model_source(str(tmp_path / 'models'), 's3://bucket/model-a') == 0
+    ## another external model loaded into the models path: the models under it are removed
+    assert cache.set_model_source(str(tmp_path / 'models'), 's3://bucket/model-b') == 1
+    assert list(cache.entries) == [(other_path, cache.get_checksum(other_path))]
+    assert cache.invalidate() == 1
+    assert cache.total_bytes == 0
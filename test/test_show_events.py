@@ -0,0 +1,30 @@
+""" SHOW event channel: the in-memory ring buffer keeps the latest events, the NDJSON sidecar keeps all """
+import json
+import os
+import sys
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+import src.logger as alo_logger
+from src.constants import SHOW_EVENT_FILE
+
+def test_ring_buffer_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(alo_logger, 'TRAIN_LOG_PATH', str(tmp_path) + '/')
+    channel = alo_logger.ShowEventChannel(maxlen=3)
+    channel.begin('train_pipeline')
+    for i in range(5):
+        channel.record('USER', f"event {i}", line=f"| USER | event {i}")
+    events = channel.events()
+    assert [event['message'] for event in events] == ['event 2', 'event 3', 'event 4']
+    assert all(event['pipeline'] == 'train_pipeline' for event in events)
+    assert events[-1]['line'] == '| USER | event 4'
+    channel.close()
+    with open(tmp_path / SHOW_EVENT_FILE) as f:
+        assert [json.loads(line)['message'] for line in f] == [f"event {i}" for i in range(5)]
+    ## new run: the buffer of the previous run is cleared
+    channel.begin('train_pipeline')
+    channel.record('ALO', 'next run')
+    assert [event['line'] for event in channel.events()] == ['next run']
+    channel.close()
+
+def test_default_buffer_size():
+    assert alo_logger.SHOW_EVENTS.buffer.maxlen == alo_logger.SHOW_EVENT_BUFFER_SIZE
@@ -0,0 +1,47 @@
+""" import cost of the ALO entry module (regression check of the lazy imports, STARTUP_IMPORT_BUDGET) """
+import json
+import os
+import subprocess
+import sys
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.constants import STARTUP_IMPORT_BUDGET
+
+## heavy dependencies imported only when the feature is used
+LAZY_MODULES = ['boto3', 'docker', 'redis', 'git', 'pyfiglet']
+
+def _import_alo():
+    """ import src.alo in a fresh interpreter with -X importtime
+
+    Args: -
+
+    Returns:
+        import_sec  (float): cumulative import time of the src package
+        loaded      (list): lazy modules loaded by the import
+
+    """
+    ## the artifacts (process.log created at import) are redirected into a temp dir, as in conftest.py
+    code = "import json, sys, tempfile; import src.constants as c; home = tempfile.mkdtemp() + '/'; " \
+            "[setattr(c, n, home + v[len(c.PROJECT_HOME):]) for n, v in list(vars(c).items()) if isinstance(v, str) and " \
+            "v.startswith((c.PROJECT_HOME + 'train_artifacts/', c.PROJECT_HOME + 'inference_artifacts/'))]; " \
+            f"import src.alo; print(json.dumps([m for m in {LAZY_MODULES} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=PROJECT_ROOT, \
+                            capture_output=True, text=True, check=True)
+    import_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        ## top-level imports only (nested ones are included in the cumulative time)
+        if name.startswith(' ') and not name.startswith('  ') and name.strip().split('.')[0] == 'src':
+            import_us += int(cumulative)
+    return import_us / 1e6, json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_import_within_budget():
+    import_sec, _ = _import_alo()
+    assert import_sec > 0
+    assert import_sec < STARTUP_IMPORT_BUDGET, f"import src.alo took {import_sec}s (budget: {STARTUP_IMPORT_BUDGET}s)"
+
+def test_heavy_dependencies_not_imported():
+    _, loaded = _import_alo()
+    assert loaded == []
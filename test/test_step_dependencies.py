@@ -0,0 +1,42 @@
+""" << depends_on >> of the asset_source: topological order, and rejection of the invalid dependencies at the plan check """
+import os
+import sys
+import pytest
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+from src.scheduler import StepScheduler
+from src.yaml import Metadata
+
+def _check(asset_source):
+    """ Metadata._check_step_dependencies of the train pipeline
+
+    Args:
+        asset_source    (list): step - depends_on (without depends_on: None)
+
+    Returns:
+        Boolean
+
+    """
+    meta = Metadata.__new__(Metadata)
+    meta.asset_source = {'train_pipeline': [{'step': step_name} if depends_on is None else {'step': step_name, 'depends_on': depends_on} \
+                                            for step_name, depends_on in asset_source]}
+    return meta._check_step_dependencies()
+
+def test_valid_dependencies():
+    asset_source = [('input', None), ('readiness', []), ('preprocess', 'input'), ('train', ['readiness', 'preprocess'])]
+    assert _check(asset_source) == True
+    scheduler = StepScheduler([{'step': step_name, 'depends_on': depends_on} if depends_on is not None else {'step': step_name} \
+                                for step_name, depends_on in asset_source])
+    assert scheduler.order == ['input', 'readiness', 'preprocess', 'train']
+    assert scheduler.dependencies['readiness'] == []
+    assert scheduler.dependencies['train'] == ['readiness', 'preprocess']
+
+@pytest.mark.parametrize('asset_source, message', [
+    ([('input', []), ('train', 'inputs')], 'depends on unknown step: inputs'),
+    ([('input', []), ('train', ['train'])], 'depends on itself'),
+    ([('input', 'train'), ('preprocess', 'input'), ('train', 'preprocess')], 'cyclic dependency'),
+    ([('input', []), ('input', [])], 'duplicated steps'),
+])
+def test_invalid_dependencies(asset_source, message):
+    with pytest.raises(ValueError, match=message):
+        _check(asset_source)
@@ -0,0 +1,94 @@
+""" log records of the forked step workers (depends_on) must reach process.log before the worker exits """
+import multiprocessing
+import os
+import random
+import string
+import sys
+import pytest
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+import src.logger as alo_logger
+import src.pipeline as alo_pipeline
+from conftest import redirect_artifacts
+from src.constants import PROCESS_LOG_FILE
+
+ASSET = '''
+import os
+from src.constants import PROJECT_HOME
+from src.logger import ProcessLogger
+class UserAsset:
+    def __init__(self, asset_structure):
+        self.asset_structure = asset_structure
+    def run(self):
+        ProcessLogger(PROJECT_HOME).process_message("{last_line} (pid: %s)", os.getpid())
+        return self.asset_structure.data, self.asset_structure.config
+'''
+
+def _make_pipeline(asset_source):
+    """ train pipeline of local assets, without experimental plan / artifacts setup
+
+    Args:
+        asset_source    (list): asset source of the train pipeline
+
+    Returns:
+        pipeline    (Pipeline)
+
+    """
+    pipeline = alo_pipeline.Pipeline.__new__(alo_pipeline.Pipeline)
+    pipeline.pipeline_type = 'train_pipeline'
+    pipeline.asset_source = {'train_pipeline': asset_source}
+    pipeline.user_parameters = {'train_pipeline': [{'step': asset_config['step'], 'args': []} for asset_config in asset_source]}
+    pipeline.control = {'check_resource': False, 'resource_interval': 0.5, 'trace_memory': False, 'profile_steps': None}
+    pipeline.system_envs = {'boot_on': False, 'loop': False, 'artifacts': {}, 'redis_error_table': {}, \
+                            'redis_pubsub_instance': None, 'train_history': {}}
+    pipeline.asset_structure = alo_pipeline.AssetStructure()
+    pipeline.resource_usage = {}
+    pipeline.memory_usage = {}
+    pipeline.scheduler = None
+    pipeline.unchanged_assets = set()
+    return pipeline
+
+@pytest.fixture
+def process_log(tmp_path, monkeypatch):
+    """ process logger writing into {tmp_path}/{train, inference}_artifacts/log/ 
+
+    Args:
+        tmp_path    (Path): pytest temp directory
+        monkeypatch (MonkeyPatch): pytest monkeypatch
+
+    Returns:
+        process log path of the train pipeline (str)
+
+    """
+    home = str(tmp_path) + '/'
+    for module in [alo_logger, alo_pipeline]:
+        redirect_artifacts(module, home, monkeypatch.setattr)
+    os.makedirs(alo_logger.TRAIN_LOG_PATH)
+    os.makedirs(alo_logger.INFERENCE_LOG_PATH)
+    alo_logger.configure_process_logging(force=True)
+    yield alo_logger.TRAIN_LOG_PATH + PROCESS_LOG_FILE
+    ## re-configured at the next log call (with the paths restored by monkeypatch)
+    alo_logger._close_process_handlers()
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="forked step workers only")
+def test_forked_step_last_log_line(tmp_path, process_log, monkeypatch):
+    monkeypatch.setattr(alo_pipeline, 'ASSET_HOME', str(tmp_path) + '/')
+    monkeypatch.setattr(alo_pipeline, 'STEP_MAX_WORKERS', 2)
+    ## asset module names are letters only (asset_{step} without digits)
+    suffix = ''.join(random.choices(string.ascii_lowercase, k=8))
+    last_lines = {}
+    asset_source = []
+    for name in ['first', 'second']:
+        step_name = f"log{name}{suffix}"
+        last_lines[step_name] = f"last log line of << {step_name} >>"
+        os.makedirs(tmp_path / step_name)
+        (tmp_path / step_name / f"asset_{step_name}.py").write_text(ASSET.replace('{last_line}', last_lines[step_name]))
+        ## independent steps: run concurrently in forked workers
+        asset_source.append({'step': step_name, 'source': {'code': 'local', 'branch': '', 'requirements': []}, 'depends_on': []})
+    _make_pipeline(asset_source).run('all')
+    with open(process_log) as f:
+        process_log_text = f.read()
+    for step_name, last_line in last_lines.items():
+        assert last_line in process_log_text, f"<< {step_name} >> log lost"
+        ## written by the worker process, not by this process
+        assert f"{last_line} (pid: {os.getpid()})" not in process_log_text